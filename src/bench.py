@@ -0,0 +1,646 @@
+from common import *
+from common.parallel import NTT_LOG_BLOCK
+from binius import BiniusBasicPCS, BiniusBlockPCS
+from fri_binius import RingSwitchingPCS
+from fri_binius.sumcheck import SumcheckClaim, SumcheckProver
+
+from dataclasses import dataclass, field, asdict
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+
+# A benchmark is a named case timed min-of-`repeat`. PCS cases run in a fresh
+# (spawned) process each, so their peak RSS is their own; micro-benchmarks run
+# in the harness process. `compare` flags any timing that grew by more than the
+# threshold, and any proof that got larger, against a saved baseline.
+
+
+@dataclass
+class BenchResult:
+    name: str
+    params: dict
+    seconds: dict[str, float]
+    proof_size: int | None = None
+    peak_rss_kb: int | None = None
+    extra: dict = field(default_factory=dict)
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _rate(fn, n_ops: int, repeat: int) -> float:
+    # seconds per op
+    return _time(fn, repeat) / n_ops
+
+
+def bench_field_ops(repeat: int) -> list[BenchResult]:
+    results = []
+    n = 256
+    for bits in (1, 2, 4, 8, 16, 32, 64, 128):
+        F = BinaryField(bits)
+        xs = [F.random_element() for _ in range(n)]
+        ys = [F.random_element() for _ in range(n)]
+        nonzero = [x for x in xs if x.value != 0][:16]
+        results.append(
+            BenchResult(
+                f"field/BF{bits}",
+                {"bits": bits},
+                {
+                    "mul": _rate(lambda: [x * y for x, y in zip(xs, ys)], n, repeat),
+                    "add": _rate(lambda: [x + y for x, y in zip(xs, ys)], n, repeat),
+                    "inv": _rate(
+                        lambda: [x.inv() for x in nonzero], len(nonzero), repeat
+                    ),
+                },
+            )
+        )
+    return results
+
+
+def bench_building_blocks(repeat: int) -> list[BenchResult]:
+    results = []
+
+    for F in (BF16, BF32):
+        log_dimension, log_inv_rate = 8, 2
+        ntt = AdditiveNTT(log_dimension, log_dimension + log_inv_rate, F)
+        code = ReedSolomonCode(log_dimension, log_inv_rate, F)
+        data = [F.random_element() for _ in range(1 << (log_dimension + log_inv_rate))]
+        message = data[: 1 << log_dimension]
+        params = {"field": F.bit_length, "log_dimension": log_dimension}
+        params["log_inv_rate"] = log_inv_rate
+        results.append(
+            BenchResult(
+                f"ntt/BF{F.bit_length}",
+                params,
+                {
+                    "forward": _time(lambda: ntt.forward_transform(data[:]), repeat),
+                    "inverse": _time(lambda: ntt.inverse_transform(data[:]), repeat),
+                },
+            )
+        )
+        results.append(
+            BenchResult(
+                f"rs_encode/BF{F.bit_length}",
+                params,
+                {"encode": _time(lambda: code.encode(message), repeat)},
+            )
+        )
+
+    log_len, leaf_size = 8, 32
+    vcs = MerkleTreeVCS(log_len)
+    leaves = [
+        [BF128.random_element() for _ in range(leaf_size)] for _ in range(1 << log_len)
+    ]
+    results.append(
+        BenchResult(
+            "merkle/commit",
+            {"log_len": log_len, "leaf_size": leaf_size, "field": 128},
+            {"commit": _time(lambda: vcs.commit(leaves), repeat)},
+        )
+    )
+    # opening 64 leaves of a tree pruned below depth 4: each of the 16
+    # subtrees is rebuilt at most once
+    pruned_vcs = MerkleTreeVCS(log_len, retain_depth=4)
+    _, committed = vcs.commit(leaves)
+    _, pruned = pruned_vcs.commit(leaves)
+    indices = [random.randrange(1 << log_len) for _ in range(64)]
+    results.append(
+        BenchResult(
+            "merkle/open_pruned",
+            {"log_len": log_len, "leaf_size": leaf_size, "retain_depth": 4},
+            {
+                "open": _time(lambda: vcs.prove_openings(committed, indices), repeat),
+                "open_pruned": _time(
+                    lambda: pruned_vcs.prove_openings(pruned, indices, leaves), repeat
+                ),
+            },
+            extra={
+                "tree_bytes": len(committed.merkle_tree.buffer),
+                "tree_bytes_pruned": len(pruned.merkle_tree.buffer),
+            },
+        )
+    )
+
+    n_coords = 10
+    coords = [BF128.random_element() for _ in range(n_coords)]
+    results.append(
+        BenchResult(
+            "tensor_expand/BF128",
+            {"n_coords": n_coords},
+            {"expand": _time(lambda: tensor_product(coords, BF128), repeat)},
+        )
+    )
+
+    K, L, n_vars = BF8, BF128, 8
+    witness = MultilinearExtension.from_evals(
+        [L.random_element() for _ in range(1 << n_vars)], L
+    )
+    claim = SumcheckClaim(
+        [L.random_element() for _ in range(n_vars)],
+        TowerAlgebra.new(K, L, L, [L.random_element() for _ in range(16)]),
+    )
+    challenges = [L.random_element() for _ in range(n_vars)]
+
+    def run_sumcheck():
+        prover = SumcheckProver(K, L, claim, witness)
+        prev = None
+        for r in challenges:
+            prover.execute_round(prev)
+            prev = r
+
+    results.append(
+        BenchResult(
+            "sumcheck/BF8-BF128",
+            {"n_vars": n_vars},
+            {"rounds": _time(run_sumcheck, repeat) / n_vars},
+            extra={"seconds_are": "per round"},
+        )
+    )
+    return results
+
+
+def _pcs_cases(n_vars_list: list[int]) -> list[tuple[str, dict]]:
+    cases = []
+    for n_vars in n_vars_list:
+        for K, L in ((BF8, BF128), (BF16, BF128)):
+            cases.append(("basic", {"n_vars": n_vars, "fields": [K.bit_length, 128]}))
+        for F, FA, FE in ((BF8, BF32, BF128), (BF1, BF16, BF128)):
+            fields = [F.bit_length, FA.bit_length, FE.bit_length]
+            cases.append(("block", {"n_vars": n_vars, "fields": fields}))
+        for K in (BF8, BF1):
+            cases.append(
+                ("ring_switching", {"n_vars": n_vars, "fields": [K.bit_length, 128]})
+            )
+    return cases
+
+
+def _build_pcs(kind: str, n_vars: int, fields: list[int]):
+    log_inv_rate, n_challenges = 2, 64
+    fields = [BinaryField(bits) for bits in fields]
+    if kind == "basic":
+        K, L = fields
+        log_cols = min((n_vars + 1) // 2, K.bit_length - log_inv_rate)
+        return BiniusBasicPCS(
+            K, L, n_vars, n_vars - log_cols, log_inv_rate, n_challenges
+        )
+    if kind == "block":
+        F, FA, FE = fields
+        packing = log2(FA.degree(F))
+        log_cols = min(
+            (n_vars + 1) // 2 + packing, FA.bit_length - log_inv_rate + packing
+        )
+        return BiniusBlockPCS(
+            F, FA, FE, n_vars, n_vars - log_cols, log_inv_rate, n_challenges
+        )
+    K, L = fields
+    packed_n_vars = n_vars - log2(L.degree(K))
+    log_rows = packed_n_vars // 2
+    inner_pcs = BiniusBasicPCS(
+        L, L, packed_n_vars, log_rows, log_inv_rate, n_challenges
+    )
+    return RingSwitchingPCS(K, L, inner_pcs, n_vars)
+
+
+def run_pcs_case(kind: str, params: dict, repeat: int, seed: int) -> BenchResult:
+    random.seed(seed)
+    pcs = _build_pcs(kind, params["n_vars"], params["fields"])
+    K, L = BinaryField(params["fields"][0]), BinaryField(params["fields"][-1])
+    n_vars = params["n_vars"]
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+
+    commitment, committed = pcs.commit(poly)
+    proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+    assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+
+    seconds = {
+        "commit": _time(lambda: pcs.commit(poly), repeat),
+        "prove": _time(
+            lambda: pcs.prove_evaluation(Challenger(), committed, poly, query), repeat
+        ),
+        "verify": _time(
+            lambda: pcs.verify_evaluation(
+                Challenger(), commitment, query, proof, value
+            ),
+            repeat,
+        ),
+    }
+    name = f"pcs/{kind}/" + "-".join(f"BF{b}" for b in params["fields"])
+    name += f"/n_vars={n_vars}"
+    return BenchResult(name, params, seconds, pcs.proof_size(proof), _peak_rss_kb())
+
+
+def _run_case_in_child(args: tuple) -> dict:
+    case, job = args
+    return asdict(case(*job))
+
+
+def _run_cases(case, jobs: list[tuple], isolate: bool) -> list[BenchResult]:
+    if not isolate:
+        return [case(*job) for job in jobs]
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for job in jobs:
+        # a fresh process per case, so peak RSS is not inherited from earlier ones
+        with ctx.Pool(1) as pool:
+            results.append(
+                BenchResult(**pool.apply(_run_case_in_child, ((case, job),)))
+            )
+        print(f"  {results[-1].name}: {results[-1].seconds}", file=sys.stderr)
+    return results
+
+
+def bench_pcs(
+    n_vars_list: list[int], repeat: int, seed: int, isolate: bool = True
+) -> list[BenchResult]:
+    jobs = [(kind, params, repeat, seed) for kind, params in _pcs_cases(n_vars_list)]
+    return _run_cases(run_pcs_case, jobs, isolate)
+
+
+def run_bf1_case(kind: str, n_vars: int, repeat: int, seed: int) -> BenchResult:
+    # a bit-packed BF1 witness end to end: it is never unpacked into elements
+    random.seed(seed)
+    fields = [1, 16, 128] if kind == "block" else [1, 128]
+    pcs = _build_pcs(kind, n_vars, fields)
+    poly = MultilinearExtension.from_bytes(random.randbytes(1 << (n_vars - 3)), BF1)
+    query = [BF128.random_element() for _ in range(n_vars)]
+    # evaluate through a half-size partial evaluation rather than a 2^n_vars
+    # query expansion
+    half = n_vars // 2
+    value = poly.evaluate_partial_high(
+        MultilinearQuery.with_full_query(query[half:], BF128)
+    ).evaluate(MultilinearQuery.with_full_query(query[:half], BF128))
+
+    seconds = {}
+    start = time.perf_counter()
+    commitment, committed = pcs.commit(poly)
+    seconds["commit"] = time.perf_counter() - start
+    start = time.perf_counter()
+    proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+    seconds["prove"] = time.perf_counter() - start
+    seconds["verify"] = _time(
+        lambda: pcs.verify_evaluation(Challenger(), commitment, query, proof, value),
+        repeat,
+    )
+    assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+    name = f"bf1_witness/{kind}/" + "-".join(f"BF{b}" for b in fields)
+    return BenchResult(
+        name + f"/n_vars={n_vars}",
+        {"n_vars": n_vars, "fields": fields},
+        seconds,
+        pcs.proof_size(proof),
+        _peak_rss_kb(),
+        extra={"witness_bytes": poly.evals.nbytes},
+    )
+
+
+def bench_bf1_witness(
+    n_vars_list: list[int], repeat: int, seed: int, isolate: bool = True
+) -> list[BenchResult]:
+    # commit and prove are timed once: at n_vars 20-28 they dominate the run
+    jobs = [
+        (kind, n_vars, repeat, seed)
+        for n_vars in n_vars_list
+        for kind in ("block", "ring_switching")
+    ]
+    return _run_cases(run_bf1_case, jobs, isolate)
+
+
+def bench_update_commitment(
+    n_vars_list: list[int], repeat: int, n_changes: int = 256
+) -> list[BenchResult]:
+    # update_commitment against a full recommit. Scattered changes hit up to
+    # n_changes rows; clustered ones (a contiguous index range) hit the fewest
+    # rows that can hold them.
+    results = []
+    for n_vars in n_vars_list:
+        for kind, fields in (("basic", [8, 128]), ("block", [1, 16, 128])):
+            pcs = _build_pcs(kind, n_vars, fields)
+            K = BinaryField(fields[0])
+            poly = MultilinearExtension.from_evals(
+                [K.random_element() for _ in range(1 << n_vars)], K
+            )
+            _, committed = pcs.commit(poly)
+            n = min(n_changes, 1 << n_vars)
+            scattered = {
+                i: K.random_element() for i in random.sample(range(1 << n_vars), n)
+            }
+            start = random.randrange((1 << n_vars) - n + 1)
+            clustered = {i: K.random_element() for i in range(start, start + n)}
+            results.append(
+                BenchResult(
+                    f"update_commitment/{kind}/"
+                    + "-".join(f"BF{b}" for b in fields)
+                    + f"/n_vars={n_vars}",
+                    {"n_vars": n_vars, "fields": fields, "n_changes": n},
+                    {
+                        "commit": _time(lambda: pcs.commit(poly), repeat),
+                        "update_scattered": _time(
+                            lambda: pcs.update_commitment(committed, scattered), repeat
+                        ),
+                        "update_clustered": _time(
+                            lambda: pcs.update_commitment(committed, clustered), repeat
+                        ),
+                    },
+                    extra={
+                        "rows_touched_scattered": len(
+                            {i >> pcs.log_cols for i in scattered}
+                        ),
+                        "rows_touched_clustered": len(
+                            {i >> pcs.log_cols for i in clustered}
+                        ),
+                        "n_rows": 1 << pcs.log_rows,
+                    },
+                )
+            )
+    return results
+
+
+def bench_parallel_commit(
+    n_vars_list: list[int], repeat: int, workers: list[int]
+) -> list[BenchResult]:
+    # commit against commit_parallel per worker count, with the speedup of
+    # each over the serial commit
+    results = []
+    for n_vars in n_vars_list:
+        pcs = _build_pcs("basic", n_vars, [8, 128])
+        poly = MultilinearExtension.from_evals(
+            [BF8.random_element() for _ in range(1 << n_vars)], BF8
+        )
+        seconds = {"commit": _time(lambda: pcs.commit(poly), repeat)}
+        for n in workers:
+            seconds[f"workers={n}"] = _time(
+                lambda: pcs.commit_parallel(poly, n), repeat
+            )
+        base = seconds["commit"]
+        results.append(
+            BenchResult(
+                f"commit_parallel/basic/BF8-BF128/n_vars={n_vars}",
+                {"n_vars": n_vars, "workers": workers},
+                seconds,
+                extra={
+                    "speedup": {k: base / v for k, v in seconds.items()},
+                    "cpu_count": multiprocessing.cpu_count(),
+                },
+            )
+        )
+    return results
+
+
+def bench_low_memory_prover(n_vars_list: list[int], repeat: int) -> list[BenchResult]:
+    # the basic PCS with and without low_memory: the bytes the prover holds
+    # between commit and prove against the extra prove time of recomputing
+    # the opened columns
+    results = []
+    for n_vars in n_vars_list:
+        pcs = _build_pcs("basic", n_vars, [8, 128])
+        low_memory_pcs = _build_pcs("basic", n_vars, [8, 128])
+        low_memory_pcs.low_memory = True
+        poly = MultilinearExtension.from_evals(
+            [BF8.random_element() for _ in range(1 << n_vars)], BF8
+        )
+        query = [BF128.random_element() for _ in range(n_vars)]
+        _, committed = pcs.commit(poly)
+        _, low_memory_committed = low_memory_pcs.commit(poly)
+        tree_bytes = len(committed.vcs_committed.merkle_tree.buffer)
+        results.append(
+            BenchResult(
+                f"low_memory_prover/basic/BF8-BF128/n_vars={n_vars}",
+                {"n_vars": n_vars},
+                {
+                    "prove": _time(
+                        lambda: pcs.prove_evaluation(
+                            Challenger(), committed, poly, query
+                        ),
+                        repeat,
+                    ),
+                    "prove_low_memory": _time(
+                        lambda: low_memory_pcs.prove_evaluation(
+                            Challenger(), low_memory_committed, poly, query
+                        ),
+                        repeat,
+                    ),
+                },
+                extra={
+                    "witness_bytes": len(poly.evals),
+                    "committed_bytes": committed.encoded_cols.nbytes + tree_bytes,
+                    "committed_bytes_low_memory": tree_bytes,
+                },
+            )
+        )
+    return results
+
+
+def bench_parallel_ntt(
+    log_sizes: list[int], repeat: int, workers: list[int]
+) -> list[BenchResult]:
+    # forward_transform against the in-process forward_transform_blocked and
+    # the blocked parallel_ntt per worker count, on a full-degree BF32
+    # transform; then RS encoding at rate 1/4 through the plain transform and
+    # through the blocked path it takes from ReedSolomonCode.blocked_log_length
+    results = []
+    for log_size in log_sizes:
+        ntt = AdditiveNTT(log_size, log_size, BF32)
+        data = [BF32.random_element() for _ in range(1 << log_size)]
+        packed = PackedFieldBuffer.pack(data, BF32)
+        seconds = {
+            "forward_transform": _time(
+                lambda: ntt.forward_transform(list(data)), repeat
+            ),
+            "forward_transform_blocked": _time(
+                lambda: ntt.forward_transform_blocked(list(data), NTT_LOG_BLOCK),
+                repeat,
+            ),
+        }
+        for n in workers:
+            seconds[f"workers={n}"] = _time(
+                lambda: parallel_ntt(ntt, packed, n_workers=n), repeat
+            )
+        base = seconds["forward_transform"]
+        results.append(
+            BenchResult(
+                f"parallel_ntt/BF32/log_size={log_size}",
+                {"log_size": log_size, "workers": workers, "log_block": NTT_LOG_BLOCK},
+                seconds,
+                extra={
+                    "speedup": {k: base / v for k, v in seconds.items()},
+                    "cpu_count": multiprocessing.cpu_count(),
+                },
+            )
+        )
+
+        message = data[: 1 << (log_size - 2)]
+        code = ReedSolomonCode(log_size - 2, 2, BF32)
+        code.blocked_log_length = log_size + 1
+        seconds = {"forward_transform": _time(lambda: code.encode(message), repeat)}
+        for n in workers:
+            code = ReedSolomonCode(log_size - 2, 2, BF32, n)
+            code.blocked_log_length = log_size
+            seconds[f"workers={n}"] = _time(lambda: code.encode(message), repeat)
+        base = seconds["forward_transform"]
+        results.append(
+            BenchResult(
+                f"rs_encode_blocked/BF32/log_length={log_size}",
+                {"log_length": log_size, "log_inv_rate": 2, "workers": workers},
+                seconds,
+                extra={
+                    "speedup": {k: base / v for k, v in seconds.items()},
+                    "cpu_count": multiprocessing.cpu_count(),
+                },
+            )
+        )
+    return results
+
+
+def run(args) -> dict:
+    random.seed(args.seed)
+    results = []
+    if not args.skip_micro:
+        results += bench_field_ops(args.repeat)
+        results += bench_building_blocks(args.repeat)
+    results += bench_pcs(args.n_vars, args.repeat, args.seed, not args.no_isolate)
+    results += bench_update_commitment(args.n_vars, args.repeat, args.n_changes)
+    results += bench_parallel_commit(args.n_vars, args.repeat, args.commit_workers)
+    results += bench_low_memory_prover(args.n_vars, args.repeat)
+    results += bench_parallel_ntt(args.ntt_log_sizes, args.repeat, args.commit_workers)
+    if args.bf1_n_vars:
+        results += bench_bf1_witness(
+            args.bf1_n_vars, args.repeat, args.seed, not args.no_isolate
+        )
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+            "peak_rss_kb": _peak_rss_kb(),
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Regressions of current against baseline: timings more than `threshold`
+    (relative) slower, and proof sizes that grew. Cases missing from either
+    side are skipped.
+    """
+    base = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = base.get(result["name"])
+        if old is None:
+            continue
+        for metric, seconds in result["seconds"].items():
+            old_seconds = old["seconds"].get(metric)
+            if old_seconds and seconds > old_seconds * (1 + threshold):
+                regressions.append(
+                    f"{result['name']} {metric}: {old_seconds:.4g}s -> {seconds:.4g}s"
+                    f" (+{(seconds / old_seconds - 1) * 100:.0f}%)"
+                )
+        old_size, size = old.get("proof_size"), result.get("proof_size")
+        if old_size is not None and size is not None and size > old_size:
+            regressions.append(
+                f"{result['name']} proof_size: {old_size} -> {size} bytes"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Binius benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--out", default="bench.json")
+    run_parser.add_argument(
+        "--n-vars",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[10, 12],
+        help="comma-separated n_vars sweep for the PCS cases",
+    )
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=123)
+    run_parser.add_argument("--skip-micro", action="store_true")
+    run_parser.add_argument(
+        "--bf1-n-vars",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[],
+        help="comma-separated n_vars sweep for bit-packed BF1 witnesses, e.g. 20,24,28",
+    )
+    run_parser.add_argument(
+        "--commit-workers",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[1, 2, 4],
+        help="comma-separated worker counts for the parallel commit and NTT cases",
+    )
+    run_parser.add_argument(
+        "--ntt-log-sizes",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[12, 14],
+        help="comma-separated log domain sizes for the NTT and RS encode cases",
+    )
+    run_parser.add_argument(
+        "--n-changes",
+        type=int,
+        default=256,
+        help="evaluations changed per update_commitment case",
+    )
+    run_parser.add_argument(
+        "--no-isolate", action="store_true", help="run PCS cases in this process"
+    )
+    run_parser.add_argument(
+        "--baseline", help="compare against this file after running"
+    )
+    run_parser.add_argument("--threshold", type=float, default=0.2)
+
+    compare_parser = sub.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        current = run(args)
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"wrote {len(current['results'])} results to {args.out}")
+        if args.baseline is None:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressions = compare(baseline, current, args.threshold)
+    for line in regressions:
+        print("REGRESSION", line)
+    if not regressions:
+        print("no regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
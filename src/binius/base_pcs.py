@@ -0,0 +1,615 @@
+from common import (
+    BinaryField,
+    BinaryFieldElement,
+    MultilinearExtension,
+    MultilinearQuery,
+    MerkleTreeVCS,
+    Challenger,
+    PackedFieldBuffer,
+    PackedColumns,
+    CommittedWriter,
+    CommittedReader,
+    ProofWriter,
+    ProofReader,
+    BaseCommitted,
+    BasePCS,
+    FlatDigests,
+    Vector,
+    parallel_commit,
+    profiling_enabled,
+    span,
+)
+
+from abc import abstractmethod
+from functools import wraps
+from collections.abc import Iterable
+from itertools import islice
+
+
+def _traced(method):
+    # common.traced, with the span named after the subclass, e.g.
+    # BiniusBasicPCS.commit
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not profiling_enabled():
+            return method(self, *args, **kwargs)
+        with span(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class BiniusBasePCS(BasePCS):
+    """
+    What BiniusBasicPCS and BiniusBlockPCS share: the whole commit, prove and
+    verify protocol, for single and batched openings, and its serialization.
+    Subclasses set
+
+    - poly_field: the field of the committed evaluations,
+    - col_field: the field of the encoded matrix, i.e. of the opened columns,
+    - ext_field: the field of queries, t' and values,
+
+    as well as code (their ReedSolomonCode over col_field) and vcs, and
+    implement encode_rows and encode_row, which encode the rows of evaluations
+    into the col_field, and _encode_t_prime and _combine_column, which differ
+    in how t' is encoded and a column is combined with eq coefficients.
+    """
+
+    poly_field: BinaryField
+    col_field: BinaryField
+    ext_field: BinaryField
+    # whether Committed objects drop the encoded columns, which proving then
+    # recomputes from the polynomials in _open_columns
+    low_memory: bool = False
+
+    @abstractmethod
+    def encode_rows(self, poly: MultilinearExtension) -> list[list]:
+        pass
+
+    @abstractmethod
+    def encode_row(
+        self, row: Iterable[BinaryFieldElement]
+    ) -> Vector[BinaryFieldElement]:
+        pass
+
+    @abstractmethod
+    def _encode_t_prime(self, evals: list[BinaryFieldElement]) -> list:
+        pass
+
+    @abstractmethod
+    def _combine_column(
+        self, col: Vector[BinaryFieldElement], coeffs: list[BinaryFieldElement]
+    ):
+        # sum_r coeffs[r] col[r], comparable with _encode_t_prime(...)[index]
+        pass
+
+    def _check_openings(
+        self,
+        vcs_proofs: list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]],
+        col_length: int,
+    ) -> bool:
+        # the verifier zips openings with its challenges, so a proof with fewer
+        # openings than challenges would skip column checks
+        return len(vcs_proofs) == self.n_challenges and all(
+            len(col) == col_length and len(vcs_proof.branch) == self.vcs.log_len
+            for col, vcs_proof in vcs_proofs
+        )
+
+    def check_proof(self, proof) -> bool:
+        return (
+            proof.t_prime.field == self.ext_field
+            and proof.t_prime.n_vars == self.log_cols
+            and self._check_openings(proof.vcs_proofs, 1 << self.log_rows)
+        )
+
+    @_traced
+    def commit(self, poly: MultilinearExtension):
+        assert poly.field == self.poly_field and poly.n_vars == self.n_vars
+
+        with span("encode_rows"):
+            encoded_mat = self.encode_rows(poly)
+
+        with span("transpose"):
+            encoded_cols = PackedColumns.from_rows(encoded_mat, self.col_field)
+            del encoded_mat
+        with span("merkle_commit"):
+            vcs_commitment, vcs_committed = self.vcs.commit(encoded_cols)
+
+        commitment = self.Commitment(vcs_commitment)
+        committed = self.Committed(
+            vcs_committed, None if self.low_memory else encoded_cols
+        )
+
+        return commitment, committed
+
+    @_traced
+    def commit_parallel(self, poly: MultilinearExtension, n_workers: int | None = None):
+        """
+        commit, with the row encoding and leaf hashing sharded over n_workers
+        processes (all cores by default); see common.parallel_commit. The
+        result is bit-identical to commit.
+        """
+        assert poly.field == self.poly_field and poly.n_vars == self.n_vars
+        evals = PackedFieldBuffer.as_packed(poly.evals, self.poly_field)
+        encoded_cols, tree = parallel_commit(self, evals, self.col_field, n_workers)
+        if self.low_memory:
+            encoded_cols = None
+        commitment = self.Commitment(MerkleTreeVCS.Commitment(tree[1]))
+        return commitment, self.Committed(
+            self.vcs.retain(MerkleTreeVCS.Committed(tree)), encoded_cols
+        )
+
+    @_traced
+    def prove_evaluation(
+        self,
+        challenger: Challenger,
+        committed: BaseCommitted,
+        poly: MultilinearExtension,
+        query: list[BinaryFieldElement],
+    ):
+        assert poly.field == self.poly_field
+        assert poly.n_vars == self.n_vars == len(query)
+        assert all(self.ext_field.check_element(e) for e in query)
+
+        with span("t_prime"):
+            high_partial_query = MultilinearQuery.with_full_query(
+                query[self.log_cols :], self.ext_field
+            )
+            t_prime = poly.evaluate_partial_high(high_partial_query)
+
+        with span("challenges"):
+            challenger.observe_slice(t_prime.evals)
+            challenges = [
+                challenger.sample_bits(self.vcs.log_len)
+                for _ in range(self.n_challenges)
+            ]
+
+        with span("open_columns"):
+            merkle_proofs = self._open_columns(
+                committed.encoded_cols, committed.vcs_committed, [poly], challenges
+            )
+        return self.Proof(t_prime, merkle_proofs)
+
+    @_traced
+    def verify_evaluation(
+        self,
+        challenger: Challenger,
+        commitment,
+        query: list[BinaryFieldElement],
+        proof,
+        value: BinaryFieldElement,
+    ) -> bool:
+        assert len(query) == self.n_vars
+        assert all(self.ext_field.check_element(e) for e in query)
+        if not self.check_proof(proof):
+            return False
+
+        with span("evaluate_t_prime"):
+            low_partial_query = MultilinearQuery.with_full_query(
+                query[: self.log_cols], self.ext_field
+            )
+            computed_value = proof.t_prime.evaluate(low_partial_query)
+        if computed_value != value:
+            return False
+
+        with span("eq_expansion"):
+            high_partial_query = MultilinearQuery.with_full_query(
+                query[self.log_cols :], self.ext_field
+            )
+            eq = high_partial_query.expansion()
+
+        with span("encode_t_prime"):
+            encoded_t_prime = self._encode_t_prime(list(proof.t_prime.evals))
+
+        with span("challenges"):
+            challenger.observe_slice(proof.t_prime.evals)
+            challenges = [
+                challenger.sample_bits(self.vcs.log_len)
+                for _ in range(self.n_challenges)
+            ]
+
+        with span("column_checks"):
+            for index, (col, vcs_proof) in zip(challenges, proof.vcs_proofs):
+                if not self.vcs.verify_opening(
+                    commitment.vcs_commitment, index, vcs_proof, col, self.col_field
+                ):
+                    return False
+                if self._combine_column(col, eq) != encoded_t_prime[index]:
+                    return False
+
+        return True
+
+    @_traced
+    def commit_streaming(
+        self,
+        rows: Iterable[Iterable[BinaryFieldElement]],
+        path: str,
+        chunk_rows: int = 64,
+    ):
+        """
+        Commit to the polynomial whose evaluations are given row by row (rows
+        of 2^log_cols poly_field elements, e.g. from read_packed_rows), without
+        holding it in memory. Rows are encoded chunk_rows at a time into a
+        column store at path, in the format of save_committed; the Merkle tree
+        is built from the stored columns once all rows are in. The returned
+        Committed object is loaded from path. A row of the wrong length, or
+        other than 2^log_rows rows, raises ValueError.
+        """
+        n_rows, n_cols = 1 << self.log_rows, 1 << self.vcs.log_len
+        writer = CommittedWriter()
+        writer.write_json({"type": "Committed"})
+        writer.reserve_columns(self.col_field, n_cols, n_rows)
+        writer.reserve_digests(self.vcs.n_nodes)
+        writer.save(path)
+
+        with CommittedReader(path, writable=True) as store:
+            store.read_json()
+            encoded_cols = store.read_columns()
+            rows, n_written = iter(rows), 0
+            while chunk := list(islice(rows, chunk_rows)):
+                if n_written + len(chunk) > n_rows:
+                    raise ValueError(f"more than {n_rows} rows")
+                if any(len(row) != 1 << self.log_cols for row in chunk):
+                    raise ValueError(f"rows must have {1 << self.log_cols} elements")
+                with span("encode_rows"):
+                    encoded_chunk = [self.encode_row(row) for row in chunk]
+                encoded_cols.write_rows(n_written, encoded_chunk)
+                n_written += len(chunk)
+            if n_written != n_rows:
+                raise ValueError(f"{n_written} rows given, {n_rows} expected")
+
+            with span("merkle_commit"):
+                vcs_commitment, vcs_committed = self.vcs.commit(
+                    encoded_cols, out=store.read_digests().buffer
+                )
+            store.flush()
+            # the views must go before the store is unmapped
+            del encoded_cols, vcs_committed
+        return self.Commitment(vcs_commitment), self.load_committed(path)
+
+    @_traced
+    def update_commitment(self, committed, changes: dict[int, BinaryFieldElement]):
+        """
+        Recommit, in place, after setting the evaluations at the indices of
+        changes to their new values. Only rows with a changed evaluation are
+        decoded from the columns, patched and re-encoded, then written back in
+        one pass over the columns, and the Merkle tree is rebuilt once along
+        the paths of the changed columns.
+
+        What this saves over commit is the RS encoding of the untouched rows,
+        nothing more: a changed row changes its whole codeword, so a single
+        changed evaluation rewrites and rehashes every column, and changes
+        touching every row cost about as much as commit plus the decoding.
+        committed must be held in writable buffers: one loaded from a file, or
+        without encoded columns (low-memory mode), raises ValueError.
+        """
+        assert isinstance(committed, self.Committed)
+        assert all(0 <= i < 1 << self.n_vars for i in changes)
+        assert all(self.poly_field.check_element(v) for v in changes.values())
+        encoded_cols = committed.encoded_cols
+        if encoded_cols is None:
+            raise ValueError("cannot update a commitment without encoded columns")
+        if (
+            memoryview(encoded_cols.buffer.buffer).readonly
+            or committed.vcs_committed.merkle_tree.buffer.readonly
+        ):
+            raise ValueError("cannot update a read-only commitment, e.g. a loaded one")
+
+        rows: dict[int, dict[int, BinaryFieldElement]] = {}
+        for index, value in changes.items():
+            row_changes = rows.setdefault(index >> self.log_cols, {})
+            row_changes[index & ((1 << self.log_cols) - 1)] = value
+
+        changed_cols = set()
+        new_rows = {}
+        with span("encode_rows"):
+            for r, row_changes in rows.items():
+                old_encoded = encoded_cols.row(r)
+                message = self.code.extract_message(old_encoded)
+                # the message is the row packed into col_field elements
+                row = (
+                    PackedFieldBuffer.pack(message, self.col_field)
+                    .cast(self.poly_field)
+                    .to_list()
+                )
+                for i, value in row_changes.items():
+                    row[i] = value
+                new_rows[r] = self.encode_row(row)
+                changed_cols.update(
+                    j
+                    for j, (a, b) in enumerate(zip(old_encoded, new_rows[r]))
+                    if a != b
+                )
+
+        with span("write_rows"):
+            encoded_cols.set_rows(new_rows)
+
+        with span("merkle_update"):
+            vcs_commitment = self.vcs.update(
+                committed.vcs_committed, encoded_cols, changed_cols
+            )
+        return self.Commitment(vcs_commitment), committed
+
+    def commit_batch(self, polys: list[MultilinearExtension]):
+        # The encoded rows of every polynomial are stacked into one matrix, so
+        # a single Merkle tree over its columns commits to all of them. The
+        # polynomials share the row length 2^log_cols; their row counts may
+        # differ, i.e. each has n_vars >= log_cols. In low-memory mode only the
+        # Merkle tree is kept, and proofs recompute the stacked columns.
+        assert len(polys) > 0
+        assert all(
+            p.field == self.poly_field and p.n_vars >= self.log_cols for p in polys
+        )
+
+        encoded_mat = sum((self.encode_rows(poly) for poly in polys), [])
+
+        encoded_cols = PackedColumns.from_rows(encoded_mat, self.col_field)
+        del encoded_mat
+        vcs_commitment, vcs_committed = self.vcs.commit(encoded_cols)
+
+        commitment = self.Commitment(vcs_commitment)
+        committed = self.BatchCommitted(
+            vcs_committed,
+            None if self.low_memory else encoded_cols,
+            [poly.n_vars for poly in polys],
+        )
+
+        return commitment, committed
+
+    def _open_columns(
+        self,
+        encoded_cols: PackedColumns | None,
+        vcs_committed: MerkleTreeVCS.Committed,
+        polys: list[MultilinearExtension],
+        challenges: list[int],
+    ) -> list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]:
+        # polys are the committed polynomials, whose encoded rows are stacked
+        # in encoded_cols; subclasses supporting low_memory recompute the
+        # columns from them when encoded_cols is None
+        vcs_proofs = self.vcs.prove_openings(vcs_committed, challenges, encoded_cols)
+        return [
+            (encoded_cols[index], vcs_proof)
+            for index, vcs_proof in zip(challenges, vcs_proofs)
+        ]
+
+    def _prove_openings(
+        self,
+        challenger: Challenger,
+        committed: BaseCommitted,
+        t_primes: list[MultilinearExtension],
+        col_length: int,
+        polys: list[MultilinearExtension],
+    ):
+        for t_prime in t_primes:
+            challenger.observe_slice(t_prime.evals)
+        # the verifier's batching coefficients, sampled to keep transcripts in sync
+        challenger.sample_vec(len(t_primes), self.ext_field)
+        challenges = [
+            challenger.sample_bits(self.vcs.log_len) for _ in range(self.n_challenges)
+        ]
+
+        merkle_proofs = self._open_columns(
+            committed.encoded_cols, committed.vcs_committed, polys, challenges
+        )
+        return self.BatchProof(t_primes, merkle_proofs, col_length)
+
+    def prove_evaluation_batch(
+        self,
+        challenger: Challenger,
+        committed: BaseCommitted,
+        polys: list[MultilinearExtension],
+        queries: list[list[BinaryFieldElement]],
+    ):
+        assert len(polys) == len(queries) == len(committed.n_vars)
+        assert all(
+            poly.field == self.poly_field and poly.n_vars == n_vars == len(query)
+            for poly, n_vars, query in zip(polys, committed.n_vars, queries)
+        )
+        assert all(self.ext_field.check_element(e) for query in queries for e in query)
+
+        t_primes = [
+            poly.evaluate_partial_high(
+                MultilinearQuery.with_full_query(query[self.log_cols :], self.ext_field)
+            )
+            for poly, query in zip(polys, queries)
+        ]
+        col_length = sum(1 << (n_vars - self.log_cols) for n_vars in committed.n_vars)
+        return self._prove_openings(challenger, committed, t_primes, col_length, polys)
+
+    def prove_evaluation_multi(
+        self,
+        challenger: Challenger,
+        committed: BaseCommitted,
+        poly: MultilinearExtension,
+        queries: list[list[BinaryFieldElement]],
+    ):
+        # open one committed polynomial at several points, sharing the columns
+        assert len(queries) > 0
+        assert poly.field == self.poly_field and poly.n_vars == self.n_vars
+        assert all(len(query) == self.n_vars for query in queries)
+        assert all(self.ext_field.check_element(e) for query in queries for e in query)
+
+        t_primes = poly.evaluate_partial_high_multi(
+            [
+                MultilinearQuery.with_full_query(query[self.log_cols :], self.ext_field)
+                for query in queries
+            ]
+        )
+        return self._prove_openings(
+            challenger, committed, t_primes, 1 << self.log_rows, [poly]
+        )
+
+    def check_batch_proof(self, proof, n_polys: int, col_length: int) -> bool:
+        # col_length is the row count of the stacked matrix the proof opens
+        return (
+            len(proof.t_primes) == n_polys
+            and proof.col_length == col_length
+            and all(
+                t_prime.field == self.ext_field and t_prime.n_vars == self.log_cols
+                for t_prime in proof.t_primes
+            )
+            and self._check_openings(proof.vcs_proofs, col_length)
+        )
+
+    def _verify_openings(
+        self,
+        challenger: Challenger,
+        commitment,
+        queries: list[list[BinaryFieldElement]],
+        proof,
+        values: list[BinaryFieldElement],
+        stacked: bool,
+    ) -> bool:
+        # A random linear combination checks every t' at once:
+        # <c, col> = encode(sum_p r_p t'_p)[index]. For a batch the columns are
+        # the stacked columns of all polynomials, so c concatenates the r_p eq_p;
+        # for several points of one polynomial they are shared, c = sum_p r_p eq_p.
+        assert len(queries) == len(values)
+        assert all(self.ext_field.check_element(e) for query in queries for e in query)
+        if stacked:
+            col_length = sum(1 << (len(query) - self.log_cols) for query in queries)
+        else:
+            col_length = 1 << self.log_rows
+        if not self.check_batch_proof(proof, len(queries), col_length):
+            return False
+
+        for query, t_prime, value in zip(queries, proof.t_primes, values):
+            low_partial_query = MultilinearQuery.with_full_query(
+                query[: self.log_cols], self.ext_field
+            )
+            if t_prime.evaluate(low_partial_query) != value:
+                return False
+
+        for t_prime in proof.t_primes:
+            challenger.observe_slice(t_prime.evals)
+        batching_coeffs = challenger.sample_vec(len(queries), self.ext_field)
+        challenges = [
+            challenger.sample_bits(self.vcs.log_len) for _ in range(self.n_challenges)
+        ]
+
+        combined_t_prime = [self.ext_field.ZERO] * (1 << self.log_cols)
+        for coeff, t_prime in zip(batching_coeffs, proof.t_primes):
+            combined_t_prime = [
+                acc + coeff * e for acc, e in zip(combined_t_prime, t_prime.evals)
+            ]
+        encoded_t_prime = self._encode_t_prime(combined_t_prime)
+
+        col_coeffs = [] if stacked else [self.ext_field.ZERO] * col_length
+        for coeff, query in zip(batching_coeffs, queries):
+            high_partial_query = MultilinearQuery.with_full_query(
+                query[self.log_cols :], self.ext_field
+            )
+            eq = [coeff * e for e in high_partial_query.expansion()]
+            if stacked:
+                col_coeffs += eq
+            else:
+                col_coeffs = [acc + e for acc, e in zip(col_coeffs, eq)]
+
+        for index, (col, vcs_proof) in zip(challenges, proof.vcs_proofs):
+            if not self.vcs.verify_opening(
+                commitment.vcs_commitment, index, vcs_proof, col, self.col_field
+            ):
+                return False
+            if self._combine_column(col, col_coeffs) != encoded_t_prime[index]:
+                return False
+
+        return True
+
+    def verify_evaluation_batch(
+        self,
+        challenger: Challenger,
+        commitment,
+        queries: list[list[BinaryFieldElement]],
+        proof,
+        values: list[BinaryFieldElement],
+    ) -> bool:
+        assert all(len(query) >= self.log_cols for query in queries)
+        return self._verify_openings(
+            challenger, commitment, queries, proof, values, stacked=True
+        )
+
+    def verify_evaluation_multi(
+        self,
+        challenger: Challenger,
+        commitment,
+        queries: list[list[BinaryFieldElement]],
+        proof,
+        values: list[BinaryFieldElement],
+    ) -> bool:
+        assert len(queries) > 0
+        assert all(len(query) == self.n_vars for query in queries)
+        return self._verify_openings(
+            challenger, commitment, queries, proof, values, stacked=False
+        )
+
+    def _write_committed(self, committed, writer: CommittedWriter):
+        header = {"type": type(committed).__name__}
+        if isinstance(committed, self.BatchCommitted):
+            header["n_vars"] = committed.n_vars
+        if committed.encoded_cols is None:
+            header["columns"] = False
+        writer.write_json(header)
+        if committed.encoded_cols is not None:
+            writer.write_columns(
+                PackedColumns.from_columns(committed.encoded_cols, self.col_field)
+            )
+        writer.write_digests(FlatDigests.from_tree(committed.vcs_committed.merkle_tree))
+
+    def _read_committed(self, reader: CommittedReader):
+        header = reader.read_json()
+        encoded_cols = reader.read_columns() if header.get("columns", True) else None
+        if encoded_cols is not None and (
+            encoded_cols.field != self.col_field
+            or len(encoded_cols) != 1 << self.vcs.log_len
+        ):
+            raise ValueError("saved commitment does not match the PCS parameters")
+        vcs_committed = MerkleTreeVCS.Committed(reader.read_digests())
+        if len(vcs_committed.merkle_tree) != self.vcs.n_nodes:
+            raise ValueError("saved commitment does not match the PCS parameters")
+        if header["type"] == "BatchCommitted":
+            return self.BatchCommitted(vcs_committed, encoded_cols, header["n_vars"])
+        return self.Committed(vcs_committed, encoded_cols)
+
+    def _write_proof(self, proof, writer: ProofWriter):
+        # a batch proof starts with its number of t' vectors and the length of
+        # its columns, a single proof with 0
+        if isinstance(proof, self.BatchProof):
+            t_primes = proof.t_primes
+            col_length = proof.col_length
+            writer.write_u32(len(t_primes))
+        else:
+            t_primes = [proof.t_prime]
+            col_length = 1 << self.log_rows
+            writer.write_u32(0)
+        for t_prime in t_primes:
+            writer.write_elements(t_prime.evals, self.ext_field)
+        if isinstance(proof, self.BatchProof):
+            writer.write_u32(col_length)
+        for col, vcs_proof in proof.vcs_proofs:
+            # columns are written without their length, so each must have it
+            if len(col) != col_length:
+                raise ValueError("opened columns differ in length")
+            writer.write_elements(col, self.col_field)
+            writer.write_digests(vcs_proof.branch)
+
+    def _read_proof(self, reader: ProofReader):
+        n_t_primes = reader.read_u32()
+        t_primes = [
+            MultilinearExtension(
+                self.log_cols,
+                reader.read_elements(self.ext_field, 1 << self.log_cols),
+                self.ext_field,
+            )
+            for _ in range(max(n_t_primes, 1))
+        ]
+        col_length = reader.read_u32() if n_t_primes > 0 else 1 << self.log_rows
+        vcs_proofs = [
+            (
+                reader.read_elements(self.col_field, col_length),
+                MerkleTreeVCS.Proof(reader.read_digests(self.vcs.log_len)),
+            )
+            for _ in range(self.n_challenges)
+        ]
+        if n_t_primes > 0:
+            return self.BatchProof(t_primes, vcs_proofs, col_length)
+        return self.Proof(t_primes[0], vcs_proofs)
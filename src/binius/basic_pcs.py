@@ -6,20 +6,24 @@ from common import (
     ReedSolomonCode,
     MerkleTreeVCS,
     Challenger,
+    PackedFieldBuffer,
+    PackedColumns,
     BaseCommitment,
     BaseCommitted,
     BaseProof,
-    BasePCS,
     Vector,
     Matrix,
-    transpose,
     inner_product,
+    traced,
 )
 
+from .base_pcs import BiniusBasePCS
+
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
-class BiniusBasicPCS(BasePCS):
+class BiniusBasicPCS(BiniusBasePCS):
 
     @dataclass
     class Commitment(BaseCommitment):
@@ -31,13 +35,28 @@ class BiniusBasicPCS(BasePCS):
     @dataclass
     class Committed(BaseCommitted):
         vcs_committed: MerkleTreeVCS.Committed
-        encoded_cols: Matrix[BinaryFieldElement]
+        # None in low-memory mode
+        encoded_cols: PackedColumns | None
 
     @dataclass
     class Proof(BaseProof):
         t_prime: MultilinearExtension
         vcs_proofs: list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]
 
+    @dataclass
+    class BatchCommitted(BaseCommitted):
+        vcs_committed: MerkleTreeVCS.Committed
+        # None in low-memory mode
+        encoded_cols: PackedColumns | None
+        n_vars: list[int]
+
+    @dataclass
+    class BatchProof(BaseProof):
+        t_primes: list[MultilinearExtension]
+        vcs_proofs: list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]
+        # the length of every opened column: the row count of the stacked matrix
+        col_length: int
+
     def __init__(
         self,
         K: BinaryField,
@@ -46,7 +65,20 @@ class BiniusBasicPCS(BasePCS):
         log_rows: int,
         log_inv_rate: int,
         n_challenges: int,
+        low_memory: bool = False,
+        merkle_retain_depth: int | None = None,
     ):
+        """
+        With low_memory, commit and commit_batch keep only the Merkle tree and
+        drop the encoded matrix once it is hashed; proving then recomputes the
+        opened columns from the polynomials (see recompute_columns). The encoded
+        matrix is 2^log_inv_rate times the size of the polynomial, so this
+        removes most of the prover's state between commit and prove, for
+        n_challenges inner products per row at prove time.
+
+        merkle_retain_depth, if given, prunes the Merkle tree of commitments
+        below that depth; see MerkleTreeVCS.
+        """
         assert (
             isinstance(K, BinaryField)
             and isinstance(L, BinaryField)
@@ -58,104 +90,81 @@ class BiniusBasicPCS(BasePCS):
         self.n_vars = n_vars
         self.log_rows = log_rows
         self.n_challenges = n_challenges
+        self.low_memory = low_memory
 
+        self.poly_field, self.col_field, self.ext_field = K, K, L
         self.L_degree = self.L.degree(self.K)
         self.log_cols = self.n_vars - self.log_rows
 
         assert self.log_cols + log_inv_rate <= self.K.bit_length
         self.code = ReedSolomonCode(self.log_cols, log_inv_rate, self.K)
-        self.vcs = MerkleTreeVCS(self.code.log_length)
-
-    def commit(self, poly: MultilinearExtension) -> tuple[Commitment, Committed]:
-        assert poly.field == self.K and poly.n_vars == self.n_vars
+        self.vcs = MerkleTreeVCS(self.code.log_length, merkle_retain_depth)
 
+    def encode_rows(self, poly: MultilinearExtension) -> Matrix[BinaryFieldElement]:
         row_length = 1 << self.log_cols
         evals = poly.evals
         mat = [evals[i : i + row_length] for i in range(0, len(evals), row_length)]
-
-        encoded_mat = [self.code.encode(row) for row in mat]
-
-        encoded_cols = transpose(encoded_mat)
-        vcs_commitment, vcs_committed = self.vcs.commit(encoded_cols)
-
-        commitment = self.Commitment(vcs_commitment)
-        committed = self.Committed(vcs_committed, encoded_cols)
-
-        return commitment, committed
-
-    def prove_evaluation(
-        self,
-        challenger: Challenger,
-        committed: Committed,
-        poly: MultilinearExtension,
-        query: list[BinaryFieldElement],
-    ) -> Proof:
-        assert poly.field == self.K and poly.n_vars == self.n_vars == len(query)
-        assert all(self.L.check_element(e) for e in query)
-
-        high_partial_query = MultilinearQuery.with_full_query(
-            query[self.log_cols :], self.L
-        )
-        t_prime = poly.evaluate_partial_high(high_partial_query)
-
-        challenger.observe_slice(t_prime.evals)
-        challenges = [
-            challenger.sample_bits(self.vcs.log_len) for _ in range(self.n_challenges)
-        ]
-
-        merkle_proofs = [
-            (
-                committed.encoded_cols[index],
-                self.vcs.prove_opening(committed.vcs_committed, index),
-            )
-            for index in challenges
-        ]
-        proof = self.Proof(t_prime, merkle_proofs)
-        return proof
-
-    def check_proof(self, proof: Proof) -> bool:
-        return proof.t_prime.field == self.L and proof.t_prime.n_vars == self.log_cols
-
-    def verify_evaluation(
+        return [self.code.encode(row) for row in mat]
+
+    def encode_row(
+        self, row: Iterable[BinaryFieldElement]
+    ) -> Vector[BinaryFieldElement]:
+        return self.code.encode(list(row))
+
+    @traced("BiniusBasicPCS.recompute_columns")
+    def recompute_columns(
+        self, poly: MultilinearExtension, indices: Iterable[int]
+    ) -> dict[int, PackedFieldBuffer]:
+        """
+        The encoded columns at indices, recomputed from the polynomial instead
+        of read from the encoded matrix: entry r of column index is
+        <row_r, X>, with X the code's evaluation vector at index, so one pass
+        over the rows serves every index.
+        """
+        indices = sorted(set(indices))
+        vecs = [self.code.evaluation_vector(index) for index in indices]
+        row_length = 1 << self.log_cols
+        evals = poly.evals
+        cols = {index: [] for index in indices}
+        for start in range(0, len(evals), row_length):
+            row = evals[start : start + row_length]
+            for index, vec in zip(indices, vecs):
+                cols[index].append(inner_product(vec, row, self.K))
+        return {
+            index: PackedFieldBuffer.pack(col, self.K) for index, col in cols.items()
+        }
+
+    def _open_columns(
         self,
-        challenger: Challenger,
-        commitment: Commitment,
-        query: list[BinaryFieldElement],
-        proof: Proof,
-        value: BinaryFieldElement,
-    ) -> bool:
-        assert len(query) == self.n_vars
-        assert all(self.L.check_element(e) for e in query)
-        assert self.check_proof(proof)
-
-        encoded_t_prime = self.code.encode(proof.t_prime.evals)
-        high_partial_query = MultilinearQuery.with_full_query(
-            query[self.log_cols :], self.L
-        )
-
-        challenger.observe_slice(proof.t_prime.evals)
-        challenges = [
-            challenger.sample_bits(self.vcs.log_len) for _ in range(self.n_challenges)
-        ]
-
-        for index, (col, vcs_proof) in zip(challenges, proof.vcs_proofs):
-            if not self.vcs.verify_opening(
-                commitment.vcs_commitment, index, vcs_proof, col
-            ):
-                return False
-
-            lhs = inner_product(high_partial_query.expansion(), col, self.L)
-            if lhs != encoded_t_prime[index]:
-                return False
-
-        low_partial_query = MultilinearQuery.with_full_query(
-            query[: self.log_cols], self.L
-        )
-        computed_value = proof.t_prime.evaluate(low_partial_query)
-        if computed_value != value:
-            return False
-
-        return True
+        encoded_cols: PackedColumns | None,
+        vcs_committed: MerkleTreeVCS.Committed,
+        polys: list[MultilinearExtension],
+        challenges: list[int],
+    ) -> list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]:
+        # a pruned Merkle tree also needs every leaf of the subtrees it opens;
+        # a stacked column is the columns of the polynomials one after another
+        if encoded_cols is None:
+            indices = set(challenges).union(self.vcs.pruned_leaves(challenges))
+            per_poly = [self.recompute_columns(poly, indices) for poly in polys]
+            encoded_cols = per_poly[0]
+            if len(per_poly) > 1:
+                encoded_cols = {
+                    index: PackedFieldBuffer.pack(
+                        (e for cols in per_poly for e in cols[index]), self.K
+                    )
+                    for index in indices
+                }
+        return super()._open_columns(encoded_cols, vcs_committed, polys, challenges)
+
+    def _encode_t_prime(
+        self, evals: list[BinaryFieldElement]
+    ) -> list[BinaryFieldElement]:
+        return self.code.encode(evals)
+
+    def _combine_column(
+        self, col: Vector[BinaryFieldElement], coeffs: list[BinaryFieldElement]
+    ) -> BinaryFieldElement:
+        return inner_product(coeffs, col, self.L)
 
 
 if __name__ == "__main__":
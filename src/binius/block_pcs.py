@@ -2,25 +2,28 @@ from common import (
     BinaryField,
     BinaryFieldElement,
     TowerAlgebra,
+    PackedFieldBuffer,
     MultilinearExtension,
     MultilinearQuery,
     ReedSolomonCode,
     MerkleTreeVCS,
     Challenger,
+    PackedColumns,
     BaseCommitment,
     BaseCommitted,
     BaseProof,
-    BasePCS,
     Vector,
     Matrix,
-    transpose,
     log2,
 )
 
+from .base_pcs import BiniusBasePCS
+
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
-class BiniusBlockPCS(BasePCS):
+class BiniusBlockPCS(BiniusBasePCS):
 
     @dataclass
     class Commitment(BaseCommitment):
@@ -32,13 +35,26 @@ class BiniusBlockPCS(BasePCS):
     @dataclass
     class Committed(BaseCommitted):
         vcs_committed: MerkleTreeVCS.Committed
-        encoded_cols: Matrix[BinaryFieldElement]
+        encoded_cols: PackedColumns
 
     @dataclass
     class Proof(BaseProof):
         t_prime: MultilinearExtension
         vcs_proofs: list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]
 
+    @dataclass
+    class BatchCommitted(BaseCommitted):
+        vcs_committed: MerkleTreeVCS.Committed
+        encoded_cols: PackedColumns
+        n_vars: list[int]
+
+    @dataclass
+    class BatchProof(BaseProof):
+        t_primes: list[MultilinearExtension]
+        vcs_proofs: list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]
+        # the length of every opened column: the row count of the stacked matrix
+        col_length: int
+
     def __init__(
         self,
         F: BinaryField,
@@ -48,7 +64,10 @@ class BiniusBlockPCS(BasePCS):
         log_rows: int,
         log_inv_rate: int,
         n_challenges: int,
+        merkle_retain_depth: int | None = None,
     ):
+        # merkle_retain_depth, if given, prunes the Merkle tree of commitments
+        # below that depth; see MerkleTreeVCS
         assert (
             isinstance(F, BinaryField)
             and isinstance(FA, BinaryField)
@@ -64,6 +83,7 @@ class BiniusBlockPCS(BasePCS):
         self.log_rows = log_rows
         self.n_challenges = n_challenges
 
+        self.poly_field, self.col_field, self.ext_field = F, FA, FE
         self.FE_degree = self.FE.degree(self.F)
         self.FA_degree = self.FA.degree(self.F)
         self.log_cols = self.n_vars - self.log_rows
@@ -72,114 +92,46 @@ class BiniusBlockPCS(BasePCS):
         self.code = ReedSolomonCode(
             self.log_cols - log2(self.FA_degree), log_inv_rate, self.FA
         )
-        self.vcs = MerkleTreeVCS(self.code.log_length)
-
-    def commit(self, poly: MultilinearExtension) -> tuple[Commitment, Committed]:
-        assert poly.field == self.F and poly.n_vars == self.n_vars
-
-        row_length = 1 << self.log_cols
-        evals = poly.evals
-        mat = [evals[i : i + row_length] for i in range(0, len(evals), row_length)]
-
-        mat = [self.FA.cast_slice(row) for row in mat]
-        encoded_mat = [self.code.encode(row) for row in mat]
-
-        encoded_cols = transpose(encoded_mat)
-        vcs_commitment, vcs_committed = self.vcs.commit(encoded_cols)
-
-        commitment = self.Commitment(vcs_commitment)
-        committed = self.Committed(vcs_committed, encoded_cols)
-
-        return commitment, committed
-
-    def prove_evaluation(
-        self,
-        challenger: Challenger,
-        committed: Committed,
-        poly: MultilinearExtension,
-        query: list[BinaryFieldElement],
-    ) -> Proof:
-        assert poly.field == self.F and poly.n_vars == self.n_vars == len(query)
-        assert all(self.FE.check_element(e) for e in query)
-
-        high_partial_query = MultilinearQuery.with_full_query(
-            query[self.log_cols :], self.FE
-        )
-        t_prime = poly.evaluate_partial_high(high_partial_query)
-
-        challenger.observe_slice(t_prime.evals)
-        challenges = [
-            challenger.sample_bits(self.vcs.log_len) for _ in range(self.n_challenges)
+        self.vcs = MerkleTreeVCS(self.code.log_length, merkle_retain_depth)
+
+    def encode_rows(self, poly: MultilinearExtension) -> Matrix[BinaryFieldElement]:
+        # view the F-evaluations as FA-elements once, then split into rows
+        row_length = (1 << self.log_cols) // self.FA_degree
+        evals = PackedFieldBuffer.as_packed(poly.evals, self.F).cast(self.FA)
+        mat = [
+            evals[i : i + row_length].to_list()
+            for i in range(0, len(evals), row_length)
         ]
-
-        merkle_proofs = [
-            (
-                committed.encoded_cols[index],
-                self.vcs.prove_opening(committed.vcs_committed, index),
-            )
-            for index in challenges
-        ]
-        proof = self.Proof(t_prime, merkle_proofs)
-        return proof
-
-    def check_proof(self, proof: Proof) -> bool:
-        return proof.t_prime.field == self.FE and proof.t_prime.n_vars == self.log_cols
-
-    def verify_evaluation(
-        self,
-        challenger: Challenger,
-        commitment: Commitment,
-        query: list[BinaryFieldElement],
-        proof: Proof,
-        value: BinaryFieldElement,
-    ) -> bool:
-        assert len(query) == self.n_vars
-        assert all(self.FE.check_element(e) for e in query)
-        assert self.check_proof(proof)
-
-        low_partial_query = MultilinearQuery.with_full_query(
-            query[: self.log_cols], self.FE
-        )
-        computed_value = proof.t_prime.evaluate(low_partial_query)
-        if computed_value != value:
-            return False
-
-        high_partial_query = MultilinearQuery.with_full_query(
-            query[self.log_cols :], self.FE
-        )
-
-        t_prime = proof.t_prime.evals
+        return [self.code.encode(row) for row in mat]
+
+    def encode_row(
+        self, row: Iterable[BinaryFieldElement]
+    ) -> Vector[BinaryFieldElement]:
+        # one row of 2^log_cols F-elements, packed into FA-elements and encoded
+        packed = PackedFieldBuffer.as_packed(row, self.F).cast(self.FA)
+        return self.code.encode(packed.to_list())
+
+    def _encode_t_prime(self, evals: list[BinaryFieldElement]) -> list[TowerAlgebra]:
+        # t' as FA_degree-chunks of FE-elements, each an algebra element with
+        # FA vertical, encoded component-wise
         t_prime = [
             TowerAlgebra(
-                self.F, self.FE, self.FA, t_prime[i : i + self.FA_degree]
+                self.F, self.FE, self.FA, evals[i : i + self.FA_degree]
             ).transpose()
-            for i in range(0, len(t_prime), self.FA_degree)
-        ]
-        u_prime = self.code.encode(t_prime)
-
-        challenger.observe_slice(proof.t_prime.evals)
-        challenges = [
-            challenger.sample_bits(self.vcs.log_len) for _ in range(self.n_challenges)
+            for i in range(0, len(evals), self.FA_degree)
         ]
+        return self.code.encode_tower_algebra(t_prime)
 
-        for index, (col, vcs_proof) in zip(challenges, proof.vcs_proofs):
-            if not self.vcs.verify_opening(
-                commitment.vcs_commitment, index, vcs_proof, col
-            ):
-                return False
-
-            lhs = sum(
-                (
-                    TowerAlgebra.from_tensor(self.F, self.FA, self.FE, x, y)
-                    for x, y in zip(col, high_partial_query.expansion())
-                ),
-                TowerAlgebra.zero(self.F, self.FA, self.FE),
-            )
-
-            if lhs != u_prime[index]:
-                return False
-
-        return True
+    def _combine_column(
+        self, col: Vector[BinaryFieldElement], coeffs: list[BinaryFieldElement]
+    ) -> TowerAlgebra:
+        return sum(
+            (
+                TowerAlgebra.from_tensor(self.F, self.FA, self.FE, x, y)
+                for x, y in zip(col, coeffs)
+            ),
+            TowerAlgebra.zero(self.F, self.FA, self.FE),
+        )
 
 
 if __name__ == "__main__":
@@ -9,6 +9,32 @@ from .binary_fields import (
     BF32,
     BF64,
     BF128,
+    set_trusted,
+)
+from .profiling import (
+    Span,
+    Profiler,
+    enable_profiling,
+    profiling_enabled,
+    span,
+    traced,
+    get_profiler,
+    reset_profiling,
+    export_json,
+    export_chrome_trace,
+)
+from .op_counters import (
+    enable_op_counting,
+    op_counting_enabled,
+    get_op_counts,
+    reset_op_counts,
+    format_op_counts,
+)
+from .packed_buffer import PackedFieldBuffer, PackedColumns
+from .poly_basis import (
+    PolynomialBasisBackend,
+    enable_poly_basis,
+    get_poly_basis_backend,
 )
 from .tower_algebra import TowerAlgebra
 from .additive_ntt import AdditiveNTT
@@ -24,6 +50,9 @@ from .utils import (
     matrix_multiply_vector,
     transpose,
 )
+from .persist import FlatDigests, CommittedWriter, CommittedReader, read_packed_rows
+from .proof_format import ProofWriter, ProofReader
+from .parallel import BatchVerification, parallel_commit, parallel_ntt
 from .base_pcs import BaseCommitment, BaseCommitted, BaseProof, BasePCS
 
 from typing import TypeVar
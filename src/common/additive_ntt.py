@@ -12,29 +12,54 @@ class AdditiveNTT:
         self._precompute()
 
     def _precompute(self):
+        # subspace_evals[i][k] = W_i(beta_{i + k + 1}) / W_i(beta_i), where
+        # beta_j = 2^j, W_0(X) = X and W_{i+1}(X) = W_i(X) * (W_i(X) + W_i(beta_i))
         norms = [self.field.ONE]
-        s_evals = [[self.field(1 << i) for i in range(self.log_domain_size)]]
+        s_evals = [[self.field(1 << i) for i in range(1, self.log_domain_size)]]
         for _ in range(1, self.log_domain_size):
             norm_prev = norms[-1]
             s_evals_prev = s_evals[-1]
             norms.append(s_evals_prev[0] * (s_evals_prev[0] + norm_prev))
-            s_evals.append([e * (e + norm_prev) for e in s_evals_prev])
+            s_evals.append([e * (e + norm_prev) for e in s_evals_prev[1:]])
         for i in range(self.log_domain_size):
-            for j in range(len(s_evals[i])):
-                s_evals[i][j] = s_evals[i][j] / norms[i]
-
-        s_evals_expanded = []
-        for i in range(self.log_domain_size):
-            expanded = [self.field.ZERO]
-            for e in s_evals[i]:
-                expanded.extend([expanded_prev + e for expanded_prev in expanded])
-            s_evals_expanded.append(expanded)
-
-        self.s_evals = s_evals_expanded
+            norm_inv = norms[i].inv()
+            s_evals[i] = [e * norm_inv for e in s_evals[i]]
+
+        self.subspace_evals = s_evals
+        self._s_evals_expanded = None
+
+    @property
+    def s_evals(self) -> list[list[BinaryFieldElement]]:
+        # the expanded twiddle tables are only needed by the full transforms
+        if self._s_evals_expanded is None:
+            s_evals_expanded = []
+            for i in range(self.log_domain_size):
+                expanded = [self.field.ZERO]
+                for e in self.subspace_evals[i]:
+                    expanded.extend([expanded_prev + e for expanded_prev in expanded])
+                s_evals_expanded.append(expanded)
+            self._s_evals_expanded = s_evals_expanded
+        return self._s_evals_expanded
 
     def _get_twiddle(self, i: int, u: int) -> BinaryFieldElement:
         return self.s_evals[i][u]
 
+    def evaluate_twiddle(self, i: int, u: int) -> BinaryFieldElement:
+        # same as _get_twiddle, but without materialising the expanded tables
+        assert 0 <= u < 1 << (self.log_domain_size - i - 1)
+        value = 0
+        for e in self.subspace_evals[i]:
+            if u & 1:
+                value ^= e.value
+            u >>= 1
+        return self.field(value)
+
+    def evaluate_subspace_poly(self, i: int, index: int) -> BinaryFieldElement:
+        # normalized W_i at the domain point sum_j bit_j(index) * beta_j
+        assert 0 <= index < 1 << self.log_domain_size
+        value = self.field.ONE.value if index >> i & 1 else 0
+        return self.field(value) + self.evaluate_twiddle(i, index >> (i + 1))
+
     def forward_transform(
         self, data: list[BinaryFieldElement] | list[TowerAlgebra]
     ) -> list[BinaryFieldElement] | list[TowerAlgebra]:
@@ -54,6 +79,24 @@ class AdditiveNTT:
 
         return data
 
+    def forward_transform_batch(
+        self, batch: list[list[BinaryFieldElement]]
+    ) -> list[list[BinaryFieldElement]]:
+        # forward_transform of every vector in batch, sharing the twiddle lookups
+        assert all(len(data) == 1 << self.log_domain_size for data in batch)
+
+        for i in range(self.log_degree - 1, -1, -1):
+            for u in range(1 << (self.log_domain_size - i - 1)):
+                twiddle = self._get_twiddle(i, u)
+                for v in range(1 << i):
+                    idx0 = u << (i + 1) | v
+                    idx1 = idx0 | 1 << i
+                    for data in batch:
+                        data[idx0] += data[idx1] * twiddle
+                        data[idx1] += data[idx0]
+
+        return batch
+
     def inverse_transform(
         self, data: list[BinaryFieldElement] | list[TowerAlgebra]
     ) -> list[BinaryFieldElement] | list[TowerAlgebra]:
@@ -73,6 +116,100 @@ class AdditiveNTT:
 
         return data
 
+    # Blocked decomposition. Viewing the domain as 2^(log_domain_size -
+    # log_block) rows of 2^log_block, the butterflies of the layers below
+    # log_block stay inside a row and those of the higher layers inside a
+    # column. The forward transform runs the high layers and then the low ones,
+    # the inverse the other way round; every row and every column can be
+    # transformed independently, in cache-sized pieces and on separate
+    # processes (see common.parallel_ntt). Field additions are XORs, so the
+    # result is bit-identical to forward_transform / inverse_transform.
+
+    def transform_block(
+        self,
+        data: list[BinaryFieldElement],
+        start: int,
+        log_block: int,
+        inverse: bool = False,
+    ) -> list[BinaryFieldElement]:
+        # the layers below log_block on one row: data is the 2^log_block
+        # entries from start, a multiple of 2^log_block
+        assert len(data) == 1 << log_block and start % len(data) == 0
+        layers = range(min(log_block, self.log_degree))
+        for i in layers if inverse else reversed(layers):
+            base = start >> (i + 1)
+            for u in range(len(data) >> (i + 1)):
+                twiddle = self._get_twiddle(i, base + u)
+                for v in range(1 << i):
+                    idx0 = u << (i + 1) | v
+                    idx1 = idx0 | 1 << i
+                    if inverse:
+                        data[idx1] += data[idx0]
+                        data[idx0] += data[idx1] * twiddle
+                    else:
+                        data[idx0] += data[idx1] * twiddle
+                        data[idx1] += data[idx0]
+        return data
+
+    def transform_rows(
+        self,
+        rows: list[list[BinaryFieldElement]],
+        log_block: int,
+        inverse: bool = False,
+    ) -> list[list[BinaryFieldElement]]:
+        # the layers from log_block up on every row, restricted to any one
+        # range of columns: a layer combines two rows with a twiddle that
+        # depends only on the rows, so whole row slices are combined at once
+        assert len(rows) << log_block == 1 << self.log_domain_size
+        layers = range(log_block, self.log_degree)
+        for i in layers if inverse else reversed(layers):
+            h = i - log_block
+            for u in range(len(rows) >> (h + 1)):
+                twiddle = self._get_twiddle(i, u)
+                for v in range(1 << h):
+                    r0 = u << (h + 1) | v
+                    r1 = r0 | 1 << h
+                    row0, row1 = rows[r0], rows[r1]
+                    if inverse:
+                        row1 = [b + a for a, b in zip(row0, row1)]
+                        row0 = [a + b * twiddle for a, b in zip(row0, row1)]
+                    else:
+                        row0 = [a + b * twiddle for a, b in zip(row0, row1)]
+                        row1 = [b + a for a, b in zip(row0, row1)]
+                    rows[r0], rows[r1] = row0, row1
+        return rows
+
+    def _transform_blocked(
+        self, data: list[BinaryFieldElement], log_block: int, inverse: bool
+    ) -> list[BinaryFieldElement]:
+        assert len(data) == 1 << self.log_domain_size
+        log_block = min(log_block, self.log_domain_size)
+        size = 1 << log_block
+        if inverse:
+            for start in range(0, len(data), size):
+                data[start : start + size] = self.transform_block(
+                    data[start : start + size], start, log_block, inverse
+                )
+        rows = [data[start : start + size] for start in range(0, len(data), size)]
+        self.transform_rows(rows, log_block, inverse)
+        data[:] = [e for row in rows for e in row]
+        if not inverse:
+            for start in range(0, len(data), size):
+                data[start : start + size] = self.transform_block(
+                    data[start : start + size], start, log_block, inverse
+                )
+        return data
+
+    def forward_transform_blocked(
+        self, data: list[BinaryFieldElement], log_block: int
+    ) -> list[BinaryFieldElement]:
+        return self._transform_blocked(data, log_block, inverse=False)
+
+    def inverse_transform_blocked(
+        self, data: list[BinaryFieldElement], log_block: int
+    ) -> list[BinaryFieldElement]:
+        return self._transform_blocked(data, log_block, inverse=True)
+
 
 if __name__ == "__main__":
 
@@ -1,8 +1,12 @@
 from .binary_fields import BinaryFieldElement
 from .multilinear import MultilinearExtension
 from .challenger import Challenger
+from .persist import CommittedWriter, CommittedReader
+from .proof_format import ProofWriter, ProofReader
+from .parallel import BatchVerification, verify_batch
 
 from abc import ABC, abstractmethod
+from dataclasses import fields
 
 
 class BaseCommitment(ABC):
@@ -13,7 +17,33 @@ class BaseCommitment(ABC):
 
 
 class BaseCommitted(ABC):
-    pass
+    """
+    The prover state of a commitment. One returned by BasePCS.load_committed
+    views the memory-mapped file it was loaded from; close() (or leaving a
+    with block) drops those views and unmaps the file, after which the object
+    is unusable. Proofs made from it may view their openings in the same file,
+    so they must be dropped first, or close raises BufferError. Otherwise the
+    file is unmapped when the object and all views of it are collected.
+    """
+
+    # the CommittedReader of a loaded object, set by BasePCS.load_committed
+    _reader = None
+
+    def close(self):
+        reader = self._reader
+        if reader is None:
+            return
+        for field in fields(self):
+            setattr(self, field.name, None)
+        reader.close()
+        self._reader = None
+
+    def __enter__(self) -> "BaseCommitted":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
 
 
 class BaseProof(ABC):
@@ -48,3 +78,75 @@ class BasePCS(ABC):
         value: BinaryFieldElement,
     ) -> bool:
         pass
+
+    def save_committed(self, committed: BaseCommitted, path: str):
+        """
+        Write the prover state of a commitment to a file, to be reloaded with
+        load_committed by a PCS constructed with the same parameters.
+        """
+        writer = CommittedWriter()
+        self._write_committed(committed, writer)
+        writer.save(path)
+
+    def load_committed(self, path: str) -> BaseCommitted:
+        """
+        Reload a Committed object saved by save_committed. The file is
+        memory-mapped: encoded columns and Merkle nodes are read from it only
+        when a proof opens them. The object owns the mapping; close it, or
+        use it in a with block, to unmap the file (see BaseCommitted).
+        """
+        reader = CommittedReader(path)
+        committed = self._read_committed(reader)
+        committed._reader = reader
+        return committed
+
+    @abstractmethod
+    def _write_committed(self, committed: BaseCommitted, writer: CommittedWriter):
+        pass
+
+    @abstractmethod
+    def _read_committed(self, reader: CommittedReader) -> BaseCommitted:
+        pass
+
+    def proof_to_bytes(self, proof: BaseProof) -> bytes:
+        """
+        Serialize a proof in the versioned binary format of ProofWriter. The
+        encoding is determined by the PCS parameters, so it is decoded by
+        proof_from_bytes of a PCS constructed with the same parameters.
+        """
+        writer = ProofWriter()
+        self._write_proof(proof, writer)
+        return writer.to_bytes()
+
+    def proof_from_bytes(self, data: bytes | bytearray | memoryview) -> BaseProof:
+        reader = ProofReader(data)
+        proof = self._read_proof(reader)
+        reader.finish()
+        return proof
+
+    def proof_size(self, proof: BaseProof) -> int:
+        return len(self.proof_to_bytes(proof))
+
+    @abstractmethod
+    def _write_proof(self, proof: BaseProof, writer: ProofWriter):
+        pass
+
+    @abstractmethod
+    def _read_proof(self, reader: ProofReader) -> BaseProof:
+        pass
+
+    def verify_batch(
+        self,
+        items: list[tuple[Challenger, BaseCommitment, list, BaseProof | bytes, object]],
+        n_workers: int | None = None,
+        chunksize: int | None = None,
+    ) -> BatchVerification:
+        """
+        Verify independent (challenger, commitment, query, proof, value) items,
+        the arguments of verify_evaluation, over a pool of n_workers processes
+        (default: one per CPU; 1 verifies in this process). Each worker receives
+        this PCS once, so its codes and twiddle tables are built a single time,
+        and gets the items chunksize at a time. Proofs may be given as objects
+        or as proof_to_bytes encodings.
+        """
+        return verify_batch(self, items, n_workers, chunksize)
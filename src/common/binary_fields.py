@@ -1,26 +1,57 @@
 from collections.abc import Iterable
 import random
 
+# Trusted mode skips the runtime validation of field elements on hot paths
+# (element construction, field comparison). Toggle it with set_trusted().
+TRUSTED = False
+
 
 class BinaryField:
 
-    def __init__(self, bit_length: int):
+    # one instance per bit length, so fields can be compared by identity
+    _instances: dict[int, "BinaryField"] = {}
+
+    def __new__(cls, bit_length: int) -> "BinaryField":
+        if bit_length in cls._instances:
+            return cls._instances[bit_length]
         # assert bit_length > 0 and bit_length & (bit_length - 1) == 0
         assert bit_length in {1, 2, 4, 8, 16, 32, 64, 128}
-        self.bit_length = bit_length
-        self.ZERO = self(0)
-        self.ONE = self(1)
+        field = super().__new__(cls)
+        field.bit_length = bit_length
+        field.element_class = type(
+            f"BF{bit_length}Element",
+            (BinaryFieldElement,),
+            {"__slots__": (), "field": field, "bit_length": bit_length},
+        )
+        cls._instances[bit_length] = field
+        field.ZERO = field(0)
+        field.ONE = field(1)
+        return field
+
+    def __reduce__(self):
+        return BinaryField, (self.bit_length,)
+
+    def __copy__(self) -> "BinaryField":
+        return self
+
+    def __deepcopy__(self, memo) -> "BinaryField":
+        return self
 
     def __call__(self, value: "int | BinaryFieldElement") -> "BinaryFieldElement":
-        return BinaryFieldElement(self, value)
+        return self.element_class(self, value)
 
     def __hash__(self) -> int:
         return hash(("BinaryField", self.bit_length))
 
     def __eq__(self, other: "BinaryField") -> bool:
+        if self is other:
+            return True
         assert isinstance(other, BinaryField)
         return self.bit_length == other.bit_length
 
+    def _eq_unchecked(self, other: "BinaryField") -> bool:
+        return self is other or self.bit_length == other.bit_length
+
     def __repr__(self) -> str:
         return f"Binary Field of Size 2^{self.bit_length}"
 
@@ -44,7 +75,7 @@ class BinaryField:
         return self.bit_length // subfield.bit_length
 
     def check_element(self, element: "BinaryFieldElement") -> bool:
-        return isinstance(element, BinaryFieldElement) and element.field == self
+        return isinstance(element, BinaryFieldElement) and element.field is self
 
     def from_unpacked(
         self, elts: Iterable["BinaryFieldElement"]
@@ -59,18 +90,21 @@ class BinaryField:
     def cast_slice(
         self, elts: Iterable["BinaryFieldElement"]
     ) -> list["BinaryFieldElement"]:
-        assert all(isinstance(e, BinaryFieldElement) for e in elts)
-        assert sum(e.bit_length for e in elts) % self.bit_length == 0
-        x = 0
-        for e in elts:
-            x = x << e.bit_length | e.value
+        # the concatenated bits of elts, most significant first, re-split into
+        # elements of this field; only a bounded accumulator is kept, so this is
+        # linear in the input length
         ret = []
-        mask = (1 << self.bit_length) - 1
-        width = sum(e.bit_length for e in elts) // self.bit_length
-        for _ in range(width):
-            ret.append(BinaryFieldElement(self, x & mask))
-            x >>= self.bit_length
-        return ret[::-1]
+        acc, acc_bits = 0, 0
+        for e in elts:
+            assert isinstance(e, BinaryFieldElement)
+            acc = acc << e.bit_length | e.value
+            acc_bits += e.bit_length
+            while acc_bits >= self.bit_length:
+                acc_bits -= self.bit_length
+                ret.append(BinaryFieldElement(self, acc >> acc_bits))
+                acc &= (1 << acc_bits) - 1
+        assert acc_bits == 0
+        return ret
 
     def __or__(self, other: "BinaryField") -> "BinaryField":
         assert isinstance(other, BinaryField)
@@ -85,28 +119,100 @@ class BinaryField:
         return self
 
 
+def _mul_tower(v1: int, v2: int, length: int) -> int:
+    # multiply using Karatsuba method
+    if v1 < 2 or v2 < 2:
+        return v1 * v2
+    halflen = length >> 1
+    quarterlen = length >> 2
+    halfmask = (1 << halflen) - 1
+
+    L1, R1 = v1 & halfmask, v1 >> halflen
+    L2, R2 = v2 & halfmask, v2 >> halflen
+
+    if L1 == 0 and R1 == 1:
+        outR = _mul_tower(1 << quarterlen, R2, halflen) ^ L2
+        return R2 ^ (outR << halflen)
+
+    L1L2 = _mul_tower(L1, L2, halflen)
+    R1R2 = _mul_tower(R1, R2, halflen)
+    R1R2_high = _mul_tower(1 << quarterlen, R1R2, halflen)
+    Z3 = _mul_tower(L1 ^ R1, L2 ^ R2, halflen)
+    return L1L2 ^ R1R2 ^ ((Z3 ^ L1L2 ^ R1R2 ^ R1R2_high) << halflen)
+
+
+def _mul_subfield(v_ext: int, ext_bits: int, v_sub: int, sub_bits: int) -> int:
+    # multiply every subfield-sized limb of v_ext by v_sub
+    mask = (1 << sub_bits) - 1
+    ret = 0
+    for shift in range(0, ext_bits, sub_bits):
+        ret |= _mul_tower(v_ext >> shift & mask, v_sub, sub_bits) << shift
+    return ret
+
+
+_new_element = object.__new__
+
+
 class BinaryFieldElement:
+    """
+    An element of a binary tower field.
 
-    def __init__(self, field: "BinaryField", value: "int | BinaryFieldElement"):
+    Elements are instances of the per-field subclasses created by BinaryField
+    (BF8Element, ..., BF128Element), which carry `field` and `bit_length` as
+    class attributes, so an instance only stores its `value`. Operations
+    between elements of the same field take a fast path that skips the field
+    lookup; elements are immutable and shared by copy/deepcopy.
+    """
+
+    __slots__ = ("value",)
+
+    def __new__(cls, field: "BinaryField", value: "int | BinaryFieldElement"):
         assert isinstance(field, BinaryField)
+        return _new_element(field.element_class)
+
+    def __init__(self, field: "BinaryField", value: "int | BinaryFieldElement"):
+        assert field is self.field
         if isinstance(value, BinaryFieldElement):
             value = value.value
         assert value >= 0 and value.bit_length() <= field.bit_length
-        self.field = field
         self.value = value
 
+    @staticmethod
+    def _new_unchecked(cls, field: "BinaryField", value):
+        return _new_element(field.element_class)
+
+    def _init_unchecked(self, field: "BinaryField", value):
+        if value.__class__ is not int:
+            value = value.value
+        self.value = value
+
+    def __reduce__(self):
+        return self.field, (self.value,)
+
+    def __copy__(self) -> "BinaryFieldElement":
+        return self
+
+    def __deepcopy__(self, memo) -> "BinaryFieldElement":
+        return self
+
     def __hash__(self) -> int:
         return hash(("BinaryFieldElement", self.field, self.value))
 
     def __eq__(self, other: "BinaryFieldElement") -> bool:
+        if other.__class__ is self.__class__:
+            return self.value == other.value
         assert isinstance(other, BinaryFieldElement)
         return self.field == other.field and self.value == other.value
 
     def __add__(self, other: "BinaryFieldElement") -> "BinaryFieldElement":
-        assert isinstance(other, BinaryFieldElement)
-        field = self.field if self.field.is_extension_of(other.field) else other.field
-        value = self.value ^ other.value
-        return BinaryFieldElement(field, value)
+        cls = self.__class__
+        if other.__class__ is not cls:
+            assert isinstance(other, BinaryFieldElement)
+            if other.bit_length > self.bit_length:
+                cls = other.__class__
+        ret = _new_element(cls)
+        ret.value = self.value ^ other.value
+        return ret
 
     __sub__ = __add__
 
@@ -114,51 +220,19 @@ class BinaryFieldElement:
         return self
 
     def __mul__(self, other: "BinaryFieldElement") -> "BinaryFieldElement":
-
-        # multiply using Karatsuba method
-        def mul_equal_length(v1, v2, length):
-            if v1 < 2 or v2 < 2:
-                return v1 * v2
-            halflen = length >> 1
-            quarterlen = length >> 2
-            halfmask = (1 << halflen) - 1
-
-            L1, R1 = v1 & halfmask, v1 >> halflen
-            L2, R2 = v2 & halfmask, v2 >> halflen
-
-            if (L1, R1) == (0, 1):
-                outR = mul_equal_length(1 << quarterlen, R2, halflen) ^ L2
-                return R2 ^ (outR << halflen)
-
-            L1L2 = mul_equal_length(L1, L2, halflen)
-            R1R2 = mul_equal_length(R1, R2, halflen)
-            R1R2_high = mul_equal_length(1 << quarterlen, R1R2, halflen)
-            Z3 = mul_equal_length(L1 ^ R1, L2 ^ R2, halflen)
-            return L1L2 ^ R1R2 ^ ((Z3 ^ L1L2 ^ R1R2 ^ R1R2_high) << halflen)
+        if other.__class__ is self.__class__:
+            ret = _new_element(self.__class__)
+            ret.value = _mul_tower(self.value, other.value, self.bit_length)
+            return ret
 
         assert isinstance(other, BinaryFieldElement)
-        if self.field.is_extension_of(other.field):
-            unpacked = self.unpack_into(other.field)
-            return self.field.from_unpacked(
-                [
-                    BinaryFieldElement(
-                        other.field,
-                        mul_equal_length(v.value, other.value, other.bit_length),
-                    )
-                    for v in unpacked
-                ]
-            )
-        else:
-            unpacked = other.unpack_into(self.field)
-            return other.field.from_unpacked(
-                [
-                    BinaryFieldElement(
-                        self.field,
-                        mul_equal_length(v.value, self.value, self.bit_length),
-                    )
-                    for v in unpacked
-                ]
-            )
+        if self.bit_length < other.bit_length:
+            self, other = other, self
+        ret = _new_element(self.__class__)
+        ret.value = _mul_subfield(
+            self.value, self.bit_length, other.value, other.bit_length
+        )
+        return ret
 
     def __pow__(self, n: int) -> "BinaryFieldElement":
         result = self.field.ONE
@@ -185,10 +259,6 @@ class BinaryFieldElement:
             (self.bit_length + 7) // 8, "little"
         )
 
-    @property
-    def bit_length(self) -> int:
-        return self.field.bit_length
-
     def copy(self) -> "BinaryFieldElement":
         return BinaryFieldElement(self.field, self.value)
 
@@ -220,6 +290,29 @@ BF64 = BinaryField(64)
 BF128 = BinaryField(128)
 
 
+def set_trusted(trusted: bool):
+    """
+    Switch trusted mode on or off. In trusted mode, element construction and
+    field comparison skip their runtime asserts; only use it on inputs that are
+    known to be well-formed.
+    """
+    global TRUSTED
+    TRUSTED = trusted
+    if trusted:
+        BinaryFieldElement.__new__ = BinaryFieldElement._new_unchecked
+        BinaryFieldElement.__init__ = BinaryFieldElement._init_unchecked
+        BinaryField.__eq__ = BinaryField._eq_unchecked
+    else:
+        BinaryFieldElement.__new__ = _checked_element_new
+        BinaryFieldElement.__init__ = _checked_element_init
+        BinaryField.__eq__ = _checked_field_eq
+
+
+_checked_element_new = BinaryFieldElement.__new__
+_checked_element_init = BinaryFieldElement.__init__
+_checked_field_eq = BinaryField.__eq__
+
+
 if __name__ == "__main__":
     a, b, c = [BF128.random_element() for _ in range(3)]
     b = BF16.random_element()
@@ -231,5 +324,5 @@ if __name__ == "__main__":
     print(BF128)
     print(BF128.order())
     print(a.unpack_into(BF32))
-    print(a == BinaryFieldElement.pack_from(a.unpack_into(BF16), BF128))
+    print(a == BF128.from_unpacked(a.unpack_into(BF16)))
     print(BF128 == BinaryField(128))
@@ -1,6 +1,9 @@
-from .binary_fields import BinaryFieldElement
+from .binary_fields import BinaryField, BinaryFieldElement
+from .packed_buffer import PackedFieldBuffer, PackedColumns
+from .persist import FlatDigests
 from .base_pcs import BaseCommitment, BaseCommitted, BaseProof
 
+from collections.abc import Iterable
 from hashlib import sha256
 from dataclasses import dataclass
 
@@ -16,40 +19,206 @@ class MerkleTreeVCS:
 
     @dataclass
     class Committed(BaseCommitted):
-        merkle_tree: list[bytes]
+        # nodes 0 .. 2^(retain_depth + 1) - 1, i.e. the levels down to depth
+        # retain_depth, the leaves being at depth log_len
+        merkle_tree: FlatDigests
 
     @dataclass
     class Proof(BaseProof):
         branch: list[bytes]
 
-    def __init__(self, log_len: int):
+    def __init__(self, log_len: int, retain_depth: int | None = None):
+        """
+        With retain_depth d < log_len, commitments keep only the top d + 1
+        levels of the tree: 2^(d + 1) nodes instead of 2^(log_len + 1). The
+        pruned subtrees below depth d are rebuilt from the leaf vectors when
+        an opening needs them, once per subtree for all the openings of a
+        proof (see prove_openings).
+        """
+        assert retain_depth is None or 0 <= retain_depth
         self.log_len = log_len
-
-    def _hash(self, vec: list[BinaryFieldElement]) -> bytes:
-        h = sha256()
-        for v in vec:
-            h.update(v.to_bytes())
+        self.retain_depth = (
+            log_len if retain_depth is None else min(retain_depth, log_len)
+        )
+        # each pruned subtree has 2^log_subtree_len leaves; 0 if none is pruned
+        self.log_subtree_len = self.log_len - self.retain_depth
+
+    @property
+    def n_nodes(self) -> int:
+        # the number of stored nodes, node 0 included
+        return 2 << self.retain_depth
+
+    def _hash(
+        self,
+        vec: list[BinaryFieldElement] | PackedFieldBuffer,
+        field: BinaryField | None = None,
+    ) -> bytes:
+        # a leaf is its field tag followed by its packed bytes, so a column view
+        # of a PackedColumns is hashed without unpacking it. A list is packed in
+        # field, by default the field of its elements, which an empty list lacks.
+        if not isinstance(vec, PackedFieldBuffer):
+            if field is None:
+                if len(vec) == 0:
+                    raise ValueError("the field of an empty leaf must be given")
+                field = vec[0].field
+            vec = PackedFieldBuffer.pack(vec, field)
+        h = sha256(vec.field.to_bytes())
+        h.update(vec.buffer)
         return h.digest()
 
     def _compress(self, x: bytes, y: bytes) -> bytes:
         return sha256(x + y).digest()
 
     def commit(
-        self, vecs: list[list[BinaryFieldElement]]
+        self,
+        vecs: list[list[BinaryFieldElement]] | PackedColumns,
+        out: bytearray | memoryview | None = None,
     ) -> tuple[Commitment, Committed]:
         assert len(vecs) == 1 << self.log_len
-        tree = [None] * len(vecs) + [self._hash(vec) for vec in vecs]
-        for i in range(len(vecs) - 1, 0, -1):
-            tree[i] = self._compress(tree[i << 1], tree[(i << 1) ^ 1])
-        commitment = MerkleTreeVCS.Commitment(tree[1])
-        committed = MerkleTreeVCS.Committed(tree)
+        # the nodes are written straight into one flat buffer, node i at
+        # [32 i, 32 (i + 1)): a new one, or out, e.g. a reserved file section
+        n = len(vecs)
+        tree = bytearray(32 * self.n_nodes) if out is None else out
+        assert len(tree) == 32 * self.n_nodes
+        if self.log_subtree_len == 0:
+            self.hash_range(vecs, tree, 0, n)
+        else:
+            # one pruned subtree at a time, keeping its root
+            top = 1 << self.retain_depth
+            for j in range(top):
+                tree[32 * (top + j) : 32 * (top + j + 1)] = self._subtree(vecs, j)[1]
+            for i in range(top - 1, 0, -1):
+                self._compress_node(tree, i)
+        commitment = MerkleTreeVCS.Commitment(bytes(tree[32:64]))
+        committed = MerkleTreeVCS.Committed(FlatDigests(tree))
         return commitment, committed
 
-    def prove_opening(self, committed: Committed, index: int) -> Proof:
+    def hash_range(
+        self,
+        vecs: list[list[BinaryFieldElement]] | PackedColumns,
+        tree: bytearray | memoryview,
+        start: int,
+        stop: int,
+    ):
+        # hash the leaves [start, stop) into tree and compress every node all of
+        # whose leaves are in the range, up to the root of their subtree;
+        # stop - start must be a power of two dividing start
+        size = stop - start
+        assert size & (size - 1) == 0 and start % size == 0
+        n = 1 << self.log_len
+        for i in range(start, stop):
+            tree[32 * (n + i) : 32 * (n + i + 1)] = self._hash(vecs[i])
+        lo, hi = n + start, n + stop
+        while hi - lo > 1:
+            lo, hi = lo >> 1, hi >> 1
+            for i in range(hi - 1, lo - 1, -1):
+                self._compress_node(tree, i)
+
+    def _compress_node(self, tree: bytearray | memoryview, i: int):
+        tree[32 * i : 32 * (i + 1)] = self._compress(
+            bytes(tree[64 * i : 64 * i + 32]), bytes(tree[64 * i + 32 : 64 * i + 64])
+        )
+
+    def _subtree(
+        self, vecs: list[list[BinaryFieldElement]] | PackedColumns, j: int
+    ) -> FlatDigests:
+        # the j-th subtree below depth retain_depth, as a flat tree of its own:
+        # its root is node 1 and leaf k of it is leaf j 2^log_subtree_len + k
+        size = 1 << self.log_subtree_len
+        tree = bytearray(64 * size)
+        for k in range(size):
+            tree[32 * (size + k) : 32 * (size + k + 1)] = self._hash(vecs[j * size + k])
+        for i in range(size - 1, 0, -1):
+            self._compress_node(tree, i)
+        return FlatDigests(tree)
+
+    def pruned_leaves(self, indices: Iterable[int]) -> list[int]:
+        # the leaves whose vectors prove_openings reads to open indices: all the
+        # leaves of the pruned subtrees they fall in
+        if self.log_subtree_len == 0:
+            return []
+        size = 1 << self.log_subtree_len
+        return [
+            j * size + k
+            for j in sorted({index >> self.log_subtree_len for index in indices})
+            for k in range(size)
+        ]
+
+    def update(
+        self,
+        committed: Committed,
+        vecs: list[list[BinaryFieldElement]] | PackedColumns,
+        indices: Iterable[int],
+    ) -> Commitment:
+        # rehash the leaves at indices from vecs and recompute only their
+        # ancestors, level by level, in place; in a pruned tree, the ancestors
+        # start at the roots of their subtrees, which are rebuilt
+        tree = committed.merkle_tree.buffer
+        assert len(tree) == 32 * self.n_nodes
+        top = 1 << self.retain_depth
+        nodes = set()
+        for j in {i >> self.log_subtree_len for i in indices}:
+            if self.log_subtree_len == 0:
+                root = self._hash(vecs[j])
+            else:
+                root = self._subtree(vecs, j)[1]
+            tree[32 * (top + j) : 32 * (top + j + 1)] = root
+            nodes.add((top + j) >> 1)
+        while nodes and 0 not in nodes:
+            for i in nodes:
+                self._compress_node(tree, i)
+            nodes = {i >> 1 for i in nodes}
+        return MerkleTreeVCS.Commitment(bytes(tree[32:64]))
+
+    def prove_opening(
+        self,
+        committed: Committed,
+        index: int,
+        vecs: list[list[BinaryFieldElement]] | PackedColumns | None = None,
+    ) -> Proof:
+        return self.prove_openings(committed, [index], vecs)[0]
+
+    def prove_openings(
+        self,
+        committed: Committed,
+        indices: list[int],
+        vecs: list[list[BinaryFieldElement]] | PackedColumns | None = None,
+    ) -> list[Proof]:
+        # vecs, the committed leaf vectors, are needed only if the tree is
+        # pruned, and then only at pruned_leaves(indices); anything indexable
+        # by leaf, e.g. a dict of those leaves, will do
         tree = committed.merkle_tree
-        offset_pos = int(index + len(tree) // 2)
-        branch = [tree[(offset_pos >> i) ^ 1] for i in range(self.log_len)]
-        return MerkleTreeVCS.Proof(branch)
+        assert len(tree) == self.n_nodes
+        subtrees = {}
+        if self.log_subtree_len > 0:
+            assert vecs is not None, "a pruned tree needs the leaves to open"
+            for j in {index >> self.log_subtree_len for index in indices}:
+                subtrees[j] = self._subtree(vecs, j)
+
+        proofs = []
+        for index in indices:
+            branch = []
+            if self.log_subtree_len > 0:
+                j = index >> self.log_subtree_len
+                pos = index - (j << self.log_subtree_len) + (1 << self.log_subtree_len)
+                branch += [
+                    subtrees[j][(pos >> i) ^ 1] for i in range(self.log_subtree_len)
+                ]
+            pos = index + (1 << self.log_len)
+            branch += [
+                tree[(pos >> i) ^ 1] for i in range(self.log_subtree_len, self.log_len)
+            ]
+            proofs.append(MerkleTreeVCS.Proof(branch))
+        return proofs
+
+    def retain(self, committed: Committed) -> Committed:
+        # committed with its full tree cut down to the retained levels, which
+        # are the first n_nodes nodes
+        if len(committed.merkle_tree) == self.n_nodes:
+            return committed
+        return MerkleTreeVCS.Committed(
+            FlatDigests(bytearray(committed.merkle_tree.buffer[: 32 * self.n_nodes]))
+        )
 
     def verify_opening(
         self,
@@ -57,8 +226,10 @@ class MerkleTreeVCS:
         index: int,
         proof: Proof,
         values: list[BinaryFieldElement],
+        field: BinaryField | None = None,
     ) -> bool:
-        root = self._hash(values)
+        # field is the field the leaf was committed in, see _hash
+        root = self._hash(values, field)
         for b in proof.branch:
             if index & 1:
                 root = self._compress(b, root)
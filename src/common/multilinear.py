@@ -1,5 +1,72 @@
 from .binary_fields import BinaryField, BinaryFieldElement
 from .utils import log2, inner_product, vector_multiply_matrix, matrix_multiply_vector
+from .poly_basis import get_poly_basis_backend
+from .packed_buffer import PackedFieldBuffer
+
+# Bit-packed BF1 evaluations are processed as integers, MSB first, so no
+# element is created per bit. The narrow kernel reads this many bits of the
+# matrix at a time.
+_BF1_BLOCK_BITS = 1 << 22
+# Rows at least this long go through the wide kernel: the narrow kernel costs
+# a popcount per output bit per column per block, the wide one a row XOR per
+# output bit per row.
+_BF1_WIDE_ROW_LENGTH = 1 << 11
+
+
+def _is_packed_bits(evals) -> bool:
+    return isinstance(evals, PackedFieldBuffer) and evals.field.bit_length == 1
+
+
+def _partial_eval_high_bits(
+    evals: PackedFieldBuffer,
+    eq: list[BinaryFieldElement],
+    row_length: int,
+    field: BinaryField,
+) -> list[BinaryFieldElement]:
+    # sum_i eq[i] * row_i over a bit matrix: bit p of output j is the parity
+    # of the rows i that have column j set and bit p of eq[i] set
+    bits = field.bit_length
+    n_rows = len(eq)
+    assert n_rows * row_length == len(evals) and len(evals) % 8 == 0
+    buffer = evals.buffer
+
+    if row_length >= _BF1_WIDE_ROW_LENGTH:
+        # one integer per output bit plane, XORed with every selected row
+        planes = [0] * bits
+        row_bytes = row_length // 8
+        for i, e in enumerate(eq):
+            v = e.value
+            if not v:
+                continue
+            row = int.from_bytes(buffer[i * row_bytes : (i + 1) * row_bytes], "big")
+            p = 0
+            while v:
+                if v & 1:
+                    planes[p] ^= row
+                v >>= 1
+                p += 1
+        digits = "".join(format(plane, f"0{row_length}b") for plane in planes[::-1])
+        return [field(int(digits[j::row_length], 2)) for j in range(row_length)]
+
+    # popcounts of column and eq bit plane integers, a block of rows at a time
+    acc = [0] * row_length
+    block_rows = max(8, _BF1_BLOCK_BITS // row_length)
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        n_bits = (stop - start) * row_length
+        chunk = buffer[start * row_length // 8 : stop * row_length // 8]
+        digits = format(int.from_bytes(chunk, "big"), f"0{n_bits}b")
+        eq_digits = "".join(format(e.value, f"0{bits}b") for e in eq[start:stop])
+        planes = [int(eq_digits[bits - 1 - p :: bits], 2) for p in range(bits)]
+        for j in range(row_length):
+            col = int(digits[j::row_length], 2)
+            if not col:
+                continue
+            v = 0
+            for p, plane in enumerate(planes):
+                v |= ((col & plane).bit_count() & 1) << p
+            acc[j] ^= v
+    return [field(v) for v in acc]
 
 
 class MultilinearQuery:
@@ -29,6 +96,17 @@ class MultilinearQuery:
         self, extra_query_coordinates: list[BinaryFieldElement]
     ) -> "MultilinearQuery":
         assert all(isinstance(e, BinaryFieldElement) for e in extra_query_coordinates)
+        backend = get_poly_basis_backend(self.field)
+        if backend is not None:
+            self.expanded_query = backend.batch_from_poly(
+                backend.tensor_expand(
+                    backend.batch_to_poly(self.expanded_query),
+                    backend.batch_to_poly(extra_query_coordinates),
+                )
+            )
+            self.n_vars += len(extra_query_coordinates)
+            return self
+
         new_expanded_query = self.expanded_query
         for coord in extra_query_coordinates:
             p0 = [(self.field.ONE - coord) * v for v in new_expanded_query]
@@ -45,10 +123,17 @@ class MultilinearQuery:
 class MultilinearExtension:
 
     def __init__(
-        self, n_vars: int, evals: list[BinaryFieldElement], field: BinaryField
+        self,
+        n_vars: int,
+        evals: list[BinaryFieldElement] | PackedFieldBuffer,
+        field: BinaryField,
     ):
         assert isinstance(field, BinaryField)
-        assert all(field.check_element(e) for e in evals)
+        # a packed buffer holds elements of its field by construction
+        if isinstance(evals, PackedFieldBuffer):
+            assert evals.field == field
+        else:
+            assert all(field.check_element(e) for e in evals)
         assert len(evals) == 1 << n_vars
         self.field = field
         self.n_vars = n_vars
@@ -67,13 +152,41 @@ class MultilinearExtension:
         n_vars = log2(len(evals))
         return cls(n_vars, evals, field)
 
+    @classmethod
+    def from_bytes(
+        cls, data: bytes | bytearray | memoryview, field: BinaryField
+    ) -> "MultilinearExtension":
+        # evaluations packed as in PackedFieldBuffer, e.g. a BF1 witness at one
+        # bit per evaluation, most significant bit first; the bytes are not
+        # copied
+        return cls.from_evals(PackedFieldBuffer(field, data), field)
+
     def evaluate(self, query: MultilinearQuery) -> BinaryFieldElement:
         assert query.n_vars == self.n_vars
+        if _is_packed_bits(self.evals) and len(self.evals) >= 8:
+            return self.evaluate_partial_high(query).evals[0]
         return inner_product(query.expansion(), self.evals, query.field | self.field)
 
     def evaluate_partial_high(self, query: MultilinearQuery) -> "MultilinearExtension":
         assert query.n_vars <= self.n_vars
         row_length = 1 << (self.n_vars - query.n_vars)
+        if _is_packed_bits(self.evals) and len(self.evals) >= 8:
+            field = query.field | self.field
+            new_evals = _partial_eval_high_bits(
+                self.evals, query.expansion(), row_length, field
+            )
+            return MultilinearExtension.from_evals(new_evals, field)
+        backend = get_poly_basis_backend(query.field | self.field)
+        if backend is not None:
+            new_evals = backend.batch_from_poly(
+                backend.partial_eval_high(
+                    backend.batch_to_poly(self.evals),
+                    backend.batch_to_poly(query.expansion()),
+                    row_length,
+                )
+            )
+            return MultilinearExtension.from_evals(new_evals, backend.field)
+
         mat = [
             self.evals[i : i + row_length]
             for i in range(0, len(self.evals), row_length)
@@ -83,9 +196,54 @@ class MultilinearExtension:
         )
         return MultilinearExtension.from_evals(new_evals, query.field | self.field)
 
+    def evaluate_partial_high_multi(
+        self, queries: list[MultilinearQuery]
+    ) -> list["MultilinearExtension"]:
+        # evaluate_partial_high at several queries of the same size, reading
+        # each column of the evaluation matrix once for all of them
+        assert len(queries) > 0
+        n_vars, field = queries[0].n_vars, queries[0].field
+        assert all(q.n_vars == n_vars and q.field == field for q in queries)
+        assert n_vars <= self.n_vars
+        if _is_packed_bits(self.evals):
+            return [self.evaluate_partial_high(q) for q in queries]
+        row_length = 1 << (self.n_vars - n_vars)
+        backend = get_poly_basis_backend(field | self.field)
+        if backend is not None:
+            new_evals = backend.partial_eval_high_multi(
+                backend.batch_to_poly(self.evals),
+                [backend.batch_to_poly(q.expansion()) for q in queries],
+                row_length,
+            )
+            return [
+                MultilinearExtension.from_evals(
+                    backend.batch_from_poly(evals), backend.field
+                )
+                for evals in new_evals
+            ]
+
+        field = field | self.field
+        new_evals = [[] for _ in queries]
+        for j in range(row_length):
+            col = self.evals[j::row_length]
+            for evals, q in zip(new_evals, queries):
+                evals.append(inner_product(q.expansion(), col, field))
+        return [MultilinearExtension.from_evals(evals, field) for evals in new_evals]
+
     def evaluate_partial_low(self, query: MultilinearQuery) -> "MultilinearExtension":
         assert query.n_vars <= self.n_vars
         row_length = 1 << query.n_vars
+        backend = get_poly_basis_backend(query.field | self.field)
+        if backend is not None:
+            new_evals = backend.batch_from_poly(
+                backend.partial_eval_low(
+                    backend.batch_to_poly(self.evals),
+                    backend.batch_to_poly(query.expansion()),
+                    row_length,
+                )
+            )
+            return MultilinearExtension.from_evals(new_evals, backend.field)
+
         mat = [
             self.evals[i : i + row_length]
             for i in range(0, len(self.evals), row_length)
@@ -0,0 +1,123 @@
+from . import profiling
+from .binary_fields import BinaryFieldElement
+from .merkle import MerkleTreeVCS
+from .challenger import Challenger
+
+from collections import Counter
+
+# Opt-in counting of field operations, Merkle hashing and transcript hashing.
+# enable_op_counting() wraps the counted methods in place; disabling restores
+# the originals, so the counting costs nothing while it is off.
+#
+# Operations are keyed by name and field pair:
+#   "mul BF128*BF8"   multiplication (wider field first, so mixed subfield x
+#                     extension products are separate from same-field ones)
+#   "add BF32+BF32"   addition / subtraction
+#   "inv BF128"       inversion (its internal multiplications are also counted)
+#   "merkle_hash"     leaf hash, "merkle_hash_elems" the elements it absorbed
+#   "merkle_compress" two-to-one node compression
+#   "challenger_hash" transcript hash, by observe or sample
+# The polynomial-basis backend works on plain ints and is not counted.
+
+_totals: Counter = Counter()
+_originals: dict = {}
+
+
+def _count(op: str, n: int = 1):
+    _totals[op] += n
+    span = profiling.get_profiler().current()
+    if span is not None:
+        span.counts[op] = span.counts.get(op, 0) + n
+
+
+def _field_pair(a: BinaryFieldElement, b: BinaryFieldElement, sep: str) -> str:
+    x, y = a.bit_length, b.bit_length
+    if x < y:
+        x, y = y, x
+    return f"BF{x}{sep}BF{y}"
+
+
+def _wrap_mul(mul):
+    def counting_mul(self, other):
+        _count("mul " + _field_pair(self, other, "*"))
+        return mul(self, other)
+
+    return counting_mul
+
+
+def _wrap_add(add):
+    def counting_add(self, other):
+        _count("add " + _field_pair(self, other, "+"))
+        return add(self, other)
+
+    return counting_add
+
+
+def _wrap_inv(inv):
+    def counting_inv(self):
+        _count(f"inv BF{self.bit_length}")
+        return inv(self)
+
+    return counting_inv
+
+
+def _wrap_merkle_hash(hash):
+    def counting_hash(self, vec, field=None):
+        _count("merkle_hash")
+        _count("merkle_hash_elems", len(vec))
+        return hash(self, vec, field)
+
+    return counting_hash
+
+
+def _wrap_counted(fn, op: str):
+    def counting(*args, **kwargs):
+        _count(op)
+        return fn(*args, **kwargs)
+
+    return counting
+
+
+_PATCHES = [
+    (BinaryFieldElement, "__mul__", _wrap_mul),
+    (BinaryFieldElement, "__add__", _wrap_add),
+    (BinaryFieldElement, "__sub__", _wrap_add),
+    (BinaryFieldElement, "inv", _wrap_inv),
+    (MerkleTreeVCS, "_hash", _wrap_merkle_hash),
+    (MerkleTreeVCS, "_compress", lambda fn: _wrap_counted(fn, "merkle_compress")),
+    (Challenger, "_hash", lambda fn: _wrap_counted(fn, "challenger_hash")),
+]
+
+
+def enable_op_counting(enabled: bool = True):
+    """
+    Turn operation counting on or off. Counts accumulate into the run totals
+    (get_op_counts) and, while profiling is enabled, into the innermost open
+    span, so each phase gets its own breakdown.
+    """
+    if enabled and not _originals:
+        for cls, name, wrap in _PATCHES:
+            original = cls.__dict__[name]
+            _originals[cls, name] = original
+            setattr(cls, name, wrap(original))
+    elif not enabled and _originals:
+        for (cls, name), original in _originals.items():
+            setattr(cls, name, original)
+        _originals.clear()
+
+
+def op_counting_enabled() -> bool:
+    return bool(_originals)
+
+
+def get_op_counts() -> dict[str, int]:
+    return dict(_totals)
+
+
+def reset_op_counts():
+    _totals.clear()
+
+
+def format_op_counts(counts: dict[str, int]) -> str:
+    width = max((len(op) for op in counts), default=0)
+    return "\n".join(f"{op:<{width}}  {counts[op]:>12}" for op in sorted(counts))
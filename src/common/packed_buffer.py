@@ -0,0 +1,254 @@
+from .binary_fields import BinaryField, BinaryFieldElement
+
+from collections.abc import Iterable, Iterator
+
+
+class PackedFieldBuffer:
+    """
+    A read-only sequence of field elements backed by a byte buffer.
+
+    Elements are packed most significant first: element i of a field of b bits
+    occupies bits [i * b, (i + 1) * b) of the buffer read as one big-endian
+    integer. This is the element order of `BinaryField.cast_slice` and
+    `BinaryField.from_unpacked`, so viewing the same bytes through another
+    field (`cast`) is a zero-copy cast_slice, e.g. n BF8 values as n / 16 BF128
+    values and back.
+    """
+
+    def __init__(
+        self,
+        field: BinaryField,
+        buffer: bytes | bytearray | memoryview,
+        length: int | None = None,
+    ):
+        assert isinstance(field, BinaryField)
+        buffer = memoryview(buffer).cast("B")
+        if length is None:
+            length = len(buffer) * 8 // field.bit_length
+        assert length * field.bit_length <= len(buffer) * 8
+        assert length * field.bit_length % 8 == 0
+        self.field = field
+        self.buffer = buffer[: length * field.bit_length // 8]
+        self.length = length
+
+    def __repr__(self) -> str:
+        return f"PackedFieldBuffer(len={self.length}) in {self.field}"
+
+    def __reduce__(self):
+        # memoryviews do not pickle: copy out exactly this view's bytes
+        return PackedFieldBuffer, (self.field, self.to_bytes(), self.length)
+
+    def __len__(self) -> int:
+        return self.length
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer)
+
+    @classmethod
+    def pack(
+        cls, elts: Iterable[BinaryFieldElement], field: BinaryField
+    ) -> "PackedFieldBuffer":
+        # elts may be a generator: check each element as it is packed
+        def values():
+            for e in elts:
+                assert field.check_element(e)
+                yield e.value
+
+        return cls.from_values(values(), field)
+
+    @classmethod
+    def as_packed(
+        cls, elts: Iterable[BinaryFieldElement], field: BinaryField
+    ) -> "PackedFieldBuffer":
+        if isinstance(elts, PackedFieldBuffer) and elts.field == field:
+            return elts
+        return cls.pack(elts, field)
+
+    @classmethod
+    def from_values(
+        cls, values: Iterable[int], field: BinaryField
+    ) -> "PackedFieldBuffer":
+        bits = field.bit_length
+        if bits >= 8:
+            width = bits // 8
+            buffer = bytearray(b"".join(v.to_bytes(width, "big") for v in values))
+        else:
+            per_byte = 8 // bits
+            buffer = bytearray()
+            acc, n = 0, 0
+            for v in values:
+                assert v >> bits == 0
+                acc = acc << bits | v
+                n += 1
+                if n == per_byte:
+                    buffer.append(acc)
+                    acc, n = 0, 0
+            assert n == 0
+        return cls(field, buffer)
+
+    def cast(self, field: BinaryField) -> "PackedFieldBuffer":
+        # reinterpret the same bytes as elements of another field
+        assert self.nbytes * 8 % field.bit_length == 0
+        return PackedFieldBuffer(field, self.buffer)
+
+    def _get_value(self, index: int) -> int:
+        bits = self.field.bit_length
+        if bits >= 8:
+            width = bits // 8
+            return int.from_bytes(
+                self.buffer[index * width : (index + 1) * width], "big"
+            )
+        pos = index * bits
+        shift = 8 - bits - (pos & 7)
+        return self.buffer[pos >> 3] >> shift & ((1 << bits) - 1)
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> "BinaryFieldElement | PackedFieldBuffer":
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            assert step == 1
+            stop = max(start, stop)
+            bits = self.field.bit_length
+            assert start * bits % 8 == 0 and stop * bits % 8 == 0
+            return PackedFieldBuffer(
+                self.field, self.buffer[start * bits // 8 : stop * bits // 8]
+            )
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("PackedFieldBuffer index out of range")
+        return BinaryFieldElement(self.field, self._get_value(index))
+
+    def values(self) -> list[int]:
+        bits = self.field.bit_length
+        buffer = self.buffer
+        if bits >= 8:
+            width = bits // 8
+            return [
+                int.from_bytes(buffer[i : i + width], "big")
+                for i in range(0, len(buffer), width)
+            ]
+        mask = (1 << bits) - 1
+        shifts = range(8 - bits, -1, -bits)
+        return [byte >> shift & mask for byte in buffer for shift in shifts]
+
+    def __iter__(self) -> Iterator[BinaryFieldElement]:
+        field = self.field
+        return (BinaryFieldElement(field, v) for v in self.values())
+
+    def to_list(self) -> list[BinaryFieldElement]:
+        return list(self)
+
+    def to_bytes(self) -> bytes:
+        return self.buffer.tobytes()
+
+
+class PackedColumns:
+    """
+    A matrix stored column-major in one PackedFieldBuffer: column j occupies
+    elements [j * col_length, (j + 1) * col_length). Indexing and iteration
+    return columns as zero-copy PackedFieldBuffer views, so it can stand in for
+    a list of columns at the cost of the packed bytes alone, in memory or
+    backed by a file mapping.
+    """
+
+    def __init__(self, buffer: PackedFieldBuffer, col_length: int):
+        assert len(buffer) % col_length == 0
+        assert col_length * buffer.field.bit_length % 8 == 0
+        self.field = buffer.field
+        self.buffer = buffer
+        self.col_length = col_length
+
+    def __repr__(self) -> str:
+        return (
+            f"PackedColumns(n_cols={len(self)}, col_length={self.col_length})"
+            f" in {self.field}"
+        )
+
+    @classmethod
+    def from_columns(
+        cls, cols: Iterable[Iterable[BinaryFieldElement]], field: BinaryField
+    ) -> "PackedColumns":
+        if isinstance(cols, PackedColumns) and cols.field == field:
+            return cols
+        cols = [list(col) for col in cols]
+        return cls(
+            PackedFieldBuffer.pack([e for col in cols for e in col], field),
+            len(cols[0]),
+        )
+
+    @classmethod
+    def from_rows(
+        cls, rows: list[list[BinaryFieldElement]], field: BinaryField
+    ) -> "PackedColumns":
+        # transpose while packing, one column of values at a time, checking
+        # each element as it is packed
+        assert all(len(row) == len(rows[0]) for row in rows)
+        buffer = PackedFieldBuffer.pack((e for col in zip(*rows) for e in col), field)
+        return cls(buffer, len(rows))
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes
+
+    def row(self, index: int) -> list[BinaryFieldElement]:
+        # entry index of every column; a strided read
+        assert 0 <= index < self.col_length
+        field, buffer = self.field, self.buffer
+        return [
+            BinaryFieldElement(field, buffer._get_value(j * self.col_length + index))
+            for j in range(len(self))
+        ]
+
+    def write_rows(self, start: int, rows: list[list[BinaryFieldElement]]):
+        # overwrite rows [start, start + len(rows)) of a writable buffer, one
+        # packed column segment at a time
+        bits = self.field.bit_length
+        assert start * bits % 8 == 0 and len(rows) * bits % 8 == 0
+        assert start + len(rows) <= self.col_length
+        assert all(len(row) == len(self) for row in rows)
+        buffer = self.buffer.buffer
+        col_bytes = self.col_length * bits // 8
+        pos = start * bits // 8
+        for col in zip(*rows):
+            segment = PackedFieldBuffer.pack(col, self.field)
+            buffer[pos : pos + segment.nbytes] = segment.buffer
+            pos += col_bytes
+
+    def set_rows(self, rows: dict[int, list[BinaryFieldElement]]):
+        # overwrite the rows at the keys of rows, which need be neither
+        # contiguous nor byte-aligned, in one pass over each column
+        field, bits = self.field, self.field.bit_length
+        assert all(0 <= r < self.col_length for r in rows)
+        assert all(len(row) == len(self) for row in rows.values())
+        buffer = self.buffer.buffer
+        indices = sorted(rows)
+        for j, col in enumerate(zip(*(rows[r] for r in indices))):
+            for r, e in zip(indices, col):
+                assert field.check_element(e)
+                pos = (j * self.col_length + r) * bits
+                if bits >= 8:
+                    buffer[pos >> 3 : (pos + bits) >> 3] = e.value.to_bytes(
+                        bits // 8, "big"
+                    )
+                else:
+                    shift = 8 - bits - (pos & 7)
+                    mask = ((1 << bits) - 1) << shift
+                    buffer[pos >> 3] = buffer[pos >> 3] & ~mask | e.value << shift
+
+    def __len__(self) -> int:
+        return len(self.buffer) // self.col_length
+
+    def column(self, index: int) -> PackedFieldBuffer:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PackedColumns index out of range")
+        return self.buffer[index * self.col_length : (index + 1) * self.col_length]
+
+    __getitem__ = column
+
+    def __iter__(self) -> Iterator[PackedFieldBuffer]:
+        return (self.column(i) for i in range(len(self)))
@@ -0,0 +1,396 @@
+from . import binary_fields, poly_basis
+from .binary_fields import BinaryField, BinaryFieldElement
+from .challenger import Challenger
+from .packed_buffer import PackedFieldBuffer, PackedColumns
+from .persist import FlatDigests
+from .additive_ntt import AdditiveNTT
+from .utils import log2
+
+from copy import deepcopy
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import multiprocessing
+import time
+
+# The PCS a pool worker verifies with, set once by _init_worker.
+_worker_pcs = None
+# The buffers a pool worker commits into, set once by _init_commit_worker.
+_worker_commit = None
+_worker_shms = None
+# The buffer a pool worker transforms in place, set once by _init_ntt_worker.
+_worker_ntt = None
+
+# Rows of 2^10 elements: 16 KiB of BF128, a few rows per core's cache.
+NTT_LOG_BLOCK = 10
+
+
+@dataclass
+class BatchVerification:
+    """
+    The outcome of BasePCS.verify_batch: one result per item, in order, and the
+    wall time the whole batch took.
+    """
+
+    results: list[bool]
+    elapsed: float
+    n_workers: int
+    chunksize: int
+
+    @property
+    def n_items(self) -> int:
+        return len(self.results)
+
+    @property
+    def n_valid(self) -> int:
+        return sum(self.results)
+
+    @property
+    def throughput(self) -> float:
+        # verified items per second
+        return self.n_items / self.elapsed if self.elapsed > 0 else float("inf")
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchVerification({self.n_valid}/{self.n_items} valid,"
+            f" {self.elapsed:.3f}s, {self.throughput:.1f} proofs/s,"
+            f" n_workers={self.n_workers}, chunksize={self.chunksize})"
+        )
+
+
+def _init_worker(pcs, trusted: bool, poly_basis_enabled: bool):
+    # the PCS, with its codes and twiddle tables, arrives once per worker
+    global _worker_pcs
+    _worker_pcs = pcs
+    binary_fields.set_trusted(trusted)
+    poly_basis.enable_poly_basis(poly_basis_enabled)
+
+
+def _verify_item(item: tuple) -> bool:
+    return verify_item(_worker_pcs, item)
+
+
+def verify_item(pcs, item: tuple) -> bool:
+    # item is (challenger, commitment, query, proof, value); the proof may be
+    # a proof object or its proof_to_bytes encoding. Verifiers reject
+    # malformed proof objects; an encoding that does not decode (ValueError)
+    # fails its own item rather than the batch.
+    challenger, commitment, query, proof, value = item
+    if isinstance(proof, (bytes, bytearray, memoryview)):
+        try:
+            proof = pcs.proof_from_bytes(proof)
+        except ValueError:
+            return False
+    return pcs.verify_evaluation(challenger, commitment, query, proof, value)
+
+
+def _proof_bytes(pcs, proof):
+    if isinstance(proof, (bytes, bytearray, memoryview)):
+        return proof
+    try:
+        return pcs.proof_to_bytes(proof)
+    except ValueError:
+        # sent as an object, for the worker to reject
+        return proof
+
+
+def verify_batch(
+    pcs,
+    items: list[tuple[Challenger, object, list[BinaryFieldElement], object, object]],
+    n_workers: int | None = None,
+    chunksize: int | None = None,
+) -> BatchVerification:
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    n_workers = max(1, min(n_workers, len(items)))
+    if chunksize is None:
+        # a few chunks per worker balances load against per-task overhead
+        chunksize = max(1, len(items) // (4 * n_workers))
+
+    start = time.perf_counter()
+    if n_workers == 1:
+        # verification advances the challengers; leave the caller's untouched
+        results = [
+            verify_item(pcs, (deepcopy(item[0]),) + tuple(item[1:])) for item in items
+        ]
+    else:
+        # proofs travel to the workers in their compact binary encoding
+        items = [
+            (c, commitment, query, _proof_bytes(pcs, proof), value)
+            for c, commitment, query, proof, value in items
+        ]
+        with multiprocessing.Pool(
+            n_workers,
+            initializer=_init_worker,
+            initargs=(pcs, binary_fields.TRUSTED, poly_basis._enabled),
+        ) as pool:
+            results = pool.map(_verify_item, items, chunksize)
+    elapsed = time.perf_counter() - start
+
+    return BatchVerification(results, elapsed, n_workers, chunksize)
+
+
+class _CommitState:
+    """
+    The buffers of one commit: the packed evaluations, the column-major
+    encoded matrix and the flat Merkle tree. The tasks below fill disjoint
+    parts of them, so the result does not depend on how they are scheduled.
+    """
+
+    def __init__(self, pcs, evals: PackedFieldBuffer, cols: PackedColumns, tree):
+        self.pcs = pcs
+        self.evals = evals
+        self.cols = cols
+        self.tree = tree
+        self.row_length = 1 << pcs.log_cols
+
+    def encode_rows(self, rows: range):
+        length = self.row_length
+        encoded = [
+            self.pcs.encode_row(self.evals[r * length : (r + 1) * length]) for r in rows
+        ]
+        self.cols.write_rows(rows.start, encoded)
+
+    def hash_columns(self, cols: range):
+        self.pcs.vcs.hash_range(self.cols, self.tree, cols.start, cols.stop)
+
+
+def _init_commit_worker(
+    pcs,
+    names: tuple[str, str, str],
+    fields: tuple[BinaryField, BinaryField],
+    trusted: bool,
+):
+    # attach to the parent's shared buffers; only ranges cross the pipe
+    global _worker_commit, _worker_shms
+    binary_fields.set_trusted(trusted)
+    _worker_shms = [shared_memory.SharedMemory(name) for name in names]
+    evals_shm, cols_shm, tree_shm = _worker_shms
+    evals_field, col_field = fields
+    _worker_commit = _CommitState(
+        pcs,
+        PackedFieldBuffer(evals_field, evals_shm.buf, 1 << pcs.n_vars),
+        PackedColumns(
+            PackedFieldBuffer(
+                col_field, cols_shm.buf, (1 << pcs.vcs.log_len) << pcs.log_rows
+            ),
+            1 << pcs.log_rows,
+        ),
+        tree_shm.buf[: 64 << pcs.vcs.log_len],
+    )
+
+
+def _encode_rows_task(rows: range):
+    _worker_commit.encode_rows(rows)
+
+
+def _hash_columns_task(cols: range):
+    _worker_commit.hash_columns(cols)
+
+
+def _split(n: int, n_parts: int, align: int) -> list[range]:
+    # [0, n) in at most n_parts contiguous ranges, starting at multiples of align
+    step = max(align, -(-n // n_parts // align) * align)
+    return [range(i, min(i + step, n)) for i in range(0, n, step)]
+
+
+def parallel_commit(
+    pcs,
+    evals: PackedFieldBuffer,
+    col_field: BinaryField,
+    n_workers: int | None = None,
+) -> tuple[PackedColumns, FlatDigests]:
+    """
+    The encoded columns and Merkle tree of a Basic/Block PCS commit, built by
+    a process pool: workers first RS-encode shards of rows into a shared
+    column-major buffer, then hash aligned column ranges and compress their
+    subtrees; the top of the tree is compressed here. Workers exchange only
+    row and column ranges, never field elements, and the result is
+    bit-identical to the sequential commit.
+    """
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    n_rows, n_cols = 1 << pcs.log_rows, 1 << pcs.vcs.log_len
+    cols_nbytes = n_rows * n_cols * col_field.bit_length // 8
+    # shards of rows must start on byte boundaries of the columns
+    row_align = max(1, 8 // col_field.bit_length)
+    # a few tasks per worker evens out the load
+    row_ranges = _split(n_rows, 4 * n_workers, row_align)
+    n_subtrees = min(n_cols, 1 << (4 * n_workers - 1).bit_length())
+    col_ranges = _split(n_cols, n_subtrees, n_cols // n_subtrees)
+
+    if n_workers == 1:
+        state = _CommitState(
+            pcs,
+            evals,
+            PackedColumns(PackedFieldBuffer(col_field, bytearray(cols_nbytes)), n_rows),
+            bytearray(64 * n_cols),
+        )
+        for rows in row_ranges:
+            state.encode_rows(rows)
+        for cols in col_ranges:
+            state.hash_columns(cols)
+        cols, tree = state.cols, state.tree
+    else:
+        sizes = (evals.nbytes, cols_nbytes, 64 * n_cols)
+        shms = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        try:
+            shms[0].buf[: evals.nbytes] = evals.buffer
+            with multiprocessing.Pool(
+                n_workers,
+                initializer=_init_commit_worker,
+                initargs=(
+                    pcs,
+                    tuple(shm.name for shm in shms),
+                    (evals.field, col_field),
+                    binary_fields.TRUSTED,
+                ),
+            ) as pool:
+                pool.map(_encode_rows_task, row_ranges)
+                pool.map(_hash_columns_task, col_ranges)
+            cols = PackedColumns(
+                PackedFieldBuffer(col_field, bytearray(shms[1].buf[:cols_nbytes])),
+                n_rows,
+            )
+            tree = bytearray(shms[2].buf[: 64 * n_cols])
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+    # the subtree roots are nodes n_subtrees .. 2 n_subtrees - 1
+    for i in range(len(col_ranges) - 1, 0, -1):
+        pcs.vcs._compress_node(tree, i)
+    return cols, FlatDigests(tree)
+
+
+class _NTTState:
+    """
+    One transform, in place in a packed buffer: transform_blocks runs the low
+    layers on whole rows, transform_columns the high layers on slabs of
+    columns (see AdditiveNTT.transform_block / transform_rows).
+    """
+
+    def __init__(
+        self, ntt: AdditiveNTT, data: PackedFieldBuffer, log_block: int, inverse: bool
+    ):
+        self.ntt = ntt
+        self.data = data
+        self.log_block = log_block
+        self.inverse = inverse
+        self.n_rows = len(data) >> log_block
+
+    def _write(self, start: int, elems: list[BinaryFieldElement]):
+        view = self.data[start : start + len(elems)]
+        view.buffer[:] = PackedFieldBuffer.from_values(
+            (e.value for e in elems), self.data.field
+        ).buffer
+
+    def transform_blocks(self, blocks: range):
+        size = 1 << self.log_block
+        for k in blocks:
+            start = k * size
+            block = self.data[start : start + size].to_list()
+            self._write(
+                start,
+                self.ntt.transform_block(block, start, self.log_block, self.inverse),
+            )
+
+    def transform_columns(self, cols: range):
+        size = 1 << self.log_block
+        rows = [
+            self.data[r * size + cols.start : r * size + cols.stop].to_list()
+            for r in range(self.n_rows)
+        ]
+        self.ntt.transform_rows(rows, self.log_block, self.inverse)
+        for r, row in enumerate(rows):
+            self._write(r * size + cols.start, row)
+
+
+def _init_ntt_worker(
+    ntt: AdditiveNTT,
+    name: str,
+    field: BinaryField,
+    log_block: int,
+    inverse: bool,
+    trusted: bool,
+):
+    global _worker_ntt, _worker_shms
+    binary_fields.set_trusted(trusted)
+    _worker_shms = [shared_memory.SharedMemory(name)]
+    data = PackedFieldBuffer(field, _worker_shms[0].buf, 1 << ntt.log_domain_size)
+    _worker_ntt = _NTTState(ntt, data, log_block, inverse)
+
+
+def _ntt_blocks_task(blocks: range):
+    _worker_ntt.transform_blocks(blocks)
+
+
+def _ntt_columns_task(cols: range):
+    _worker_ntt.transform_columns(cols)
+
+
+def parallel_ntt(
+    ntt: AdditiveNTT,
+    data: PackedFieldBuffer,
+    inverse: bool = False,
+    n_workers: int | None = None,
+    log_block: int = NTT_LOG_BLOCK,
+) -> PackedFieldBuffer:
+    """
+    ntt.forward_transform (or inverse_transform) of the packed data, blocked
+    and run on a process pool: the data is viewed as rows of 2^log_block
+    elements; workers transform shards of contiguous rows through the low
+    layers and slabs of columns through the high ones, in place in one shared
+    buffer, and exchange only row and column ranges. The result is a new
+    buffer, bit-identical to the unblocked transform.
+    """
+    assert len(data) == 1 << ntt.log_domain_size and data.field == ntt.field
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    # rows and column slabs must start on byte boundaries
+    col_align = max(1, 8 // data.field.bit_length)
+    log_block = min(max(log_block, log2(col_align)), ntt.log_domain_size)
+    n_rows = len(data) >> log_block
+    # a few tasks per worker
+    block_ranges = _split(n_rows, 4 * n_workers, 1)
+    col_ranges = _split(1 << log_block, 4 * n_workers, col_align)
+    # forward: high layers (columns) first; inverse: low layers (rows) first
+    passes = ["columns", "blocks"][:: -1 if inverse else 1]
+
+    if n_workers == 1:
+        out = PackedFieldBuffer(data.field, bytearray(data.buffer), len(data))
+        state = _NTTState(ntt, out, log_block, inverse)
+        for name in passes:
+            if name == "columns":
+                for cols in col_ranges:
+                    state.transform_columns(cols)
+            else:
+                for blocks in block_ranges:
+                    state.transform_blocks(blocks)
+        return out
+
+    shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+    try:
+        shm.buf[: data.nbytes] = data.buffer
+        with multiprocessing.Pool(
+            n_workers,
+            initializer=_init_ntt_worker,
+            initargs=(
+                ntt,
+                shm.name,
+                data.field,
+                log_block,
+                inverse,
+                binary_fields.TRUSTED,
+            ),
+        ) as pool:
+            # each map returns once its whole pass is done
+            for name in passes:
+                if name == "columns":
+                    pool.map(_ntt_columns_task, col_ranges)
+                else:
+                    pool.map(_ntt_blocks_task, block_ranges)
+        return PackedFieldBuffer(data.field, bytearray(shm.buf[: data.nbytes]))
+    finally:
+        shm.close()
+        shm.unlink()
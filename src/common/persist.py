@@ -0,0 +1,211 @@
+from .packed_buffer import PackedFieldBuffer, PackedColumns
+from .binary_fields import BinaryField
+
+from collections.abc import Iterator
+import json
+import mmap
+import struct
+
+# File layout: MAGIC, then the version and the number of sections as
+# little-endian u32s, then an (offset, length) u64 pair per section. Section
+# data starts at offsets aligned to SECTION_ALIGN so mapped buffers of wide
+# fields stay aligned.
+MAGIC = b"BINIUSCM"
+VERSION = 1
+SECTION_ALIGN = 64
+
+
+class FlatDigests:
+    """
+    The nodes of a Merkle tree stored back to back in one buffer, indexed like
+    the list built by MerkleTreeVCS.commit. Node 0 is unused and stored as
+    zeros.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | memoryview, digest_size: int = 32):
+        buffer = memoryview(buffer).cast("B")
+        assert len(buffer) % digest_size == 0
+        self.buffer = buffer
+        self.digest_size = digest_size
+
+    def __repr__(self) -> str:
+        return f"FlatDigests(len={len(self)})"
+
+    @classmethod
+    def from_tree(
+        cls, tree: list[bytes | None], digest_size: int = 32
+    ) -> "FlatDigests":
+        if isinstance(tree, FlatDigests):
+            return tree
+        zero = bytes(digest_size)
+        return cls(
+            b"".join(zero if node is None else node for node in tree), digest_size
+        )
+
+    def __len__(self) -> int:
+        return len(self.buffer) // self.digest_size
+
+    def __getitem__(self, index: int) -> bytes:
+        if not 0 <= index < len(self):
+            raise IndexError("FlatDigests index out of range")
+        size = self.digest_size
+        return self.buffer[index * size : (index + 1) * size].tobytes()
+
+
+class CommittedWriter:
+    """
+    Collects the sections of a saved Committed object. PCSs write their state
+    as a sequence of JSON headers and raw buffers, and read it back from a
+    CommittedReader in the same order. Buffers that are not known yet can be
+    reserved instead; they are saved as zeros (sparse, where the filesystem
+    allows) and filled in later through a writable CommittedReader.
+    """
+
+    def __init__(self):
+        # a reserved section is stored as its length
+        self.sections: list[bytes | memoryview | int] = []
+
+    def write_bytes(self, data: bytes | bytearray | memoryview):
+        self.sections.append(data)
+
+    def reserve(self, length: int):
+        self.sections.append(length)
+
+    def write_json(self, obj):
+        self.write_bytes(json.dumps(obj).encode())
+
+    def write_elements(self, buffer: PackedFieldBuffer):
+        self.write_json({"field": buffer.field.bit_length, "length": len(buffer)})
+        self.write_bytes(buffer.buffer)
+
+    def write_columns(self, cols: PackedColumns):
+        self.write_json({"col_length": cols.col_length})
+        self.write_elements(cols.buffer)
+
+    def write_digests(self, digests: FlatDigests):
+        self.write_json({"digest_size": digests.digest_size})
+        self.write_bytes(digests.buffer)
+
+    def reserve_columns(self, field: BinaryField, n_cols: int, col_length: int):
+        # the sections of write_columns for a matrix that is not computed yet
+        length = n_cols * col_length
+        assert length * field.bit_length % 8 == 0
+        self.write_json({"col_length": col_length})
+        self.write_json({"field": field.bit_length, "length": length})
+        self.reserve(length * field.bit_length // 8)
+
+    def reserve_digests(self, n: int, digest_size: int = 32):
+        self.write_json({"digest_size": digest_size})
+        self.reserve(n * digest_size)
+
+    def save(self, path: str):
+        header_size = len(MAGIC) + 8 + 16 * len(self.sections)
+        table, offset = [], header_size
+        for section in self.sections:
+            length = section if isinstance(section, int) else len(section)
+            offset = -(-offset // SECTION_ALIGN) * SECTION_ALIGN
+            table.append((offset, length))
+            offset += length
+        end = offset
+
+        with open(path, "wb") as f:
+            f.write(MAGIC + struct.pack("<II", VERSION, len(self.sections)))
+            for entry in table:
+                f.write(struct.pack("<QQ", *entry))
+            for (offset, _), section in zip(table, self.sections):
+                if not isinstance(section, int):
+                    f.seek(offset)
+                    f.write(section)
+            f.truncate(end)
+
+
+class CommittedReader:
+    """
+    Reads back the sections of a file written by CommittedWriter. The file is
+    memory-mapped and buffers are returned as views into the mapping, so
+    nothing is copied until it is used. With writable, the views write through
+    to the file, which is how reserved sections are filled in.
+
+    close() (or leaving a with block) unmaps the file. The mapping cannot be
+    closed while views read from it are alive, so drop them first; close then
+    raises BufferError otherwise. A reader that is never closed is unmapped
+    when it and all its views are garbage collected.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        with open(path, "r+b" if writable else "rb") as f:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self.mapping = mmap.mmap(f.fileno(), 0, access=access)
+        self._view = view = memoryview(self.mapping)
+        self.sections = []
+        if view[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a saved Committed object")
+        version, n_sections = struct.unpack_from("<II", view, len(MAGIC))
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"unsupported Committed file version {version}")
+        for i in range(n_sections):
+            offset, length = struct.unpack_from("<QQ", view, len(MAGIC) + 8 + 16 * i)
+            self.sections.append(view[offset : offset + length])
+        self.position = 0
+
+    def read_bytes(self) -> memoryview:
+        section = self.sections[self.position]
+        self.position += 1
+        return section
+
+    def read_json(self):
+        return json.loads(bytes(self.read_bytes()))
+
+    def read_elements(self) -> PackedFieldBuffer:
+        header = self.read_json()
+        field = BinaryField(header["field"])
+        return PackedFieldBuffer(field, self.read_bytes(), header["length"])
+
+    def read_columns(self) -> PackedColumns:
+        header = self.read_json()
+        return PackedColumns(self.read_elements(), header["col_length"])
+
+    def read_digests(self) -> FlatDigests:
+        header = self.read_json()
+        return FlatDigests(self.read_bytes(), header["digest_size"])
+
+    def flush(self):
+        self.mapping.flush()
+
+    def close(self):
+        for section in self.sections:
+            section.release()
+        self._view.release()
+        self.mapping.close()
+
+    def __enter__(self) -> "CommittedReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except BufferError:
+            # an exception keeps the views of its frames alive; they are
+            # unmapped when collected, and the exception is what matters
+            if exc_type is None:
+                raise
+        return False
+
+
+def read_packed_rows(
+    path: str, field: BinaryField, row_length: int
+) -> Iterator[PackedFieldBuffer]:
+    """
+    The rows of a raw file of packed field elements (the PackedFieldBuffer
+    layout, with no header), as views into a mapping of the file.
+    """
+    assert row_length * field.bit_length % 8 == 0
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    row_bytes = row_length * field.bit_length // 8
+    assert len(mapping) % row_bytes == 0
+    view = memoryview(mapping)
+    for offset in range(0, len(mapping), row_bytes):
+        yield PackedFieldBuffer(field, view[offset : offset + row_bytes])
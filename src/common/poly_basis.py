@@ -0,0 +1,293 @@
+from .binary_fields import BinaryField, BinaryFieldElement, BF64, BF128
+
+from collections.abc import Iterable
+
+# x^64 + x^4 + x^3 + x + 1 and the GHASH polynomial x^128 + x^7 + x^2 + x + 1
+POLY_BASIS_MODULI = {
+    64: 1 << 64 | 0b11011,
+    128: 1 << 128 | 0b10000111,
+}
+
+
+def _clmul(a: int, b: int) -> int:
+    # carryless product of two integers, 4 bits of a at a time
+    table = [0] * 16
+    table[1] = b
+    for i in range(2, 16, 2):
+        table[i] = table[i >> 1] << 1
+        table[i + 1] = table[i] ^ b
+    ret, shift = 0, 0
+    while a:
+        ret ^= table[a & 15] << shift
+        a >>= 4
+        shift += 4
+    return ret
+
+
+class PolynomialBasisBackend:
+    """
+    Arithmetic in GF(2^n) = GF(2)[x] / (m(x)), for n = 64 or 128, with
+    GF(2)-linear conversions to and from the tower basis of BinaryField(n).
+
+    Values in polynomial basis are plain ints. Multiplication is a carryless
+    product in 4-bit windows followed by a shift-and-xor reduction (GHASH
+    style); scaling many values by one scalar reuses an 8-bit window table. The
+    conversions are precomputed 8-bit table lookups, so whole arrays can be
+    converted at phase boundaries while every result seen through the API
+    stays in tower basis.
+    """
+
+    def __init__(self, field: BinaryField):
+        assert isinstance(field, BinaryField)
+        assert field.bit_length in POLY_BASIS_MODULI
+        self.field = field
+        self.bit_length = field.bit_length
+        self.modulus = POLY_BASIS_MODULI[self.bit_length]
+        self.mask = (1 << self.bit_length) - 1
+        # x^n = low_terms mod m(x)
+        self.low_terms = self.modulus & self.mask
+        self.low_shifts = [i for i in range(self.bit_length) if self.low_terms >> i & 1]
+
+        tower_images = self._tower_basis_images()
+        self.to_poly_tables = self._linear_map_tables(tower_images)
+        self.from_poly_tables = self._linear_map_tables(self._invert(tower_images))
+
+    def __repr__(self) -> str:
+        return f"PolynomialBasisBackend(modulus={self.modulus:#x}) for {self.field}"
+
+    def reduce(self, value: int) -> int:
+        while value >> self.bit_length:
+            high = value >> self.bit_length
+            value &= self.mask
+            for shift in self.low_shifts:
+                value ^= high << shift
+        return value
+
+    def mul(self, a: int, b: int) -> int:
+        return self.reduce(_clmul(a, b))
+
+    def square(self, a: int) -> int:
+        return self.mul(a, a)
+
+    def window_table(self, scalar: int) -> list[int]:
+        # scalar * w (unreduced) for every byte w
+        table = [0] * 256
+        table[1] = scalar
+        for i in range(2, 256, 2):
+            table[i] = table[i >> 1] << 1
+            table[i + 1] = table[i] ^ scalar
+        return table
+
+    def mul_by_table_unreduced(self, table: list[int], value: int) -> int:
+        ret, shift = 0, 0
+        while value:
+            ret ^= table[value & 255] << shift
+            value >>= 8
+            shift += 8
+        return ret
+
+    def mul_by_table(self, table: list[int], value: int) -> int:
+        return self.reduce(self.mul_by_table_unreduced(table, value))
+
+    def scale(self, values: Iterable[int], scalar: int) -> list[int]:
+        table = self.window_table(scalar)
+        return [self.mul_by_table(table, v) for v in values]
+
+    def tensor_expand(self, values: list[int], coords: Iterable[int]) -> list[int]:
+        for coord in coords:
+            p1 = self.scale(values, coord)
+            p0 = [v ^ p for v, p in zip(values, p1)]
+            values = p0 + p1
+        return values
+
+    def partial_eval_high(
+        self, evals: list[int], eq: list[int], row_length: int
+    ) -> list[int]:
+        # sum_i eq[i] * row_i, reducing each output once at the end
+        acc = [0] * row_length
+        for i, e in enumerate(eq):
+            table = self.window_table(e)
+            row = evals[i * row_length : (i + 1) * row_length]
+            acc = [a ^ self.mul_by_table_unreduced(table, v) for a, v in zip(acc, row)]
+        return [self.reduce(a) for a in acc]
+
+    def partial_eval_high_multi(
+        self, evals: list[int], eqs: list[list[int]], row_length: int
+    ) -> list[list[int]]:
+        # partial_eval_high for several eq vectors in one pass over the rows
+        accs = [[0] * row_length for _ in eqs]
+        for i in range(len(evals) // row_length):
+            row = evals[i * row_length : (i + 1) * row_length]
+            for q, eq in enumerate(eqs):
+                table = self.window_table(eq[i])
+                accs[q] = [
+                    a ^ self.mul_by_table_unreduced(table, v)
+                    for a, v in zip(accs[q], row)
+                ]
+        return [[self.reduce(a) for a in acc] for acc in accs]
+
+    def partial_eval_low(
+        self, evals: list[int], eq: list[int], row_length: int
+    ) -> list[int]:
+        # <row_i, eq> for every row i, reducing each output once at the end
+        acc = [0] * (len(evals) // row_length)
+        for j, e in enumerate(eq):
+            table = self.window_table(e)
+            col = evals[j::row_length]
+            acc = [a ^ self.mul_by_table_unreduced(table, v) for a, v in zip(acc, col)]
+        return [self.reduce(a) for a in acc]
+
+    def _solve_artin_schreier(self, c: int) -> int:
+        # a root z of z^2 + z = c, by Gaussian elimination over GF(2)
+        rows = []
+        for i in range(self.bit_length):
+            rows.append((self.square(1 << i) ^ (1 << i), 1 << i))
+        solution = self._solve(rows, c)
+        assert solution is not None
+        return solution
+
+    def _solve(self, rows: list[tuple[int, int]], target: int) -> int | None:
+        # rows are (image, preimage) pairs of a GF(2)-linear map
+        pivots = {}
+        for image, preimage in rows:
+            while image:
+                top = image.bit_length() - 1
+                if top not in pivots:
+                    pivots[top] = (image, preimage)
+                    break
+                pivot_image, pivot_preimage = pivots[top]
+                image ^= pivot_image
+                preimage ^= pivot_preimage
+        solution = 0
+        while target:
+            top = target.bit_length() - 1
+            if top not in pivots:
+                return None
+            pivot_image, pivot_preimage = pivots[top]
+            target ^= pivot_image
+            solution ^= pivot_preimage
+        return solution
+
+    def _inv(self, a: int) -> int:
+        ret, base, n = 1, a, (1 << self.bit_length) - 2
+        while n:
+            if n & 1:
+                ret = self.mul(ret, base)
+            base = self.square(base)
+            n >>= 1
+        return ret
+
+    def _tower_basis_images(self) -> list[int]:
+        # images of the tower generators: X_k^2 + X_{k-1} X_k + 1 = 0 with
+        # X_{-1} = 1; the root x = a z of x^2 + a x + 1 has z^2 + z = 1 / a^2
+        generators = []
+        prev = 1
+        for _ in range(self.bit_length.bit_length() - 1):
+            c = self._inv(self.square(prev))
+            x = self.mul(prev, self._solve_artin_schreier(c))
+            assert self.square(x) ^ self.mul(prev, x) ^ 1 == 0
+            generators.append(x)
+            prev = x
+
+        # tower basis element i is the product of X_k over the set bits k of i
+        images = [1]
+        for x in generators:
+            images += [self.mul(image, x) for image in images]
+        return images
+
+    def _invert(self, images: list[int]) -> list[int]:
+        rows = [(image, 1 << i) for i, image in enumerate(images)]
+        ret = []
+        for i in range(self.bit_length):
+            preimage = self._solve(rows, 1 << i)
+            assert preimage is not None
+            ret.append(preimage)
+        return ret
+
+    def _linear_map_tables(self, images: list[int]) -> list[list[int]]:
+        tables = []
+        for byte in range(self.bit_length // 8):
+            table = [0] * 256
+            for bit in range(8):
+                image = images[byte * 8 + bit]
+                for i in range(1 << bit):
+                    table[i | 1 << bit] = table[i] ^ image
+            tables.append(table)
+        return tables
+
+    def _apply(self, tables: list[list[int]], value: int) -> int:
+        ret = 0
+        for table in tables:
+            if not value:
+                break
+            ret ^= table[value & 255]
+            value >>= 8
+        return ret
+
+    def to_poly(self, value: int) -> int:
+        return self._apply(self.to_poly_tables, value)
+
+    def from_poly(self, value: int) -> int:
+        return self._apply(self.from_poly_tables, value)
+
+    def batch_to_poly(self, elems: Iterable[BinaryFieldElement]) -> list[int]:
+        # tower subfield elements embed into the field by their value
+        tables = self.to_poly_tables
+        return [self._apply(tables, e.value) for e in elems]
+
+    def batch_from_poly(self, values: Iterable[int]) -> list[BinaryFieldElement]:
+        tables, field = self.from_poly_tables, self.field
+        return [field(self._apply(tables, v)) for v in values]
+
+
+_backends: dict[int, PolynomialBasisBackend] = {}
+_enabled = False
+
+
+def enable_poly_basis(enabled: bool = True):
+    """
+    Route BF64/BF128 tensor expansions, partial evaluations and sumcheck
+    folding through the polynomial-basis backend.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def get_poly_basis_backend(field: BinaryField) -> PolynomialBasisBackend | None:
+    # the backend for field if it is enabled and supported, otherwise None
+    if not _enabled or field.bit_length not in POLY_BASIS_MODULI:
+        return None
+    if field.bit_length not in _backends:
+        _backends[field.bit_length] = PolynomialBasisBackend(field)
+    return _backends[field.bit_length]
+
+
+if __name__ == "__main__":
+    import time
+
+    for field in (BF64, BF128):
+        start = time.perf_counter()
+        backend = PolynomialBasisBackend(field)
+        print(backend, f"precomputed in {time.perf_counter() - start:.3f}s")
+
+        xs = [field.random_element() for _ in range(2000)]
+        ys = [field.random_element() for _ in range(2000)]
+        px, py = backend.batch_to_poly(xs), backend.batch_to_poly(ys)
+        assert backend.batch_from_poly(px) == xs
+
+        start = time.perf_counter()
+        tower = [x * y for x, y in zip(xs, ys)]
+        tower_time = time.perf_counter() - start
+        start = time.perf_counter()
+        poly = [backend.mul(x, y) for x, y in zip(px, py)]
+        poly_time = time.perf_counter() - start
+        assert backend.batch_from_poly(poly) == tower
+        start = time.perf_counter()
+        scaled = backend.scale(px, py[0])
+        scale_time = time.perf_counter() - start
+        assert backend.batch_from_poly(scaled) == [x * ys[0] for x in xs]
+
+        print(
+            f"mul/s tower: {len(xs) / tower_time:.0f}, poly: {len(xs) / poly_time:.0f},"
+            f" poly scale: {len(xs) / scale_time:.0f}"
+        )
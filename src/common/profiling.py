@@ -0,0 +1,254 @@
+from functools import wraps
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Profiling is off by default; span() then returns a shared no-op context
+# manager, so instrumented code pays one function call and a flag check.
+_enabled = False
+_trace_memory = False
+# Whether enable_profiling started tracemalloc, and so may stop it.
+_started_tracemalloc = False
+
+
+class Span:
+    """
+    A named, timed region. Spans opened while another is open become its
+    children. wall and cpu are in seconds; mem_peak is the peak of
+    tracemalloc-traced memory above its level at entry, in bytes, if memory
+    tracing is on. counts holds the operation counts recorded directly in
+    this span while op counting (common.op_counters) is on.
+    """
+
+    __slots__ = (
+        "name",
+        "attrs",
+        "children",
+        "start",
+        "wall",
+        "cpu",
+        "mem_peak",
+        "counts",
+        "_cpu_start",
+        "_mem_start",
+        "_mem_abs_peak",
+    )
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.children: list[Span] = []
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.mem_peak: int | None = None
+        self.counts: dict[str, int] = {}
+
+    def inclusive_counts(self) -> dict[str, int]:
+        # counts of this span and all its descendants
+        ret = dict(self.counts)
+        for child in self.children:
+            for op, n in child.inclusive_counts().items():
+                ret[op] = ret.get(op, 0) + n
+        return ret
+
+    def __repr__(self) -> str:
+        return f"Span({self.name}, wall={self.wall:.6f}s, cpu={self.cpu:.6f}s)"
+
+    def __enter__(self) -> "Span":
+        _profiler.push(self)
+        return self
+
+    def __exit__(self, *exc):
+        _profiler.pop(self)
+        return False
+
+    def to_dict(self) -> dict:
+        ret = {"name": self.name, "wall": self.wall, "cpu": self.cpu}
+        if self.attrs:
+            ret["attrs"] = self.attrs
+        if self.mem_peak is not None:
+            ret["mem_peak"] = self.mem_peak
+        if self.counts:
+            ret["counts"] = self.counts
+        if self.children:
+            ret["children"] = [child.to_dict() for child in self.children]
+        return ret
+
+
+class _NullSpan:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Collects the span trees of one process. Each thread has its own stack of
+    open spans; finished top-level spans are appended to `roots`.
+    """
+
+    def __init__(self):
+        self.roots: list[Span] = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Span | None:
+        # the innermost open span of this thread
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def push(self, span: Span):
+        stack = self._stack()
+        if _trace_memory and tracemalloc.is_tracing():
+            # tracemalloc has a single peak counter: fold it into the parent
+            # before resetting it for the child
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                parent = stack[-1]
+                parent._mem_abs_peak = max(parent._mem_abs_peak, peak)
+            tracemalloc.reset_peak()
+            span._mem_start = span._mem_abs_peak = current
+        else:
+            span._mem_start = None
+        stack.append(span)
+        span._cpu_start = time.process_time()
+        span.start = time.perf_counter()
+
+    def pop(self, span: Span):
+        end = time.perf_counter()
+        span.cpu = time.process_time() - span._cpu_start
+        span.wall = end - span.start
+        stack = self._stack()
+        assert stack and stack[-1] is span
+        stack.pop()
+        if span._mem_start is not None and tracemalloc.is_tracing():
+            span._mem_abs_peak = max(
+                span._mem_abs_peak, tracemalloc.get_traced_memory()[1]
+            )
+            span.mem_peak = span._mem_abs_peak - span._mem_start
+            if stack and stack[-1]._mem_start is not None:
+                parent = stack[-1]
+                parent._mem_abs_peak = max(parent._mem_abs_peak, span._mem_abs_peak)
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            self.roots.append(span)
+
+    def to_json(self) -> list[dict]:
+        return [span.to_dict() for span in self.roots]
+
+    def to_chrome_trace(self) -> dict:
+        # complete ("X") events in microseconds, loadable by chrome://tracing
+        # and Perfetto
+        events = []
+        pid = os.getpid()
+
+        def visit(span: Span):
+            args = dict(span.attrs)
+            args["cpu_ms"] = span.cpu * 1e3
+            if span.mem_peak is not None:
+                args["mem_peak"] = span.mem_peak
+            args.update(span.inclusive_counts())
+            events.append(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": (span.start - self.origin) * 1e6,
+                    "dur": span.wall * 1e6,
+                    "pid": pid,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+            for child in span.children:
+                visit(child)
+
+        for root in self.roots:
+            visit(root)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+_profiler = Profiler()
+
+
+def enable_profiling(enabled: bool = True, trace_memory: bool = False):
+    """
+    Turn span recording on or off. With trace_memory, tracemalloc is started
+    (unless it already runs) and every span also records its memory peak;
+    tracing memory slows Python allocation down considerably, so it is off by
+    default. Turning it off stops tracemalloc only if it was started here.
+
+    Spans measure their peaks with tracemalloc's single peak counter, which
+    each span entry resets (tracemalloc.reset_peak), so code that reads
+    tracemalloc's peak itself sees only the peak since the last span opened.
+    """
+    global _enabled, _trace_memory, _started_tracemalloc
+    _enabled = enabled
+    _trace_memory = enabled and trace_memory
+    if _trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    elif not _trace_memory and _started_tracemalloc:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def profiling_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attrs) -> Span | _NullSpan:
+    # with span("phase"): ... records the block if profiling is enabled
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def traced(name: str):
+    # decorator recording each call of a function as a span
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_profiler() -> Profiler:
+    return _profiler
+
+
+def reset_profiling():
+    global _profiler
+    _profiler = Profiler()
+
+
+def export_json(path: str):
+    with open(path, "w") as f:
+        json.dump(_profiler.to_json(), f, indent=2)
+
+
+def export_chrome_trace(path: str):
+    with open(path, "w") as f:
+        json.dump(_profiler.to_chrome_trace(), f)
@@ -0,0 +1,76 @@
+from .binary_fields import BinaryField, BinaryFieldElement
+from .packed_buffer import PackedFieldBuffer
+
+from collections.abc import Iterable
+import struct
+
+# A serialized proof is PROOF_MAGIC and a one-byte PROOF_VERSION followed by
+# the proof body. The body has no type tags: field elements are raw fixed-width
+# big-endian values (PackedFieldBuffer layout) and digests raw bytes, in an
+# order and with sizes fixed by the PCS parameters, plus a few u32 counts
+# where the shape is not.
+PROOF_MAGIC = b"BNPF"
+PROOF_VERSION = 1
+
+
+class ProofWriter:
+
+    def __init__(self):
+        self.parts: list[bytes | memoryview] = [
+            PROOF_MAGIC,
+            PROOF_VERSION.to_bytes(1, "little"),
+        ]
+
+    def write_u32(self, value: int):
+        self.parts.append(struct.pack("<I", value))
+
+    def write_elements(self, elts: Iterable[BinaryFieldElement], field: BinaryField):
+        self.parts.append(PackedFieldBuffer.as_packed(elts, field).buffer)
+
+    def write_digests(self, digests: Iterable[bytes]):
+        self.parts.extend(digests)
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class ProofReader:
+    """
+    Reads back a proof written by ProofWriter. Elements are returned as
+    PackedFieldBuffer views into the input, so no element objects are built
+    until the verifier reads them.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.data = memoryview(data).cast("B")
+        if self.data[: len(PROOF_MAGIC)] != PROOF_MAGIC:
+            raise ValueError("not a serialized proof")
+        version = self.data[len(PROOF_MAGIC)]
+        if version != PROOF_VERSION:
+            raise ValueError(f"unsupported proof version {version}")
+        self.position = len(PROOF_MAGIC) + 1
+
+    def _read(self, n_bytes: int) -> memoryview:
+        if self.position + n_bytes > len(self.data):
+            raise ValueError("truncated proof")
+        ret = self.data[self.position : self.position + n_bytes]
+        self.position += n_bytes
+        return ret
+
+    def read_u32(self) -> int:
+        return struct.unpack("<I", self._read(4))[0]
+
+    def read_elements(self, field: BinaryField, length: int) -> PackedFieldBuffer:
+        # length may come from the proof itself, e.g. a batch column length
+        if length * field.bit_length % 8 != 0:
+            raise ValueError("elements do not fill whole bytes")
+        return PackedFieldBuffer(
+            field, self._read(length * field.bit_length // 8), length
+        )
+
+    def read_digests(self, n: int, digest_size: int = 32) -> list[bytes]:
+        return [self._read(digest_size).tobytes() for _ in range(n)]
+
+    def finish(self):
+        if self.position != len(self.data):
+            raise ValueError("trailing bytes after proof")
@@ -1,19 +1,45 @@
 from .additive_ntt import AdditiveNTT
 from .binary_fields import BinaryField, BinaryFieldElement
+from .packed_buffer import PackedFieldBuffer
+from .parallel import NTT_LOG_BLOCK, parallel_ntt
 from .tower_algebra import TowerAlgebra
 
-from copy import deepcopy
+from collections.abc import Iterable
 
 
 class ReedSolomonCode:
 
-    def __init__(self, log_dimension: int, log_inv_rate: int, field: BinaryField):
+    # Codewords of at least 2^blocked_log_length elements are transformed in
+    # rows of 2^NTT_LOG_BLOCK (forward_transform_blocked), on a process pool
+    # of n_workers when that is more than one (parallel_ntt). Both are
+    # bit-identical to forward_transform.
+    blocked_log_length: int = 14
+
+    def __init__(
+        self,
+        log_dimension: int,
+        log_inv_rate: int,
+        field: BinaryField,
+        n_workers: int = 1,
+    ):
         assert isinstance(field, BinaryField)
+        assert n_workers >= 1
         self.log_dimension = log_dimension
         self.log_inv_rate = log_inv_rate
         self.log_length = self.log_dimension + self.log_inv_rate
         self.field = field
+        self.n_workers = n_workers
         self.ntt = AdditiveNTT(self.log_dimension, self.log_length, self.field)
+        self._message_ntt = None
+
+    @property
+    def message_ntt(self) -> AdditiveNTT:
+        # the transform over the message domain, only needed by extract_message
+        if self._message_ntt is None:
+            self._message_ntt = AdditiveNTT(
+                self.log_dimension, self.log_dimension, self.field
+            )
+        return self._message_ntt
 
     def __repr__(self) -> str:
         return f"ReedSolomonCode(log_dimension={self.log_dimension}, log_inv_rate={self.log_inv_rate}) in {self.field}"
@@ -26,11 +52,75 @@ class ReedSolomonCode:
             isinstance(v, TowerAlgebra) for v in data
         )
 
-        encoded = deepcopy(data)
-        for _ in range(self.log_inv_rate):
-            encoded += deepcopy(encoded)
+        if isinstance(data[0], TowerAlgebra):
+            return self.encode_tower_algebra(data)
+
+        # elements are immutable, so repeating the references is enough
+        encoded = list(data) * (1 << self.log_inv_rate)
+
+        if self.log_length < self.blocked_log_length:
+            return self.ntt.forward_transform(encoded)
+        # the pool needs the message packed, so in the code's field
+        if self.n_workers > 1 and all(self.field.check_element(v) for v in data):
+            packed = PackedFieldBuffer.pack(encoded, self.field)
+            return parallel_ntt(self.ntt, packed, n_workers=self.n_workers).to_list()
+        return self.ntt.forward_transform_blocked(encoded, NTT_LOG_BLOCK)
+
+    def extract_message(
+        self, codeword: Iterable[BinaryFieldElement]
+    ) -> list[BinaryFieldElement]:
+        # the message of an (error-free) codeword: every 2^log_dimension block
+        # of the codeword is transformed independently, and the first block is
+        # the transform over the smallest domain, so inverting it over that
+        # domain gives back the message
+        codeword = list(codeword)
+        assert len(codeword) == 1 << self.log_length
+        return self.message_ntt.inverse_transform(codeword[: 1 << self.log_dimension])
+
+    def evaluation_vector(self, index: int) -> list[BinaryFieldElement]:
+        # the vector X with encode(data)[index] = <X, data> for every data:
+        # encoding evaluates data in the novel polynomial basis, whose k-th
+        # element is the product of the normalized W_i over the set bits i of
+        # k, so X is the tensor product of the [1, W_i(point)]
+        assert 0 <= index < 1 << self.log_length
+        ret = [self.field.ONE]
+        for i in range(self.log_dimension):
+            w = self.ntt.evaluate_subspace_poly(i, index)
+            ret += [x * w for x in ret]
+        return ret
+
+    def encode_batch(
+        self, batch: list[list[BinaryFieldElement]]
+    ) -> list[list[BinaryFieldElement]]:
+        assert all(len(data) == 1 << self.log_dimension for data in batch)
+        if self.log_length >= self.blocked_log_length:
+            return [self.encode(data) for data in batch]
+        return self.ntt.forward_transform_batch(
+            [data * (1 << self.log_inv_rate) for data in batch]
+        )
+
+    def encode_tower_algebra(self, data: list[TowerAlgebra]) -> list[TowerAlgebra]:
+        # The code is linear over its field, which acts on the vertical side of
+        # the algebra, so encoding a vector of algebra elements is the same as
+        # encoding each of its n_rows horizontal components as a field vector.
+        assert len(data) == 1 << self.log_dimension
+        F, F_vertical, F_horizontal = (
+            data[0].F,
+            data[0].F_vertical,
+            data[0].F_horizontal,
+        )
+        assert F_vertical.is_extension_of(self.field)
+        assert all(
+            (v.F, v.F_vertical, v.F_horizontal) == (F, F_vertical, F_horizontal)
+            for v in data
+        )
 
-        return self.ntt.forward_transform(encoded)
+        components = [[v.elems[j] for v in data] for j in range(data[0].n_rows)]
+        encoded = self.encode_batch(components)
+        return [
+            TowerAlgebra(F, F_vertical, F_horizontal, [enc[i] for enc in encoded])
+            for i in range(1 << self.log_length)
+        ]
 
 
 if __name__ == "__main__":
@@ -120,7 +120,9 @@ class TowerAlgebra:
         return cls(F, F_vertical, F_horizontal, elems)
 
     def try_extract_vertical(self) -> BinaryFieldElement:
-        assert all(e == self.F_vertical.ZERO for e in self.elems[:-1])
+        # the element of F_vertical this is, if it lies in that subring
+        if any(e != self.F_vertical.ZERO for e in self.elems[:-1]):
+            raise ValueError("not an element of the vertical subring")
         return self.elems[-1]
 
     def scale_vertical(self, scalar: BinaryFieldElement):
@@ -1,4 +1,12 @@
+from .poly_basis import get_poly_basis_backend
+
+
 def tensor_product(coordinates, field):
+    backend = get_poly_basis_backend(field)
+    if backend is not None:
+        coords = backend.batch_to_poly(coordinates)
+        return backend.batch_from_poly(backend.tensor_expand([1], coords))
+
     o = [field.ONE]
     for coord in coordinates:
         p0 = [(field.ONE - coord) * v for v in o]
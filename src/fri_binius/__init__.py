@@ -1 +1,3 @@
 from .ring_switching_pcs import RingSwitchingPCS
+from .binary_fri import BinaryFRI
+from .combined_pcs import FRIBiniusPCS
@@ -0,0 +1,485 @@
+from common import (
+    BinaryField,
+    BinaryFieldElement,
+    ReedSolomonCode,
+    MerkleTreeVCS,
+    Challenger,
+    PackedFieldBuffer,
+    FlatDigests,
+    CommittedWriter,
+    CommittedReader,
+    ProofWriter,
+    ProofReader,
+    BaseCommitment,
+    BaseCommitted,
+    BaseProof,
+    Vector,
+)
+
+from dataclasses import dataclass
+
+
+class BinaryFRI:
+    """
+    Binary FRI over the novel-basis domain of the additive NTT.
+
+    A codeword of the Reed-Solomon code is the additive NTT of a message m of
+    2^log_dimension L-elements. Undoing the last butterfly layer of the NTT on a
+    pair of positions gives the even/odd halves of m, so folding with a
+    challenge r yields the codeword of (1 - r) * m_even + r * m_odd, i.e. of the
+    partial evaluation of the multilinear extension of m at its lowest variable.
+    After log_dimension folds the codeword is constant, equal to m evaluated at
+    the vector of challenges.
+
+    The prover commits to one oracle every 2^log_fold_arity folds; each Merkle
+    leaf holds the coset of 2^log_fold_arity positions that fold to a single
+    position of the next oracle.
+    """
+
+    @dataclass
+    class Commitment(BaseCommitment):
+        vcs_commitment: MerkleTreeVCS.Commitment
+
+        def serialize(self) -> bytes:
+            return self.vcs_commitment.serialize()
+
+    @dataclass
+    class Committed(BaseCommitted):
+        vcs_committed: MerkleTreeVCS.Committed
+        codeword: Vector[BinaryFieldElement]
+
+    @dataclass
+    class QueryProof(BaseProof):
+        cosets: list[tuple[Vector[BinaryFieldElement], MerkleTreeVCS.Proof]]
+
+    @dataclass
+    class Proof(BaseProof):
+        round_commitments: list[MerkleTreeVCS.Commitment]
+        final_value: BinaryFieldElement
+        query_proofs: list["BinaryFRI.QueryProof"]
+
+    class Folder:
+
+        def __init__(self, fri: "BinaryFRI", committed: "BinaryFRI.Committed"):
+            self.fri = fri
+            self.round = 0
+            self.codeword = list(committed.codeword)
+            self.oracles = [(committed.codeword, committed.vcs_committed)]
+
+        def receive_challenge(
+            self, challenge: BinaryFieldElement
+        ) -> MerkleTreeVCS.Commitment | None:
+            assert self.round < self.fri.log_dimension
+            assert self.fri.L.check_element(challenge)
+
+            half = len(self.codeword) >> 1
+            self.codeword = [
+                self.fri.fold_pair(
+                    self.fri.code.ntt._get_twiddle(self.round, u),
+                    self.codeword[u << 1],
+                    self.codeword[u << 1 | 1],
+                    challenge,
+                )
+                for u in range(half)
+            ]
+            self.round += 1
+
+            if self.round not in self.fri.oracle_rounds:
+                return None
+            oracle = len(self.oracles)
+            vcs_commitment, vcs_committed = self.fri.vcs[oracle].commit(
+                self.fri.split_cosets(oracle, self.codeword)
+            )
+            self.oracles.append((self.codeword, vcs_committed))
+            return vcs_commitment
+
+        def finalize(self) -> BinaryFieldElement:
+            assert self.round == self.fri.log_dimension
+            assert all(v == self.codeword[0] for v in self.codeword)
+            return self.codeword[0]
+
+        def prove_queries(
+            self, challenger: Challenger
+        ) -> list["BinaryFRI.QueryProof"]:
+            assert self.round == self.fri.log_dimension
+            indices = self.fri.sample_query_indices(challenger)
+
+            query_proofs = []
+            for index in indices:
+                cosets = []
+                for oracle, (codeword, vcs_committed) in enumerate(self.oracles):
+                    arity = self.fri.oracle_arities[oracle]
+                    index_t = index >> self.fri.oracle_rounds[oracle]
+                    coset_index = index_t >> arity
+                    cosets.append(
+                        (
+                            list(
+                                codeword[
+                                    coset_index << arity : (coset_index + 1) << arity
+                                ]
+                            ),
+                            self.fri.vcs[oracle].prove_opening(
+                                vcs_committed, coset_index
+                            ),
+                        )
+                    )
+                query_proofs.append(BinaryFRI.QueryProof(cosets))
+            return query_proofs
+
+    def __init__(
+        self,
+        K: BinaryField,
+        L: BinaryField,
+        log_dimension: int,
+        log_inv_rate: int,
+        n_queries: int,
+        log_fold_arity: int = 1,
+    ):
+        assert (
+            isinstance(K, BinaryField)
+            and isinstance(L, BinaryField)
+            and L.is_extension_of(K)
+        )
+        assert log_fold_arity > 0
+
+        self.K = K
+        self.L = L
+        self.log_dimension = log_dimension
+        self.log_inv_rate = log_inv_rate
+        self.n_queries = n_queries
+        self.log_fold_arity = log_fold_arity
+
+        assert log_dimension + log_inv_rate <= self.K.bit_length
+        self.code = ReedSolomonCode(log_dimension, log_inv_rate, self.K)
+
+        # oracle j is the codeword after oracle_rounds[j] folds, committed in
+        # cosets of 2^oracle_arities[j] consecutive positions
+        self.oracle_rounds = list(range(0, log_dimension, log_fold_arity)) or [0]
+        self.oracle_arities = [
+            min(log_fold_arity, log_dimension - t) for t in self.oracle_rounds
+        ]
+        self.vcs = [
+            MerkleTreeVCS(self.code.log_length - t - arity)
+            for t, arity in zip(self.oracle_rounds, self.oracle_arities)
+        ]
+
+    def __repr__(self) -> str:
+        return f"BinaryFRI(log_fold_arity={self.log_fold_arity}, n_queries={self.n_queries}) over {self.code}"
+
+    def split_cosets(
+        self, oracle: int, codeword: Vector[BinaryFieldElement]
+    ) -> list[Vector[BinaryFieldElement]]:
+        coset_size = 1 << self.oracle_arities[oracle]
+        return [
+            codeword[i : i + coset_size] for i in range(0, len(codeword), coset_size)
+        ]
+
+    def fold_pair(
+        self,
+        twiddle: BinaryFieldElement,
+        v0: BinaryFieldElement,
+        v1: BinaryFieldElement,
+        challenge: BinaryFieldElement,
+    ) -> BinaryFieldElement:
+        # inverse butterfly, then (1 - r) * even + r * odd
+        odd = v0 + v1
+        even = v0 + odd * twiddle
+        return even + (even + odd) * challenge
+
+    def fold_coset(
+        self,
+        round: int,
+        coset_index: int,
+        values: Vector[BinaryFieldElement],
+        challenges: list[BinaryFieldElement],
+    ) -> BinaryFieldElement:
+        assert len(values) == 1 << len(challenges)
+        for i, challenge in enumerate(challenges, round):
+            half = len(values) >> 1
+            values = [
+                self.fold_pair(
+                    self.code.ntt.evaluate_twiddle(i, coset_index * half + v),
+                    values[v << 1],
+                    values[v << 1 | 1],
+                    challenge,
+                )
+                for v in range(half)
+            ]
+        return values[0]
+
+    def sample_query_indices(self, challenger: Challenger) -> list[int]:
+        return [
+            challenger.sample_bits(self.code.log_length) for _ in range(self.n_queries)
+        ]
+
+    def commit(
+        self, message: Vector[BinaryFieldElement]
+    ) -> tuple[Commitment, Committed]:
+        assert len(message) == 1 << self.log_dimension
+        assert all(self.L.check_element(e) for e in message)
+
+        codeword = self.code.encode(message)
+        vcs_commitment, vcs_committed = self.vcs[0].commit(
+            self.split_cosets(0, codeword)
+        )
+
+        commitment = self.Commitment(vcs_commitment)
+        committed = self.Committed(vcs_committed, codeword)
+        return commitment, committed
+
+    def write_committed(self, committed: Committed, writer: CommittedWriter):
+        writer.write_elements(PackedFieldBuffer.as_packed(committed.codeword, self.L))
+        writer.write_digests(FlatDigests.from_tree(committed.vcs_committed.merkle_tree))
+
+    def read_committed(self, reader: CommittedReader) -> Committed:
+        # the codeword stays a view into the file until the first fold reads it
+        codeword = reader.read_elements()
+        if codeword.field != self.L or len(codeword) != 1 << self.code.log_length:
+            raise ValueError("saved commitment does not match the FRI parameters")
+        return self.Committed(MerkleTreeVCS.Committed(reader.read_digests()), codeword)
+
+    def prove(
+        self, challenger: Challenger, committed: Committed
+    ) -> tuple[Proof, list[BinaryFieldElement]]:
+        folder = self.Folder(self, committed)
+        challenges, round_commitments = [], []
+        for _ in range(self.log_dimension):
+            challenge = challenger.sample(self.L)
+            challenges.append(challenge)
+            round_commitment = folder.receive_challenge(challenge)
+            if round_commitment is not None:
+                challenger.observe(round_commitment.serialize())
+                round_commitments.append(round_commitment)
+
+        final_value = folder.finalize()
+        challenger.observe(final_value)
+        query_proofs = folder.prove_queries(challenger)
+
+        proof = self.Proof(round_commitments, final_value, query_proofs)
+        return proof, challenges
+
+    def write_proof(self, proof: Proof, writer: ProofWriter):
+        writer.write_digests(c.merkle_root for c in proof.round_commitments)
+        writer.write_elements([proof.final_value], self.L)
+        for query_proof in proof.query_proofs:
+            for coset, vcs_proof in query_proof.cosets:
+                writer.write_elements(coset, self.L)
+                writer.write_digests(vcs_proof.branch)
+
+    def read_proof(self, reader: ProofReader) -> Proof:
+        round_commitments = [
+            MerkleTreeVCS.Commitment(root)
+            for root in reader.read_digests(len(self.oracle_rounds) - 1)
+        ]
+        final_value = reader.read_elements(self.L, 1)[0]
+        query_proofs = [
+            self.QueryProof(
+                [
+                    (
+                        reader.read_elements(self.L, 1 << arity),
+                        MerkleTreeVCS.Proof(reader.read_digests(vcs.log_len)),
+                    )
+                    for vcs, arity in zip(self.vcs, self.oracle_arities)
+                ]
+            )
+            for _ in range(self.n_queries)
+        ]
+        return self.Proof(round_commitments, final_value, query_proofs)
+
+    def check_proof(self, proof: Proof) -> bool:
+        return (
+            len(proof.round_commitments) == len(self.oracle_rounds) - 1
+            and self.L.check_element(proof.final_value)
+            and len(proof.query_proofs) == self.n_queries
+            and all(
+                len(query_proof.cosets) == len(self.oracle_rounds)
+                and all(
+                    len(coset) == 1 << arity and len(vcs_proof.branch) == vcs.log_len
+                    for (coset, vcs_proof), vcs, arity in zip(
+                        query_proof.cosets, self.vcs, self.oracle_arities
+                    )
+                )
+                for query_proof in proof.query_proofs
+            )
+        )
+
+    def verify_queries(
+        self,
+        challenger: Challenger,
+        commitment: Commitment,
+        challenges: list[BinaryFieldElement],
+        proof: Proof,
+    ) -> bool:
+        assert len(challenges) == self.log_dimension
+        if not self.check_proof(proof):
+            return False
+
+        vcs_commitments = [commitment.vcs_commitment] + proof.round_commitments
+        indices = self.sample_query_indices(challenger)
+
+        for index, query_proof in zip(indices, proof.query_proofs):
+            folded_value = None
+            for oracle, (coset, vcs_proof) in enumerate(query_proof.cosets):
+                round = self.oracle_rounds[oracle]
+                arity = self.oracle_arities[oracle]
+                index_t = index >> round
+                coset_index = index_t >> arity
+
+                if not self.vcs[oracle].verify_opening(
+                    vcs_commitments[oracle], coset_index, vcs_proof, coset
+                ):
+                    return False
+                if folded_value is not None and (
+                    coset[index_t & ((1 << arity) - 1)] != folded_value
+                ):
+                    return False
+
+                folded_value = self.fold_coset(
+                    round, coset_index, coset, challenges[round : round + arity]
+                )
+
+            if folded_value != proof.final_value:
+                return False
+
+        return True
+
+    def verify(
+        self,
+        challenger: Challenger,
+        commitment: Commitment,
+        proof: Proof,
+    ) -> tuple[bool, list[BinaryFieldElement]]:
+        if not self.check_proof(proof):
+            return False, []
+
+        round_commitments = iter(proof.round_commitments)
+        challenges = []
+        for round in range(1, self.log_dimension + 1):
+            challenges.append(challenger.sample(self.L))
+            if round in self.oracle_rounds:
+                challenger.observe(next(round_commitments).serialize())
+
+        challenger.observe(proof.final_value)
+        ok = self.verify_queries(challenger, commitment, challenges, proof)
+        return ok, challenges
+
+    def proof_size(self) -> int:
+        # bytes of field elements and digests in a proof
+        elem_size, digest_size = self.L.bit_length // 8, 32
+        size = (len(self.oracle_rounds) - 1) * digest_size + elem_size
+        for vcs, arity in zip(self.vcs, self.oracle_arities):
+            size += self.n_queries * ((elem_size << arity) + vcs.log_len * digest_size)
+        return size
+
+
+def basic_pcs_proof_size(
+    L: BinaryField, n_vars: int, log_rows: int, log_inv_rate: int, n_challenges: int
+) -> int:
+    # bytes of field elements and digests in a BiniusBasicPCS(L, L, ...) proof
+    elem_size, digest_size = L.bit_length // 8, 32
+    log_cols = n_vars - log_rows
+    return (elem_size << log_cols) + n_challenges * (
+        (elem_size << log_rows) + (log_cols + log_inv_rate) * digest_size
+    )
+
+
+def compare_with_basic_pcs(
+    n_vars_list: list[int],
+    measure_up_to: int,
+    log_inv_rate: int = 2,
+    n_queries: int = 64,
+    log_fold_arities: tuple[int, ...] = (1, 2, 4),
+):
+    from binius import BiniusBasicPCS
+    from common import MultilinearExtension, MultilinearQuery, BF16, BF128
+    from copy import deepcopy
+    import time
+
+    K, L = BF16, BF128
+    print(f"{'n_vars':>6} {'scheme':>16} {'proof bytes':>12} {'verify s':>10}")
+    for n_vars in n_vars_list:
+        log_rows = n_vars // 2
+        configs = [
+            ("basic", None),
+            *((f"fri arity 2^{a}", a) for a in log_fold_arities),
+        ]
+        for name, log_fold_arity in configs:
+            if log_fold_arity is None:
+                size = basic_pcs_proof_size(
+                    L, n_vars, log_rows, log_inv_rate, n_queries
+                )
+            else:
+                fri = BinaryFRI(
+                    K, L, n_vars, log_inv_rate, n_queries, log_fold_arity
+                )
+                size = fri.proof_size()
+
+            verify_time = float("nan")
+            if n_vars <= measure_up_to:
+                message = [L.random_element() for _ in range(1 << n_vars)]
+                challenger = Challenger()
+                if log_fold_arity is None:
+                    pcs = BiniusBasicPCS(
+                        L, L, n_vars, log_rows, log_inv_rate, n_queries
+                    )
+                    poly = MultilinearExtension.from_evals(message, L)
+                    query = [L.random_element() for _ in range(n_vars)]
+                    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+                    commitment, committed = pcs.commit(poly)
+                    proof = pcs.prove_evaluation(
+                        deepcopy(challenger), committed, poly, query
+                    )
+                    start = time.perf_counter()
+                    assert pcs.verify_evaluation(
+                        deepcopy(challenger), commitment, query, proof, value
+                    )
+                else:
+                    commitment, committed = fri.commit(message)
+                    proof, _ = fri.prove(deepcopy(challenger), committed)
+                    start = time.perf_counter()
+                    assert fri.verify(deepcopy(challenger), commitment, proof)[0]
+                verify_time = time.perf_counter() - start
+
+            print(f"{n_vars:>6} {name:>16} {size:>12} {verify_time:>10.3f}")
+
+
+if __name__ == "__main__":
+    from common.binary_fields import *
+    from common import MultilinearExtension, MultilinearQuery
+    import random
+    import sys
+    from copy import deepcopy
+
+    random.seed(123)
+
+    K, L = BF16, BF128
+    log_dimension, log_inv_rate, n_queries = 6, 2, 32
+
+    for log_fold_arity in (1, 2, 4):
+        fri = BinaryFRI(K, L, log_dimension, log_inv_rate, n_queries, log_fold_arity)
+        print(fri)
+        message = [L.random_element() for _ in range(1 << log_dimension)]
+
+        commitment, committed = fri.commit(message)
+        challenger = Challenger()
+        challenger.observe(commitment.serialize())
+
+        prover_challenger, verifier_challenger = (
+            deepcopy(challenger),
+            deepcopy(challenger),
+        )
+        proof, challenges = fri.prove(prover_challenger, committed)
+        ok, verifier_challenges = fri.verify(verifier_challenger, commitment, proof)
+        assert ok and challenges == verifier_challenges
+
+        # the final value is the multilinear extension of the message at the challenges
+        poly = MultilinearExtension.from_evals(message, L)
+        assert proof.final_value == poly.evaluate(
+            MultilinearQuery.with_full_query(challenges, L)
+        )
+    print("ok")
+
+    # proof size / verify time against BiniusBasicPCS, e.g. `binary_fri.py 14 24 12`
+    if len(sys.argv) > 1:
+        n_min, n_max, measure_up_to = map(int, sys.argv[1:4])
+        compare_with_basic_pcs(list(range(n_min, n_max + 1, 2)), measure_up_to)
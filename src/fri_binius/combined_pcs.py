@@ -0,0 +1,289 @@
+from common import (
+    BinaryField,
+    BinaryFieldElement,
+    TowerAlgebra,
+    PackedFieldBuffer,
+    MultilinearExtension,
+    MultilinearQuery,
+    Challenger,
+    CommittedWriter,
+    CommittedReader,
+    ProofWriter,
+    ProofReader,
+    BaseCommitment,
+    BaseCommitted,
+    BaseProof,
+    BasePCS,
+    log2,
+    traced,
+)
+from .sumcheck import (
+    SumcheckClaim,
+    RoundClaim,
+    RoundProof,
+    ReducedClaim,
+    SumcheckProver,
+    reduce_round_claim,
+    write_sumcheck_proof,
+    check_sumcheck_proof,
+    read_sumcheck_proof,
+)
+from .binary_fri import BinaryFRI
+
+from dataclasses import dataclass
+
+
+class FRIBiniusPCS(BasePCS):
+    """
+    Ring-switching PCS whose sumcheck is interleaved with binary FRI.
+
+    The packed L-polynomial is committed as a single FRI codeword. The challenge
+    of each sumcheck round is also the FRI fold challenge of that round, so
+    after the last round the FRI final value is the packed polynomial evaluated
+    at the sumcheck point, which is exactly the claim the ring-switching
+    sumcheck reduces to. No separate inner PCS opening is needed.
+    """
+
+    @dataclass
+    class Commitment(BaseCommitment):
+        fri_commitment: BinaryFRI.Commitment
+
+        def serialize(self) -> bytes:
+            return self.fri_commitment.serialize()
+
+    @dataclass
+    class Committed(BaseCommitted):
+        fri_committed: BinaryFRI.Committed
+        packed_poly: MultilinearExtension
+
+    @dataclass
+    class Proof(BaseProof):
+        sumcheck_proof: list[RoundProof]
+        sumcheck_eval: TowerAlgebra
+        fri_proof: BinaryFRI.Proof
+
+    def __init__(
+        self,
+        K: BinaryField,
+        L: BinaryField,
+        n_vars: int,
+        log_inv_rate: int,
+        n_queries: int,
+        log_fold_arity: int = 1,
+        sqrt_eq_ind: bool = False,
+    ):
+        assert (
+            isinstance(K, BinaryField)
+            and isinstance(L, BinaryField)
+            and L.is_extension_of(K)
+        )
+
+        self.K = K
+        self.L = L
+        self.n_vars = n_vars
+        self.L_degree = self.L.degree(self.K)
+        self.sqrt_eq_ind = sqrt_eq_ind
+
+        self.packed_n_vars = self.n_vars - log2(self.L_degree)
+        assert self.packed_n_vars >= 0
+
+        # the NTT domain lives in the smallest subfield of L that is large enough
+        log_length = self.packed_n_vars + log_inv_rate
+        domain_bits = 1 << max(log_length - 1, 0).bit_length()
+        assert domain_bits <= self.L.bit_length
+        self.fri = BinaryFRI(
+            BinaryField(domain_bits),
+            self.L,
+            self.packed_n_vars,
+            log_inv_rate,
+            n_queries,
+            log_fold_arity,
+        )
+
+    @traced("FRIBiniusPCS.commit")
+    def commit(self, poly: MultilinearExtension) -> tuple[Commitment, Committed]:
+        assert poly.field == self.K and poly.n_vars == self.n_vars
+
+        packed_poly = MultilinearExtension.from_evals(
+            PackedFieldBuffer.as_packed(poly.evals, self.K).cast(self.L).to_list(),
+            self.L,
+        )
+
+        fri_commitment, fri_committed = self.fri.commit(packed_poly.evals)
+        commitment = self.Commitment(fri_commitment)
+        committed = self.Committed(fri_committed, packed_poly)
+        return commitment, committed
+
+    @traced("FRIBiniusPCS.prove_evaluation")
+    def prove_evaluation(
+        self,
+        challenger: Challenger,
+        committed: Committed,
+        poly: MultilinearExtension,
+        query: list[BinaryFieldElement],
+    ) -> Proof:
+        assert poly.field == self.K and poly.n_vars == self.n_vars == len(query)
+        assert all(self.L.check_element(e) for e in query)
+
+        high_query = query[log2(self.L_degree) :]
+        expanded_query = MultilinearQuery.with_full_query(high_query, self.L)
+        partial_eval = poly.evaluate_partial_high(expanded_query)
+        sumcheck_eval = TowerAlgebra.new(self.K, self.L, self.L, partial_eval.evals)
+
+        challenger.observe(sumcheck_eval)
+
+        sumcheck_claim = SumcheckClaim(high_query, sumcheck_eval)
+        sumcheck_prover = SumcheckProver(
+            self.K, self.L, sumcheck_claim, committed.packed_poly, self.sqrt_eq_ind
+        )
+        fri_folder = BinaryFRI.Folder(self.fri, committed.fri_committed)
+        prev_rd_challenge = None
+        rd_proofs, round_commitments = [], []
+        for _ in range(self.packed_n_vars):
+            sumcheck_round = sumcheck_prover.execute_round(prev_rd_challenge)
+            challenger.observe_slice(sumcheck_round.coeffs[:])
+            prev_rd_challenge = challenger.sample(self.L)
+            rd_proofs.append(sumcheck_round)
+
+            # the sumcheck challenge doubles as the FRI fold challenge
+            round_commitment = fri_folder.receive_challenge(prev_rd_challenge)
+            if round_commitment is not None:
+                challenger.observe(round_commitment.serialize())
+                round_commitments.append(round_commitment)
+        if self.packed_n_vars > 0:
+            sumcheck_prover.finalize(prev_rd_challenge)
+
+        final_value = fri_folder.finalize()
+        challenger.observe(final_value)
+        query_proofs = fri_folder.prove_queries(challenger)
+
+        fri_proof = BinaryFRI.Proof(round_commitments, final_value, query_proofs)
+        return self.Proof(rd_proofs, sumcheck_eval, fri_proof)
+
+    @traced("FRIBiniusPCS.verify_evaluation")
+    def verify_evaluation(
+        self,
+        challenger: Challenger,
+        commitment: Commitment,
+        query: list[BinaryFieldElement],
+        proof: Proof,
+        value: BinaryFieldElement,
+    ) -> bool:
+        assert len(query) == self.n_vars
+        assert all(self.L.check_element(e) for e in query)
+        if not check_sumcheck_proof(
+            proof.sumcheck_proof,
+            proof.sumcheck_eval,
+            self.K,
+            self.L,
+            self.n_vars - log2(self.L_degree),
+        ):
+            return False
+
+        low_query, high_query = (
+            query[: log2(self.L_degree)],
+            query[log2(self.L_degree) :],
+        )
+
+        sumcheck_eval = proof.sumcheck_eval
+        challenger.observe(sumcheck_eval)
+
+        expanded_query = MultilinearQuery.with_full_query(low_query, self.L)
+        computed_eval = MultilinearExtension.from_evals(
+            sumcheck_eval.elems[:], self.L
+        ).evaluate(expanded_query)
+        if value != computed_eval:
+            return False
+
+        sumcheck_proof, fri_proof = proof.sumcheck_proof, proof.fri_proof
+        sumcheck_claim = SumcheckClaim(high_query, sumcheck_eval)
+
+        if not self.fri.check_proof(fri_proof):
+            return False
+
+        round_commitments = iter(fri_proof.round_commitments)
+        rd_claim = RoundClaim([], sumcheck_claim.eval)
+        for round, round_proof in enumerate(sumcheck_proof):
+            challenger.observe_slice(round_proof.coeffs[:])
+            sumcheck_round_challenge = challenger.sample(self.L)
+            rd_claim = reduce_round_claim(
+                sumcheck_claim.eval_point[round],
+                rd_claim,
+                sumcheck_round_challenge,
+                round_proof,
+            )
+            if round + 1 in self.fri.oracle_rounds:
+                challenger.observe(next(round_commitments).serialize())
+        reduced_claim = ReducedClaim(rd_claim.partial_point, rd_claim.current_round_sum)
+
+        try:
+            eval = reduced_claim.eval.transpose().try_extract_vertical()
+        except ValueError:
+            return False
+        if eval != fri_proof.final_value:
+            return False
+
+        challenger.observe(fri_proof.final_value)
+        return self.fri.verify_queries(
+            challenger,
+            commitment.fri_commitment,
+            reduced_claim.eval_point,
+            fri_proof,
+        )
+
+    def _write_committed(self, committed: Committed, writer: CommittedWriter):
+        self.fri.write_committed(committed.fri_committed, writer)
+        writer.write_elements(
+            PackedFieldBuffer.as_packed(committed.packed_poly.evals, self.L)
+        )
+
+    def _read_committed(self, reader: CommittedReader) -> Committed:
+        fri_committed = self.fri.read_committed(reader)
+        # the packed polynomial stays a view of the file until the sumcheck reads it
+        packed_evals = reader.read_elements()
+        if packed_evals.field != self.L or len(packed_evals) != 1 << (
+            self.n_vars - log2(self.L_degree)
+        ):
+            raise ValueError("saved commitment does not match the PCS parameters")
+        packed_poly = MultilinearExtension.from_evals(packed_evals, self.L)
+        return self.Committed(fri_committed, packed_poly)
+
+    def _write_proof(self, proof: Proof, writer: ProofWriter):
+        write_sumcheck_proof(writer, proof.sumcheck_proof, proof.sumcheck_eval, self.L)
+        self.fri.write_proof(proof.fri_proof, writer)
+
+    def _read_proof(self, reader: ProofReader) -> Proof:
+        sumcheck_proof, sumcheck_eval = read_sumcheck_proof(
+            reader, self.K, self.L, self.n_vars - log2(self.L_degree)
+        )
+        fri_proof = self.fri.read_proof(reader)
+        return self.Proof(sumcheck_proof, sumcheck_eval, fri_proof)
+
+
+if __name__ == "__main__":
+    from common.binary_fields import *
+    import random
+    from copy import deepcopy
+
+    random.seed(123)
+
+    K, L = BF8, BF128
+    n_vars, log_inv_rate, n_queries, log_fold_arity = 11, 2, 32, 2
+
+    pcs = FRIBiniusPCS(K, L, n_vars, log_inv_rate, n_queries, log_fold_arity)
+    print(pcs.fri)
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+
+    commitment, committed = pcs.commit(poly)
+
+    challenger = Challenger()
+    challenger.observe(commitment.serialize())
+
+    prover_challenger, verifier_challenger = deepcopy(challenger), deepcopy(challenger)
+    proof = pcs.prove_evaluation(prover_challenger, committed, poly, query)
+    assert pcs.verify_evaluation(verifier_challenger, commitment, query, proof, value)
+    print("ok")
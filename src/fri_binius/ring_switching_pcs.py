@@ -2,14 +2,21 @@ from common import (
     BinaryField,
     BinaryFieldElement,
     TowerAlgebra,
+    PackedFieldBuffer,
     MultilinearExtension,
     MultilinearQuery,
     Challenger,
+    CommittedWriter,
+    CommittedReader,
+    ProofWriter,
+    ProofReader,
     BaseCommitment,
     BaseCommitted,
     BaseProof,
     BasePCS,
     log2,
+    span,
+    traced,
 )
 from .sumcheck import (
     SumcheckClaim,
@@ -18,6 +25,9 @@ from .sumcheck import (
     ReducedClaim,
     SumcheckProver,
     reduce_round_claim,
+    write_sumcheck_proof,
+    check_sumcheck_proof,
+    read_sumcheck_proof,
 )
 
 from dataclasses import dataclass
@@ -35,6 +45,7 @@ class RingSwitchingPCS(BasePCS):
     @dataclass
     class Committed(BaseCommitted):
         inner_pcs_committed: BaseCommitted
+        packed_poly: MultilinearExtension
 
     @dataclass
     class Proof(BaseProof):
@@ -48,6 +59,7 @@ class RingSwitchingPCS(BasePCS):
         L: BinaryField,
         inner_pcs: BasePCS,
         n_vars: int,
+        sqrt_eq_ind: bool = False,
     ):
         assert (
             isinstance(K, BinaryField)
@@ -60,19 +72,24 @@ class RingSwitchingPCS(BasePCS):
         self.inner_pcs = inner_pcs
         self.n_vars = n_vars
         self.L_degree = self.L.degree(self.K)
+        self.sqrt_eq_ind = sqrt_eq_ind
 
+    @traced("RingSwitchingPCS.commit")
     def commit(self, poly: MultilinearExtension) -> tuple[Commitment, Committed]:
         assert poly.field == self.K and poly.n_vars == self.n_vars
 
-        packed_polys = MultilinearExtension.from_evals(
-            self.L.cast_slice(poly.evals), self.L
-        )
+        with span("pack"):
+            packed_polys = MultilinearExtension.from_evals(
+                PackedFieldBuffer.as_packed(poly.evals, self.K).cast(self.L).to_list(),
+                self.L,
+            )
 
         inner_commitment, inner_committed = self.inner_pcs.commit(packed_polys)
         commitment = self.Commitment(inner_commitment)
-        committed = self.Committed(inner_committed)
+        committed = self.Committed(inner_committed, packed_polys)
         return commitment, committed
 
+    @traced("RingSwitchingPCS.prove_evaluation")
     def prove_evaluation(
         self,
         challenger: Challenger,
@@ -83,27 +100,29 @@ class RingSwitchingPCS(BasePCS):
         assert poly.field == self.K and poly.n_vars == self.n_vars == len(query)
         assert all(self.L.check_element(e) for e in query)
 
-        packed_polys = MultilinearExtension.from_evals(
-            self.L.cast_slice(poly.evals), self.L
-        )
+        packed_polys = committed.packed_poly
 
         high_query = query[log2(self.L_degree) :]
-        expanded_query = MultilinearQuery.with_full_query(high_query, self.L)
-        partial_eval = poly.evaluate_partial_high(expanded_query)
+        with span("partial_eval"):
+            expanded_query = MultilinearQuery.with_full_query(high_query, self.L)
+            partial_eval = poly.evaluate_partial_high(expanded_query)
         sumcheck_eval = TowerAlgebra.new(self.K, self.L, self.L, partial_eval.evals)
 
         challenger.observe(sumcheck_eval)
 
-        sumcheck_claim = SumcheckClaim(high_query, sumcheck_eval)
-        sumcheck_prover = SumcheckProver(self.K, self.L, sumcheck_claim, packed_polys)
-        prev_rd_challenge = None
-        rd_proofs = []
-        for _ in range(packed_polys.n_vars):
-            sumcheck_round = sumcheck_prover.execute_round(prev_rd_challenge)
-            challenger.observe_slice(sumcheck_round.coeffs[:])
-            prev_rd_challenge = challenger.sample(self.L)
-            rd_proofs.append(sumcheck_round)
-        reduced_claim = sumcheck_prover.finalize(prev_rd_challenge)
+        with span("sumcheck"):
+            sumcheck_claim = SumcheckClaim(high_query, sumcheck_eval)
+            sumcheck_prover = SumcheckProver(
+                self.K, self.L, sumcheck_claim, packed_polys, self.sqrt_eq_ind
+            )
+            prev_rd_challenge = None
+            rd_proofs = []
+            for _ in range(packed_polys.n_vars):
+                sumcheck_round = sumcheck_prover.execute_round(prev_rd_challenge)
+                challenger.observe_slice(sumcheck_round.coeffs[:])
+                prev_rd_challenge = challenger.sample(self.L)
+                rd_proofs.append(sumcheck_round)
+            reduced_claim = sumcheck_prover.finalize(prev_rd_challenge)
 
         inner_pcs_proof = self.inner_pcs.prove_evaluation(
             challenger,
@@ -114,6 +133,7 @@ class RingSwitchingPCS(BasePCS):
 
         return self.Proof(rd_proofs, sumcheck_eval, inner_pcs_proof)
 
+    @traced("RingSwitchingPCS.verify_evaluation")
     def verify_evaluation(
         self,
         challenger: Challenger,
@@ -124,6 +144,14 @@ class RingSwitchingPCS(BasePCS):
     ) -> bool:
         assert len(query) == self.n_vars
         assert all(self.L.check_element(e) for e in query)
+        if not check_sumcheck_proof(
+            proof.sumcheck_proof,
+            proof.sumcheck_eval,
+            self.K,
+            self.L,
+            self.n_vars - log2(self.L_degree),
+        ):
+            return False
 
         low_query, high_query = (
             query[: log2(self.L_degree)],
@@ -143,25 +171,23 @@ class RingSwitchingPCS(BasePCS):
         sumcheck_eval, sumcheck_proof = proof.sumcheck_eval, proof.sumcheck_proof
         sumcheck_claim = SumcheckClaim(high_query, sumcheck_eval)
 
-        if len(sumcheck_proof) != len(high_query):
-            return False
-
-        rd_claim = RoundClaim([], sumcheck_claim.eval)
-        for round, round_proof in enumerate(sumcheck_proof):
-            challenger.observe_slice(round_proof.coeffs[:])
-            sumcheck_round_challenge = challenger.sample(self.L)
-            rd_claim = reduce_round_claim(
-                sumcheck_claim.eval_point[round],
-                rd_claim,
-                sumcheck_round_challenge,
-                round_proof,
-            )
+        with span("sumcheck"):
+            rd_claim = RoundClaim([], sumcheck_claim.eval)
+            for round, round_proof in enumerate(sumcheck_proof):
+                challenger.observe_slice(round_proof.coeffs[:])
+                sumcheck_round_challenge = challenger.sample(self.L)
+                rd_claim = reduce_round_claim(
+                    sumcheck_claim.eval_point[round],
+                    rd_claim,
+                    sumcheck_round_challenge,
+                    round_proof,
+                )
         reduced_claim = ReducedClaim(rd_claim.partial_point, rd_claim.current_round_sum)
         # print(reduced_claim.eval.transpose())
 
         try:
             eval = reduced_claim.eval.transpose().try_extract_vertical()
-        except:
+        except ValueError:
             return False
 
         return self.inner_pcs.verify_evaluation(
@@ -171,3 +197,31 @@ class RingSwitchingPCS(BasePCS):
             proof.inner_pcs_proof,
             eval,
         )
+
+    def _write_committed(self, committed: Committed, writer: CommittedWriter):
+        self.inner_pcs._write_committed(committed.inner_pcs_committed, writer)
+        writer.write_elements(
+            PackedFieldBuffer.as_packed(committed.packed_poly.evals, self.L)
+        )
+
+    def _read_committed(self, reader: CommittedReader) -> Committed:
+        inner_committed = self.inner_pcs._read_committed(reader)
+        # the packed polynomial stays a view of the file until the sumcheck reads it
+        packed_evals = reader.read_elements()
+        if packed_evals.field != self.L or len(packed_evals) != 1 << (
+            self.n_vars - log2(self.L_degree)
+        ):
+            raise ValueError("saved commitment does not match the PCS parameters")
+        packed_poly = MultilinearExtension.from_evals(packed_evals, self.L)
+        return self.Committed(inner_committed, packed_poly)
+
+    def _write_proof(self, proof: Proof, writer: ProofWriter):
+        write_sumcheck_proof(writer, proof.sumcheck_proof, proof.sumcheck_eval, self.L)
+        self.inner_pcs._write_proof(proof.inner_pcs_proof, writer)
+
+    def _read_proof(self, reader: ProofReader) -> Proof:
+        sumcheck_proof, sumcheck_eval = read_sumcheck_proof(
+            reader, self.K, self.L, self.n_vars - log2(self.L_degree)
+        )
+        inner_pcs_proof = self.inner_pcs._read_proof(reader)
+        return self.Proof(sumcheck_proof, sumcheck_eval, inner_pcs_proof)
@@ -4,6 +4,10 @@ from common import (
     TowerAlgebra,
     MultilinearExtension,
     MultilinearQuery,
+    ProofWriter,
+    ProofReader,
+    log2,
+    traced,
 )
 
 from dataclasses import dataclass
@@ -45,6 +49,56 @@ def reduce_round_claim(
     return RoundClaim(claim.partial_point + [challenge], new_round_sum)
 
 
+def write_sumcheck_proof(
+    writer: ProofWriter,
+    round_proofs: list[RoundProof],
+    final_eval: TowerAlgebra,
+    L: BinaryField,
+):
+    # each round sends its linear term; the constant term follows from the claim
+    for round_proof in round_proofs:
+        assert len(round_proof.coeffs) == 1
+        writer.write_elements(round_proof.coeffs[0].elems, L)
+    writer.write_elements(final_eval.elems, L)
+
+
+def read_sumcheck_proof(
+    reader: ProofReader, K: BinaryField, L: BinaryField, n_rounds: int
+) -> tuple[list[RoundProof], TowerAlgebra]:
+    L_degree = L.degree(K)
+
+    def read_tower_algebra() -> TowerAlgebra:
+        elems = reader.read_elements(L, L_degree).to_list()
+        return TowerAlgebra(K, L, L, elems)
+
+    round_proofs = [RoundProof([read_tower_algebra()]) for _ in range(n_rounds)]
+    return round_proofs, read_tower_algebra()
+
+
+def check_sumcheck_proof(
+    round_proofs: list[RoundProof],
+    final_eval: TowerAlgebra,
+    K: BinaryField,
+    L: BinaryField,
+    n_rounds: int,
+) -> bool:
+    # the shape write_sumcheck_proof and read_sumcheck_proof expect: n_rounds
+    # linear terms and a final evaluation, all in the algebra L (x)_K L
+    def is_element(a) -> bool:
+        return isinstance(a, TowerAlgebra) and (
+            (a.F, a.F_vertical, a.F_horizontal) == (K, L, L)
+        )
+
+    return (
+        is_element(final_eval)
+        and len(round_proofs) == n_rounds
+        and all(
+            len(round_proof.coeffs) == 1 and is_element(round_proof.coeffs[0])
+            for round_proof in round_proofs
+        )
+    )
+
+
 class SumcheckProver:
 
     def __init__(
@@ -53,6 +107,8 @@ class SumcheckProver:
         L: BinaryField,
         claim: SumcheckClaim,
         witness: MultilinearExtension,
+        sqrt_eq_ind: bool = False,
+        eq_ind_full_threshold: int = 4,
     ):
         assert (
             isinstance(K, BinaryField)
@@ -72,15 +128,52 @@ class SumcheckProver:
         self.eval_point = claim.eval_point[:]
         self.round_claim = RoundClaim([], claim.eval.copy())
         self.last_round_proof: RoundProof = None
-        self.eq_ind = MultilinearQuery.with_full_query(
-            claim.eval_point[1:], self.L
-        ).expansion()
+        self.eq_ind_full_threshold = eq_ind_full_threshold
+
+        # with sqrt_eq_ind, the eq indicator of eval_point[1:] is kept as two
+        # tensor halves eq_ind_low (x) eq_ind_high of size ~2^((n-1)/2) each,
+        # and only expanded once at most eq_ind_full_threshold vars remain
+        eq_ind_point = claim.eval_point[1:]
+        if sqrt_eq_ind and len(eq_ind_point) > eq_ind_full_threshold:
+            n_low_vars = len(eq_ind_point) // 2
+            self.eq_ind = None
+            self.eq_ind_low = MultilinearQuery.with_full_query(
+                eq_ind_point[:n_low_vars], self.L
+            ).expansion()
+            self.eq_ind_high = MultilinearQuery.with_full_query(
+                eq_ind_point[n_low_vars:], self.L
+            ).expansion()
+        else:
+            self.eq_ind = MultilinearQuery.with_full_query(
+                eq_ind_point, self.L
+            ).expansion()
+            self.eq_ind_low, self.eq_ind_high = None, None
         self.multilinear_ind = witness.copy()
 
+    def is_eq_ind_factored(self) -> bool:
+        return self.eq_ind is None
+
+    def expand_eq_ind(self):
+        assert self.is_eq_ind_factored()
+        self.eq_ind = [h * l for h in self.eq_ind_high for l in self.eq_ind_low]
+        self.eq_ind_low, self.eq_ind_high = None, None
+
     def fold_eq_ind(self):
-        self.eq_ind = [
-            self.eq_ind[i] + self.eq_ind[i + 1] for i in range(0, len(self.eq_ind), 2)
+        if not self.is_eq_ind_factored():
+            self.eq_ind = [
+                self.eq_ind[i] + self.eq_ind[i + 1]
+                for i in range(0, len(self.eq_ind), 2)
+            ]
+            return
+
+        # the lowest variable always lives in the low half
+        self.eq_ind_low = [
+            self.eq_ind_low[i] + self.eq_ind_low[i + 1]
+            for i in range(0, len(self.eq_ind_low), 2)
         ]
+        rd_eq_vars = log2(len(self.eq_ind_low)) + log2(len(self.eq_ind_high))
+        if len(self.eq_ind_low) == 1 or rd_eq_vars <= self.eq_ind_full_threshold:
+            self.expand_eq_ind()
 
     def reduce_claim(self, prev_rd_challenge: BinaryFieldElement):
         assert self.round > 0 and isinstance(prev_rd_challenge, BinaryFieldElement)
@@ -97,6 +190,7 @@ class SumcheckProver:
         partial_query = MultilinearQuery.with_full_query([prev_rd_challenge], self.L)
         self.multilinear_ind = self.multilinear_ind.evaluate_partial_low(partial_query)
 
+    @traced("SumcheckProver.execute_round")
     def execute_round(self, prev_rd_challenge: BinaryFieldElement) -> RoundProof:
         assert (self.round == 0 and prev_rd_challenge is None) or (
             self.round > 0 or prev_rd_challenge
@@ -109,21 +203,24 @@ class SumcheckProver:
             self.reduce_claim(prev_rd_challenge)
 
         rd_vars = self.n_vars - self.round
-        eq_ind = MultilinearExtension.from_evals(self.eq_ind, self.L)
-        # print(eq_ind.n_vars, self.multilinear_ind.n_vars, rd_vars)
-        eval_1 = sum(
-            (
-                TowerAlgebra.from_tensor(
-                    self.K,
-                    self.L,
-                    self.L,
-                    eq_ind.evaluate_on_hypercube(i),
-                    self.multilinear_ind.evaluate_on_hypercube(i << 1 | 1),
-                )
-                for i in range(1 << (rd_vars - 1))
-            ),
-            TowerAlgebra.zero(self.K, self.L, self.L),
-        )
+        if self.is_eq_ind_factored():
+            eval_1 = self.compute_factored_eval_1()
+        else:
+            eq_ind = MultilinearExtension.from_evals(self.eq_ind, self.L)
+            # print(eq_ind.n_vars, self.multilinear_ind.n_vars, rd_vars)
+            eval_1 = sum(
+                (
+                    TowerAlgebra.from_tensor(
+                        self.K,
+                        self.L,
+                        self.L,
+                        eq_ind.evaluate_on_hypercube(i),
+                        self.multilinear_ind.evaluate_on_hypercube(i << 1 | 1),
+                    )
+                    for i in range(1 << (rd_vars - 1))
+                ),
+                TowerAlgebra.zero(self.K, self.L, self.L),
+            )
 
         z_i = self.eval_point[self.round]
         denominator = (self.L.ONE - z_i).inv()
@@ -137,6 +234,31 @@ class SumcheckProver:
         self.round += 1
         return round_proof
 
+    def compute_factored_eval_1(self) -> TowerAlgebra:
+        # sum_{hi, lo} (eq_high[hi] * eq_low[lo]) (x) w[(hi, lo, 1)]
+        #   = sum_hi eq_high[hi] * (sum_lo eq_low[lo] (x) w[(hi, lo, 1)])
+        low_size = len(self.eq_ind_low)
+        eval_1 = TowerAlgebra.zero(self.K, self.L, self.L)
+        for hi, eq_high in enumerate(self.eq_ind_high):
+            inner_sum = sum(
+                (
+                    TowerAlgebra.from_tensor(
+                        self.K,
+                        self.L,
+                        self.L,
+                        eq_low,
+                        self.multilinear_ind.evaluate_on_hypercube(
+                            (hi * low_size + lo) << 1 | 1
+                        ),
+                    )
+                    for lo, eq_low in enumerate(self.eq_ind_low)
+                ),
+                TowerAlgebra.zero(self.K, self.L, self.L),
+            )
+            eval_1 += inner_sum.scale_vertical(eq_high)
+        return eval_1
+
+    @traced("SumcheckProver.finalize")
     def finalize(self, prev_rd_challenge: BinaryFieldElement) -> ReducedClaim:
         assert self.round == self.n_vars and prev_rd_challenge
         self.reduce_claim(prev_rd_challenge)
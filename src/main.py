@@ -1,8 +1,13 @@
 from common import *
 from binius import BiniusBasicPCS, BiniusBlockPCS
-from fri_binius import RingSwitchingPCS
+from fri_binius import RingSwitchingPCS, BinaryFRI, FRIBiniusPCS
+from tuner import ParameterTuner
 
+import json
+import os
 import random
+import tempfile
+import tracemalloc
 from copy import deepcopy
 
 
@@ -26,6 +31,20 @@ def testBiniusBasicPCS(seed=123):
     prover_challenger, verifier_challenger = deepcopy(challenger), deepcopy(challenger)
     proof = pcs.prove_evaluation(prover_challenger, committed, poly, query)
     assert pcs.verify_evaluation(verifier_challenger, commitment, query, proof, value)
+
+    # a constant t' opens to any value; only the column checks catch it, so
+    # proofs with missing or short openings must be rejected
+    wrong = value + L.ONE
+    forged_t_prime = MultilinearExtension.from_evals([wrong] * (1 << pcs.log_cols), L)
+    for vcs_proofs in (
+        [],
+        proof.vcs_proofs[:-1],
+        [(col[:-1], vcs_proof) for col, vcs_proof in proof.vcs_proofs],
+    ):
+        forged = pcs.Proof(forged_t_prime, vcs_proofs)
+        assert not pcs.verify_evaluation(
+            deepcopy(challenger), commitment, query, forged, wrong
+        )
     print("testBiniusBasicPCS ok")
 
 
@@ -52,16 +71,1054 @@ def testBiniusBlockPCS(seed=123):
     print("testBiniusBlockPCS ok")
 
 
-def testRingSwitchingPCS(seed=123):
+def testBatchPCS(seed=123):
+    random.seed(seed)
+    F, FA, FE = BF8, BF32, BF128
+    log_inv_rate, n_challenges = 2, 64
+
+    basic_pcs = BiniusBasicPCS(F, FE, 11, 5, log_inv_rate, n_challenges)
+    block_pcs = BiniusBlockPCS(F, FA, FE, 11, 5, log_inv_rate, n_challenges)
+    for pcs in (basic_pcs, block_pcs):
+        polys = [
+            MultilinearExtension.from_evals(
+                [F.random_element() for _ in range(1 << n_vars)], F
+            )
+            for n_vars in (11, 11, 9)
+        ]
+        queries = [[FE.random_element() for _ in range(p.n_vars)] for p in polys]
+        values = [
+            poly.evaluate(MultilinearQuery.with_full_query(query, FE))
+            for poly, query in zip(polys, queries)
+        ]
+        challenger = Challenger()
+
+        commitment, committed = pcs.commit_batch(polys)
+        challenger.observe(commitment.serialize())
+
+        prover_challenger = deepcopy(challenger)
+        proof = pcs.prove_evaluation_batch(prover_challenger, committed, polys, queries)
+        assert pcs.verify_evaluation_batch(
+            deepcopy(challenger), commitment, queries, proof, values
+        )
+        values[-1] += FE.ONE
+        assert not pcs.verify_evaluation_batch(
+            deepcopy(challenger), commitment, queries, proof, values
+        )
+
+        # constant t's for wrong values, with no, too few or short openings
+        wrong = [value + FE.ONE for value in values]
+        forged_t_primes = [
+            MultilinearExtension.from_evals([v] * (1 << pcs.log_cols), FE)
+            for v in wrong
+        ]
+        for vcs_proofs in (
+            [],
+            proof.vcs_proofs[1:],
+            [(col[:-1], vcs_proof) for col, vcs_proof in proof.vcs_proofs],
+        ):
+            forged = pcs.BatchProof(forged_t_primes, vcs_proofs, proof.col_length)
+            assert not pcs.verify_evaluation_batch(
+                deepcopy(challenger), commitment, queries, forged, wrong
+            )
+    print("testBatchPCS ok")
+
+
+def testMultiPointPCS(seed=123, n_points=5, poly_basis=False):
+    random.seed(seed)
+    enable_poly_basis(poly_basis)
+    F, FA, FE = BF8, BF32, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 64
+
+    basic_pcs = BiniusBasicPCS(F, FE, n_vars, log_rows, log_inv_rate, n_challenges)
+    block_pcs = BiniusBlockPCS(F, FA, FE, n_vars, log_rows, log_inv_rate, n_challenges)
+    for pcs in (basic_pcs, block_pcs):
+        poly = MultilinearExtension.from_evals(
+            [F.random_element() for _ in range(1 << n_vars)], F
+        )
+        queries = [
+            [FE.random_element() for _ in range(n_vars)] for _ in range(n_points)
+        ]
+        values = [
+            poly.evaluate(MultilinearQuery.with_full_query(query, FE))
+            for query in queries
+        ]
+        challenger = Challenger()
+
+        commitment, committed = pcs.commit(poly)
+        challenger.observe(commitment.serialize())
+
+        prover_challenger = deepcopy(challenger)
+        proof = pcs.prove_evaluation_multi(prover_challenger, committed, poly, queries)
+        assert pcs.verify_evaluation_multi(
+            deepcopy(challenger), commitment, queries, proof, values
+        )
+        values[-1] += FE.ONE
+        assert not pcs.verify_evaluation_multi(
+            deepcopy(challenger), commitment, queries, proof, values
+        )
+
+        # constant t's for wrong values, with missing openings, and the honest
+        # t's with a truncated or tampered opening
+        wrong = [value + FE.ONE for value in values]
+        forged_t_primes = [
+            MultilinearExtension.from_evals([v] * (1 << pcs.log_cols), FE)
+            for v in wrong
+        ]
+        for vcs_proofs in ([], proof.vcs_proofs[:1]):
+            forged = pcs.BatchProof(forged_t_primes, vcs_proofs, proof.col_length)
+            assert not pcs.verify_evaluation_multi(
+                deepcopy(challenger), commitment, queries, forged, wrong
+            )
+        values[-1] -= FE.ONE
+        col, vcs_proof = proof.vcs_proofs[0]
+        col = list(col)
+        tampered_col = [col[0] + col[0].field.ONE] + col[1:]
+        for opening in ((col[:-1], vcs_proof), (tampered_col, vcs_proof)):
+            tampered = pcs.BatchProof(
+                proof.t_primes, [opening] + proof.vcs_proofs[1:], proof.col_length
+            )
+            assert not pcs.verify_evaluation_multi(
+                deepcopy(challenger), commitment, queries, tampered, values
+            )
+    enable_poly_basis(False)
+    print(f"testMultiPointPCS(poly_basis={poly_basis}) ok")
+
+
+def testTowerAlgebraEncoding(seed=123):
+    random.seed(seed)
+    # the batched component-wise encoding against per-row field encodes and
+    # the butterflies applied to the algebra elements directly; the code is
+    # over the vertical field, as in the block PCS verifier
+    for F, F_vertical, F_horizontal, log_dim, log_inv_rate in (
+        (BF8, BF32, BF32, 3, 1),
+        (BF8, BF32, BF128, 4, 2),
+        (BF1, BF16, BF128, 5, 1),
+    ):
+        code = ReedSolomonCode(log_dim, log_inv_rate, F_vertical)
+        n_rows = F_horizontal.degree(F)
+        data = [
+            TowerAlgebra(
+                F,
+                F_vertical,
+                F_horizontal,
+                [F_vertical.random_element() for _ in range(n_rows)],
+            )
+            for _ in range(1 << log_dim)
+        ]
+        encoded = code.encode_tower_algebra(data)
+        assert encoded == code.encode(data)
+        assert encoded == code.ntt.forward_transform(
+            [v.copy() for v in data * (1 << log_inv_rate)]
+        )
+        for j in range(n_rows):
+            assert [v.elems[j] for v in encoded] == code.encode(
+                [v.elems[j] for v in data]
+            )
+
+        batch = [
+            [F_vertical.random_element() for _ in range(1 << log_dim)] for _ in range(3)
+        ]
+        expected = [code.encode(row) for row in batch]
+        assert code.encode_batch(batch) == expected
+        assert (
+            code.ntt.forward_transform_batch(
+                [row * (1 << log_inv_rate) for row in batch]
+            )
+            == expected
+        )
+    print("testTowerAlgebraEncoding ok")
+
+
+def testPackedBuffer(seed=123):
+    random.seed(seed)
+    # most significant first: element i of a b-bit field is bits
+    # [i b, (i + 1) b) of the buffer read as one big-endian integer
+    buf = PackedFieldBuffer.pack([BF4(v) for v in (1, 2, 3, 4)], BF4)
+    assert buf.to_bytes() == bytes([0x12, 0x34])
+    assert buf.cast(BF8).to_list() == [BF8(0x12), BF8(0x34)]
+    assert buf.cast(BF16).to_list() == [BF16(0x1234)]
+    assert buf.cast(BF1).to_list() == [BF1(int(b)) for b in f"{0x1234:016b}"]
+
+    elems = [BF8.random_element() for _ in range(64)]
+    # a generator packs like a list
+    buf = PackedFieldBuffer.pack((e for e in elems), BF8)
+    assert buf.to_list() == elems
+    for field in (BF1, BF2, BF4, BF16, BF32, BF64, BF128):
+        assert buf.cast(field).to_list() == field.cast_slice(elems)
+        assert buf.cast(field).cast(BF8).to_list() == elems
+    assert buf[8:24].cast(BF128).to_list() == BF128.cast_slice(elems[8:24])
+    print("testPackedBuffer ok")
+
+
+def testColumnLayout(seed=123):
     random.seed(seed)
     K, L = BF8, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 13, 7, 2, 16
+    pcs = BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges)
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+
+    commitment, committed = pcs.commit(poly)
+    cols = committed.encoded_cols
+    assert isinstance(cols, PackedColumns)
+    assert [list(col) for col in cols] == transpose(pcs.encode_rows(poly))
+
+    # resident state: the packed codeword plus a flat Merkle tree
+    codeword_bytes = (1 << (log_rows + pcs.vcs.log_len)) * K.bit_length // 8
+    assert cols.nbytes == codeword_bytes
+    tree = committed.vcs_committed.merkle_tree
+    assert cols.nbytes + len(tree.buffer) <= 2 * codeword_bytes
+
+    proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+    col = proof.vcs_proofs[0][0]
+    assert (
+        isinstance(col, PackedFieldBuffer) and col.buffer.obj is cols.buffer.buffer.obj
+    )
+    assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+    # a leaf hashes the same from a view and from its elements
+    assert pcs.vcs._hash(col) == pcs.vcs._hash(list(col))
+    # an empty leaf hashes in the field it is given, and fails to verify
+    assert pcs.vcs._hash([], K) == pcs.vcs._hash(PackedFieldBuffer.pack([], K))
+    assert not pcs.vcs.verify_opening(
+        commitment.vcs_commitment, 0, proof.vcs_proofs[0][1], [], K
+    )
+
+    # every row is checked against the field, not only the first
+    rows = transpose([list(cols[j]) for j in range(8)])
+    rows[-1][-1] = L.ONE
+    try:
+        PackedColumns.from_rows(rows, K)
+        packed = True
+    except AssertionError:
+        packed = False
+    assert not packed
+
+    # scattered, unaligned rows are written in place, also below a byte
+    for F in (BF1, BF4, BF16):
+        rows = [[F.random_element() for _ in range(4)] for _ in range(16)]
+        packed = PackedColumns.from_rows(rows, F)
+        changed = {r: [F.random_element() for _ in range(4)] for r in (1, 6, 7, 13)}
+        packed.set_rows(changed)
+        for r, row in changed.items():
+            rows[r] = row
+        assert (
+            packed.buffer.to_bytes()
+            == PackedColumns.from_rows(rows, F).buffer.to_bytes()
+        )
+    print("testColumnLayout ok")
+
+
+def testPersistedCommitted(seed=123):
+    random.seed(seed)
+    K, FA, L = BF8, BF32, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 64
+
+    inner_pcs = BiniusBasicPCS(
+        L, L, n_vars - log2(L.degree(K)), 3, log_inv_rate, n_challenges
+    )
+    pcss = [
+        BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges),
+        BiniusBlockPCS(K, FA, L, n_vars, log_rows, log_inv_rate, n_challenges),
+        RingSwitchingPCS(K, L, inner_pcs, n_vars),
+        FRIBiniusPCS(K, L, n_vars, log_inv_rate, 32, 2),
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "committed.bin")
+        for pcs in pcss:
+            poly = MultilinearExtension.from_evals(
+                [K.random_element() for _ in range(1 << n_vars)], K
+            )
+            query = [L.random_element() for _ in range(n_vars)]
+            value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+            challenger = Challenger()
+
+            commitment, committed = pcs.commit(poly)
+            challenger.observe(commitment.serialize())
+            pcs.save_committed(committed, path)
+            del committed
+
+            # the loaded object owns the mapping of the file, which its proofs
+            # may view; dropping them first, leaving the block unmaps it
+            with pcs.load_committed(path) as loaded:
+                reader = loaded._reader
+                proof = pcs.prove_evaluation(deepcopy(challenger), loaded, poly, query)
+                assert pcs.verify_evaluation(
+                    deepcopy(challenger), commitment, query, proof, value
+                )
+                del proof
+            assert reader.mapping.closed
+            # the file can be replaced once unmapped
+            os.remove(path)
+
+        pcs = pcss[0]
+        polys = [
+            MultilinearExtension.from_evals(
+                [K.random_element() for _ in range(1 << n)], K
+            )
+            for n in (11, 9)
+        ]
+        queries = [[L.random_element() for _ in range(p.n_vars)] for p in polys]
+        values = [
+            poly.evaluate(MultilinearQuery.with_full_query(query, L))
+            for poly, query in zip(polys, queries)
+        ]
+        commitment, committed = pcs.commit_batch(polys)
+        pcs.save_committed(committed, path)
+        loaded = pcs.load_committed(path)
+        assert loaded.n_vars == committed.n_vars
+        proof = pcs.prove_evaluation_batch(Challenger(), loaded, polys, queries)
+        assert pcs.verify_evaluation_batch(
+            Challenger(), commitment, queries, proof, values
+        )
+        # the proof's columns view the file: close fails until it is dropped
+        reader = loaded._reader
+        try:
+            loaded.close()
+            closed = True
+        except BufferError:
+            closed = False
+        assert not closed and not reader.mapping.closed
+        del proof
+        loaded.close()
+        assert reader.mapping.closed
+
+        # a reader unmaps its file on close, but not while its views are alive
+        with CommittedReader(path) as reader:
+            assert reader.read_json()["type"] == "BatchCommitted"
+            cols = reader.read_columns()
+            try:
+                reader.close()
+                assert False, "closed a mapping with live views"
+            except BufferError:
+                pass
+            del cols
+        assert reader.mapping.closed
+    print("testPersistedCommitted ok")
+
+
+def testStreamingCommit(seed=123, chunk_rows=4):
+    random.seed(seed)
+    n_vars, log_inv_rate, n_challenges = 11, 2, 16
+    cases = [
+        (BiniusBasicPCS(BF8, BF128, n_vars, 5, log_inv_rate, n_challenges), BF8),
+        (
+            BiniusBlockPCS(BF1, BF16, BF128, n_vars, 4, log_inv_rate, n_challenges),
+            BF1,
+        ),
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for pcs, K in cases:
+            L = BF128
+            poly = MultilinearExtension.from_evals(
+                [K.random_element() for _ in range(1 << n_vars)], K
+            )
+            query = [L.random_element() for _ in range(n_vars)]
+            value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+            expected, _ = pcs.commit(poly)
+
+            # rows from an iterator, and from a raw file of packed evaluations
+            row_length = 1 << pcs.log_cols
+            evals_path = os.path.join(tmpdir, "evals.bin")
+            with open(evals_path, "wb") as f:
+                f.write(PackedFieldBuffer.pack(poly.evals, K).to_bytes())
+            sources = [
+                (
+                    poly.evals[i : i + row_length]
+                    for i in range(0, 1 << n_vars, row_length)
+                ),
+                read_packed_rows(evals_path, K, row_length),
+            ]
+            for i, rows in enumerate(sources):
+                path = os.path.join(tmpdir, f"committed{i}.bin")
+                commitment, committed = pcs.commit_streaming(rows, path, chunk_rows)
+                assert commitment == expected
+                proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+                assert pcs.verify_evaluation(
+                    Challenger(), commitment, query, proof, value
+                )
+
+            # too few or too many rows, or a short row, are caller errors
+            rows = [
+                poly.evals[i : i + row_length]
+                for i in range(0, 1 << n_vars, row_length)
+            ]
+            path = os.path.join(tmpdir, "bad.bin")
+            for bad_rows in (
+                rows[:-1],
+                rows + rows[:1],
+                rows[:-1] + [rows[-1][:-1]],
+            ):
+                try:
+                    pcs.commit_streaming(bad_rows, path, chunk_rows)
+                    committed = True
+                except ValueError:
+                    committed = False
+                assert not committed
+            print(f"{type(pcs).__name__} streaming commit ok")
+    print("testStreamingCommit ok")
+
+
+def testUpdateCommitment(seed=123, n_changes=20):
+    random.seed(seed)
+    n_vars, log_inv_rate, n_challenges = 11, 2, 16
+    cases = [
+        (BiniusBasicPCS(BF8, BF128, n_vars, 5, log_inv_rate, n_challenges), BF8),
+        (
+            BiniusBlockPCS(BF1, BF16, BF128, n_vars, 4, log_inv_rate, n_challenges),
+            BF1,
+        ),
+    ]
+    for pcs, K in cases:
+        L = BF128
+        evals = [K.random_element() for _ in range(1 << n_vars)]
+        _, committed = pcs.commit(MultilinearExtension.from_evals(evals, K))
+
+        changes = {
+            random.randrange(1 << n_vars): K.random_element() for _ in range(n_changes)
+        }
+        commitment, committed = pcs.update_commitment(committed, changes)
+        for index, value in changes.items():
+            evals[index] = value
+        poly = MultilinearExtension.from_evals(evals, K)
+        expected, expected_committed = pcs.commit(poly)
+        assert commitment == expected
+        assert committed.encoded_cols.buffer.to_bytes() == (
+            expected_committed.encoded_cols.buffer.to_bytes()
+        )
+
+        query = [L.random_element() for _ in range(n_vars)]
+        value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+        proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+        assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+
+        # a loaded commitment is read-only: rejected before anything is written
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "committed.bin")
+            pcs.save_committed(committed, path)
+            loaded = pcs.load_committed(path)
+            try:
+                pcs.update_commitment(loaded, changes)
+                updated = True
+            except ValueError:
+                updated = False
+            assert not updated
+            del loaded
+    print("testUpdateCommitment ok")
+
+
+def testLowMemoryProver(seed=123):
+    random.seed(seed)
+    K, L = BF8, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 16
+    pcs = BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges)
+    low_memory_pcs = BiniusBasicPCS(
+        K, L, n_vars, log_rows, log_inv_rate, n_challenges, low_memory=True
+    )
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    commitment, committed = pcs.commit(poly)
+    low_memory_commitment, low_memory_committed = low_memory_pcs.commit(poly)
+    assert low_memory_commitment == commitment
+    assert low_memory_committed.encoded_cols is None
+
+    indices = random.sample(range(1 << pcs.vcs.log_len), 8)
+    cols = low_memory_pcs.recompute_columns(poly, indices)
+    assert all(
+        cols[i].to_bytes() == committed.encoded_cols[i].to_bytes() for i in indices
+    )
+
+    queries = [[L.random_element() for _ in range(n_vars)] for _ in range(2)]
+    values = [poly.evaluate(MultilinearQuery.with_full_query(q, L)) for q in queries]
+    proof = low_memory_pcs.prove_evaluation(
+        Challenger(), low_memory_committed, poly, queries[0]
+    )
+    expected = pcs.prove_evaluation(Challenger(), committed, poly, queries[0])
+    assert low_memory_pcs.proof_to_bytes(proof) == pcs.proof_to_bytes(expected)
+    assert low_memory_pcs.verify_evaluation(
+        Challenger(), commitment, queries[0], proof, values[0]
+    )
+
+    proof = low_memory_pcs.prove_evaluation_multi(
+        Challenger(), low_memory_committed, poly, queries
+    )
+    expected = pcs.prove_evaluation_multi(Challenger(), committed, poly, queries)
+    assert low_memory_pcs.proof_to_bytes(proof) == pcs.proof_to_bytes(expected)
+    assert low_memory_pcs.verify_evaluation_multi(
+        Challenger(), commitment, queries, proof, values
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "committed.bin")
+        low_memory_pcs.save_committed(low_memory_committed, path)
+        loaded = low_memory_pcs.load_committed(path)
+        assert loaded.encoded_cols is None
+        full_path = os.path.join(tmp, "full.bin")
+        pcs.save_committed(committed, full_path)
+        assert os.path.getsize(path) + committed.encoded_cols.nbytes <= (
+            os.path.getsize(full_path)
+        )
+        proof = low_memory_pcs.prove_evaluation(Challenger(), loaded, poly, queries[0])
+        assert low_memory_pcs.verify_evaluation(
+            Challenger(), commitment, queries[0], proof, values[0]
+        )
+
+    # batches of polynomials with different row counts recompute their
+    # stacked columns
+    polys = [poly] + [
+        MultilinearExtension.from_evals([K.random_element() for _ in range(1 << n)], K)
+        for n in (pcs.log_cols, n_vars - 2)
+    ]
+    queries = [[L.random_element() for _ in range(p.n_vars)] for p in polys]
+    values = [
+        p.evaluate(MultilinearQuery.with_full_query(q, L))
+        for p, q in zip(polys, queries)
+    ]
+    commitment, committed = pcs.commit_batch(polys)
+    low_memory_commitment, low_memory_committed = low_memory_pcs.commit_batch(polys)
+    assert low_memory_commitment == commitment
+    assert low_memory_committed.encoded_cols is None
+    proof = low_memory_pcs.prove_evaluation_batch(
+        Challenger(), low_memory_committed, polys, queries
+    )
+    expected = pcs.prove_evaluation_batch(Challenger(), committed, polys, queries)
+    assert low_memory_pcs.proof_to_bytes(proof) == pcs.proof_to_bytes(expected)
+    assert low_memory_pcs.verify_evaluation_batch(
+        Challenger(), commitment, queries, proof, values
+    )
+    print("testLowMemoryProver ok")
+
+
+def testMerkleRetention(seed=123):
+    random.seed(seed)
+    n_vars, log_inv_rate, n_challenges = 11, 2, 16
+    L = BF128
+    for K, make_pcs in (
+        (
+            BF8,
+            lambda **kw: BiniusBasicPCS(
+                BF8, L, n_vars, 5, log_inv_rate, n_challenges, **kw
+            ),
+        ),
+        (
+            BF1,
+            lambda **kw: BiniusBlockPCS(
+                BF1, BF16, L, n_vars, 4, log_inv_rate, n_challenges, **kw
+            ),
+        ),
+    ):
+        pcs = make_pcs()
+        evals = [K.random_element() for _ in range(1 << n_vars)]
+        poly = MultilinearExtension.from_evals(evals, K)
+        queries = [[L.random_element() for _ in range(n_vars)] for _ in range(2)]
+        values = [
+            poly.evaluate(MultilinearQuery.with_full_query(q, L)) for q in queries
+        ]
+        commitment, committed = pcs.commit(poly)
+        expected = pcs.proof_to_bytes(
+            pcs.prove_evaluation(Challenger(), committed, poly, queries[0])
+        )
+        expected_multi = pcs.proof_to_bytes(
+            pcs.prove_evaluation_multi(Challenger(), committed, poly, queries)
+        )
+
+        for depth in (0, 3, pcs.vcs.log_len - 1):
+            kwargs = [{"merkle_retain_depth": depth}]
+            if K == BF8:
+                kwargs.append({"merkle_retain_depth": depth, "low_memory": True})
+            for kw in kwargs:
+                pruned_pcs = make_pcs(**kw)
+                pruned_commitment, pruned = pruned_pcs.commit(poly)
+                assert pruned_commitment == commitment
+                assert len(pruned.vcs_committed.merkle_tree) == 2 << depth
+                proof = pruned_pcs.prove_evaluation(
+                    Challenger(), pruned, poly, queries[0]
+                )
+                assert pruned_pcs.proof_to_bytes(proof) == expected
+                assert pruned_pcs.verify_evaluation(
+                    Challenger(), commitment, queries[0], proof, values[0]
+                )
+                proof = pruned_pcs.prove_evaluation_multi(
+                    Challenger(), pruned, poly, queries
+                )
+                assert pruned_pcs.proof_to_bytes(proof) == expected_multi
+
+            _, parallel = pruned_pcs.commit_parallel(poly, 2)
+            assert parallel.vcs_committed.merkle_tree.buffer == (
+                pruned.vcs_committed.merkle_tree.buffer
+            )
+
+        # updates rebuild the pruned subtrees of the changed columns
+        pruned_pcs = make_pcs(merkle_retain_depth=3)
+        _, pruned = pruned_pcs.commit(poly)
+        changes = {random.randrange(1 << n_vars): K.random_element() for _ in range(4)}
+        updated_commitment, _ = pruned_pcs.update_commitment(pruned, changes)
+        for index, value in changes.items():
+            evals[index] = value
+        expected_commitment, _ = pcs.commit(MultilinearExtension.from_evals(evals, K))
+        assert updated_commitment == expected_commitment
+    print("testMerkleRetention ok")
+
+
+def testBlockedNTT(seed=123):
+    random.seed(seed)
+    # full degree, and an RS-style transform of a smaller degree
+    for field, log_degree, log_size in ((BF32, 9, 9), (BF16, 6, 9), (BF8, 5, 8)):
+        ntt = AdditiveNTT(log_degree, log_size, field)
+        data = [field.random_element() for _ in range(1 << log_size)]
+        expected = ntt.forward_transform(list(data))
+        expected_inverse = ntt.inverse_transform(list(data))
+        for log_block in (0, 3, log_size - 2, log_size + 1):
+            assert ntt.forward_transform_blocked(list(data), log_block) == expected
+            assert (
+                ntt.inverse_transform_blocked(list(data), log_block) == expected_inverse
+            )
+        packed = PackedFieldBuffer.pack(data, field)
+        for n_workers in (1, 2):
+            out = parallel_ntt(ntt, packed, n_workers=n_workers, log_block=4)
+            assert out.to_list() == expected
+            out = parallel_ntt(ntt, out, inverse=True, n_workers=n_workers)
+            assert out.to_list() == data
+        assert packed.to_list() == data
+
+    # RS encoding above the threshold goes through the blocked transforms
+    message = [BF16.random_element() for _ in range(1 << 8)]
+    components = [[BF16.random_element() for _ in range(1 << 8)] for _ in range(3)]
+    expected = ReedSolomonCode(8, 2, BF16).encode(message)
+    expected_batch = ReedSolomonCode(8, 2, BF16).encode_batch(deepcopy(components))
+    for n_workers in (1, 2):
+        code = ReedSolomonCode(8, 2, BF16, n_workers)
+        code.blocked_log_length = 10
+        assert code.encode(message) == expected
+        assert code.encode_batch(deepcopy(components)) == expected_batch
+        # a message in a subfield stays in process
+        assert code.encode([BF8.ONE] * (1 << 8)) == ReedSolomonCode(8, 2, BF16).encode(
+            [BF8.ONE] * (1 << 8)
+        )
+    print("testBlockedNTT ok")
+
+
+def testParallelCommit(seed=123):
+    random.seed(seed)
+    n_vars, log_inv_rate, n_challenges = 11, 2, 16
+    cases = [
+        (BiniusBasicPCS(BF8, BF128, n_vars, 5, log_inv_rate, n_challenges), BF8),
+        (
+            BiniusBlockPCS(BF1, BF16, BF128, n_vars, 4, log_inv_rate, n_challenges),
+            BF1,
+        ),
+    ]
+    for pcs, K in cases:
+        L = BF128
+        poly = MultilinearExtension.from_evals(
+            [K.random_element() for _ in range(1 << n_vars)], K
+        )
+        expected, expected_committed = pcs.commit(poly)
+        for n_workers in (1, 2, 3):
+            commitment, committed = pcs.commit_parallel(poly, n_workers)
+            assert commitment == expected
+            assert committed.encoded_cols.buffer.to_bytes() == (
+                expected_committed.encoded_cols.buffer.to_bytes()
+            )
+            assert bytes(committed.vcs_committed.merkle_tree.buffer) == bytes(
+                expected_committed.vcs_committed.merkle_tree.buffer
+            )
+
+        query = [L.random_element() for _ in range(n_vars)]
+        value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+        proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+        assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+    print("testParallelCommit ok")
+
+
+def testBitPackedWitness(seed=123):
+    random.seed(seed)
+    n_vars, log_inv_rate, n_challenges = 11, 2, 16
+    L = BF128
+    inner_pcs = BiniusBasicPCS(
+        L, L, n_vars - log2(L.degree(BF1)), 2, log_inv_rate, n_challenges
+    )
+    cases = [
+        BiniusBlockPCS(BF1, BF16, L, n_vars, 4, log_inv_rate, n_challenges),
+        RingSwitchingPCS(BF1, L, inner_pcs, n_vars),
+    ]
+    data = bytes(random.getrandbits(8) for _ in range(1 << (n_vars - 3)))
+    packed = MultilinearExtension.from_bytes(data, BF1)
+    unpacked = MultilinearExtension.from_evals(list(packed.evals), BF1)
+    for pcs in cases:
+        query = [L.random_element() for _ in range(n_vars)]
+        expanded = MultilinearQuery.with_full_query(query, L)
+        value = packed.evaluate(expanded)
+        assert value == inner_product(expanded.expansion(), unpacked.evals, L)
+
+        commitment, committed = pcs.commit(packed)
+        assert commitment == pcs.commit(unpacked)[0]
+        proof = pcs.prove_evaluation(Challenger(), committed, packed, query)
+        assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+        print(f"{type(pcs).__name__} bit-packed witness ok")
+    print("testBitPackedWitness ok")
+
+
+def testProofSerialization(seed=123):
+    random.seed(seed)
+    K, FA, L = BF8, BF32, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 64
+
+    inner_pcs = BiniusBasicPCS(
+        L, L, n_vars - log2(L.degree(K)), 3, log_inv_rate, n_challenges
+    )
+    pcss = [
+        BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges),
+        BiniusBlockPCS(K, FA, L, n_vars, log_rows, log_inv_rate, n_challenges),
+        RingSwitchingPCS(K, L, inner_pcs, n_vars),
+        FRIBiniusPCS(K, L, n_vars, log_inv_rate, 32, 2),
+    ]
+    for pcs in pcss:
+        poly = MultilinearExtension.from_evals(
+            [K.random_element() for _ in range(1 << n_vars)], K
+        )
+        queries = [[L.random_element() for _ in range(n_vars)] for _ in range(3)]
+        values = [
+            poly.evaluate(MultilinearQuery.with_full_query(query, L))
+            for query in queries
+        ]
+        challenger = Challenger()
+
+        commitment, committed = pcs.commit(poly)
+        challenger.observe(commitment.serialize())
+
+        proofs = [
+            (
+                pcs.prove_evaluation(deepcopy(challenger), committed, poly, queries[0]),
+                lambda c, proof: pcs.verify_evaluation(
+                    c, commitment, queries[0], proof, values[0]
+                ),
+            )
+        ]
+        if hasattr(pcs, "prove_evaluation_multi"):
+            proofs.append(
+                (
+                    pcs.prove_evaluation_multi(
+                        deepcopy(challenger), committed, poly, queries
+                    ),
+                    lambda c, proof: pcs.verify_evaluation_multi(
+                        c, commitment, queries, proof, values
+                    ),
+                )
+            )
+        for proof, verify in proofs:
+            data = pcs.proof_to_bytes(proof)
+            decoded = pcs.proof_from_bytes(data)
+            assert verify(deepcopy(challenger), decoded)
+            assert pcs.proof_to_bytes(decoded) == data
+            try:
+                pcs.proof_from_bytes(data[:-1])
+                assert False
+            except ValueError:
+                pass
+            print(f"{type(pcs).__name__} {type(proof).__name__}: {len(data)} bytes")
+            if hasattr(proof, "col_length"):
+                # a proof without openings still encodes, but does not decode
+                empty = pcs.BatchProof(proof.t_primes, [], proof.col_length)
+                try:
+                    pcs.proof_from_bytes(pcs.proof_to_bytes(empty))
+                    assert False
+                except ValueError:
+                    pass
+    print("testProofSerialization ok")
+
+
+def testVerifyBatch(seed=123, n_items=8, n_workers=2):
+    random.seed(seed)
+    K, L = BF8, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 64
+
+    pcs = BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges)
+    items = []
+    for i in range(n_items):
+        poly = MultilinearExtension.from_evals(
+            [K.random_element() for _ in range(1 << n_vars)], K
+        )
+        query = [L.random_element() for _ in range(n_vars)]
+        value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+        challenger = Challenger()
+
+        commitment, committed = pcs.commit(poly)
+        challenger.observe(commitment.serialize())
+
+        proof = pcs.prove_evaluation(deepcopy(challenger), committed, poly, query)
+        if i % 3 == 2:
+            value += L.ONE
+        items.append((challenger, commitment, query, proof, value))
+
+    # malformed proofs fail their own items: proof objects missing an opening
+    # or with a short column, and encodings that are truncated or garbage
+    challenger, commitment, query, proof, value = items[0]
+    (col, vcs_proof), *openings = proof.vcs_proofs
+    missing = pcs.Proof(proof.t_prime, openings)
+    short = pcs.Proof(proof.t_prime, [(col[:-1], vcs_proof)] + openings)
+    data = pcs.proof_to_bytes(proof)
+    for bad in (missing, short, data[:-1], bytes(len(data))):
+        items.append((challenger, commitment, query, bad, value))
+
+    expected = [i % 3 != 2 for i in range(n_items)] + [False] * 4
+    sequential = pcs.verify_batch(items, n_workers=1)
+    parallel = pcs.verify_batch(items, n_workers=n_workers, chunksize=2)
+    assert sequential.results == parallel.results == expected
+    print(sequential)
+    print(parallel)
+    print("testVerifyBatch ok")
+
+
+def testParameterTuner(seed=123, security_bits=32):
+    random.seed(seed)
+    n_vars = 11
+    for kind, fields in (
+        ("basic", (BF8, BF128)),
+        ("block", (BF8, BF32, BF128)),
+        ("ring_switching", (BF8, BF128)),
+    ):
+        tuner = ParameterTuner(kind, n_vars, fields, security_bits)
+        config = tuner.best(weights=(0.0, 1.0, 0.0))
+        pcs = tuner.build(config)
+        K, L = fields[0], fields[-1]
+        poly = MultilinearExtension.from_evals(
+            [K.random_element() for _ in range(1 << n_vars)], K
+        )
+        query = [L.random_element() for _ in range(n_vars)]
+        value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+
+        commitment, committed = pcs.commit(poly)
+        proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+        assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+        assert pcs.proof_size(proof) == config.proof_size
+        print(config)
+    print("testParameterTuner ok")
+
+
+def testTrustedMode(seed=123):
+    random.seed(seed)
+    K, L = BF8, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 64
+    pcs = BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges)
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+    expected, _ = pcs.commit(poly)
+
+    # the same round-trip with the checks off, which must not leak out
+    set_trusted(True)
+    try:
+        commitment, committed = pcs.commit(poly)
+        proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+        assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+        assert BF8(256).value == 256
+    finally:
+        set_trusted(False)
+    assert commitment == expected
+
+    for check in (lambda: BF8(256), lambda: BF8 == 8):
+        try:
+            check()
+            validated = False
+        except AssertionError:
+            validated = True
+        assert validated
+    print("testTrustedMode ok")
+
+
+def testProfiling(seed=123, trace_memory=True):
+    random.seed(seed)
+    K, L = BF8, BF128
+    n_vars, log_inv_rate, n_challenges = 11, 2, 64
+
+    inner_pcs = BiniusBasicPCS(
+        L, L, n_vars - log2(L.degree(K)), 3, log_inv_rate, n_challenges
+    )
+    pcs = RingSwitchingPCS(K, L, inner_pcs, n_vars)
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+
+    reset_profiling()
+    enable_profiling(trace_memory=trace_memory)
+    commitment, committed = pcs.commit(poly)
+    proof = pcs.prove_evaluation(Challenger(), committed, poly, query)
+    assert pcs.verify_evaluation(Challenger(), commitment, query, proof, value)
+    enable_profiling(False)
+
+    commit, prove, verify = get_profiler().roots
+    assert [s.name for s in commit.children] == ["pack", "BiniusBasicPCS.commit"]
+    assert [s.name for s in commit.children[1].children] == [
+        "encode_rows",
+        "transpose",
+        "merkle_commit",
+    ]
+    sumcheck = next(s for s in prove.children if s.name == "sumcheck")
+    rounds = [s for s in sumcheck.children if s.name == "SumcheckProver.execute_round"]
+    assert len(rounds) == n_vars - log2(L.degree(K))
+    assert verify.children[-1].name == "BiniusBasicPCS.verify_evaluation"
+    assert all(s.wall >= 0 and s.cpu >= 0 for s in (commit, prove, verify))
+    assert (commit.mem_peak is not None) == trace_memory
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        export_json(os.path.join(tmpdir, "profile.json"))
+        export_chrome_trace(os.path.join(tmpdir, "trace.json"))
+        with open(os.path.join(tmpdir, "trace.json")) as f:
+            events = json.load(f)["traceEvents"]
+    assert events[0]["name"] == "RingSwitchingPCS.commit"
+
+    # disabled: nothing is recorded
+    reset_profiling()
+    pcs.commit(poly)
+    assert get_profiler().roots == []
+
+    # tracemalloc started by the caller keeps running after profiling stops
+    tracemalloc.start()
+    enable_profiling(trace_memory=True)
+    enable_profiling(False)
+    assert tracemalloc.is_tracing()
+    tracemalloc.stop()
+    print(f"testProfiling(trace_memory={trace_memory}) ok")
+
+
+def testOpCounters(seed=123):
+    random.seed(seed)
+    K, L = BF8, BF128
+    n_vars, log_rows, log_inv_rate, n_challenges = 11, 5, 2, 16
+    pcs = BiniusBasicPCS(K, L, n_vars, log_rows, log_inv_rate, n_challenges)
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+
+    prover_challenger, verifier_challenger = Challenger(), Challenger()
+
+    reset_profiling()
+    reset_op_counts()
+    enable_profiling()
+    enable_op_counting()
+    commitment, committed = pcs.commit(poly)
+    proof = pcs.prove_evaluation(prover_challenger, committed, poly, query)
+    assert pcs.verify_evaluation(verifier_challenger, commitment, query, proof, value)
+    enable_op_counting(False)
+    enable_profiling(False)
+    assert not op_counting_enabled()
+
+    commit, prove, verify = get_profiler().roots
+    log_len = n_vars - log_rows + log_inv_rate
+    merkle = next(s for s in commit.children if s.name == "merkle_commit")
+    assert merkle.counts == {
+        "merkle_hash": 1 << log_len,
+        "merkle_hash_elems": (1 << log_len) * (1 << log_rows),
+        "merkle_compress": (1 << log_len) - 1,
+    }
+    # the rows are encoded over K alone
+    encode = next(s for s in commit.children if s.name == "encode_rows")
+    assert set(op.split()[1] for op in encode.counts) == {"BF8*BF8", "BF8+BF8"}
+    # t' is a K-combination of rows with L coefficients: mixed products
+    t_prime = next(s for s in prove.children if s.name == "t_prime")
+    assert t_prime.inclusive_counts()["mul BF128*BF8"] > 0
+    assert prove.inclusive_counts()["challenger_hash"] > 0
+    checks = next(s for s in verify.children if s.name == "column_checks")
+    assert checks.inclusive_counts()["merkle_compress"] == n_challenges * log_len
+
+    totals = get_op_counts()
+    spans = [commit, prove, verify]
+    assert totals == {
+        op: sum(s.inclusive_counts().get(op, 0) for s in spans) for op in totals
+    }
+    print(format_op_counts(totals))
+
+    # disabled: nothing is counted
+    reset_op_counts()
+    pcs.commit(poly)
+    assert get_op_counts() == {}
+    print("testOpCounters ok")
+
+
+def testRingSwitchingPCS(seed=123, sqrt_eq_ind=False, poly_basis=False):
+    random.seed(seed)
+    enable_poly_basis(poly_basis)
+    K, L = BF8, BF128
     n_vars = 11
     log_rows, log_inv_rate, n_challenges = 3, 2, 64
 
     inner_pcs = BiniusBasicPCS(
         L, L, n_vars - log2(L.degree(K)), log_rows, log_inv_rate, n_challenges
     )
-    pcs = RingSwitchingPCS(K, L, inner_pcs, n_vars)
+    pcs = RingSwitchingPCS(K, L, inner_pcs, n_vars, sqrt_eq_ind)
+    poly = MultilinearExtension.from_evals(
+        [K.random_element() for _ in range(1 << n_vars)], K
+    )
+    query = [L.random_element() for _ in range(n_vars)]
+    value = poly.evaluate(MultilinearQuery.with_full_query(query, L))
+    challenger = Challenger()
+
+    commitment, committed = pcs.commit(poly)
+    challenger.observe(commitment.serialize())
+
+    prover_challenger, verifier_challenger = deepcopy(challenger), deepcopy(challenger)
+    proof = pcs.prove_evaluation(prover_challenger, committed, poly, query)
+    assert pcs.verify_evaluation(verifier_challenger, commitment, query, proof, value)
+    enable_poly_basis(False)
+    print(
+        f"testRingSwitchingPCS(sqrt_eq_ind={sqrt_eq_ind}, poly_basis={poly_basis}) ok"
+    )
+
+
+def testBinaryFRI(seed=123, log_fold_arity=2):
+    random.seed(seed)
+    K, L = BF16, BF128
+    log_dimension, log_inv_rate, n_queries = 7, 2, 32
+
+    fri = BinaryFRI(K, L, log_dimension, log_inv_rate, n_queries, log_fold_arity)
+    print(fri)
+    message = [L.random_element() for _ in range(1 << log_dimension)]
+    challenger = Challenger()
+
+    commitment, committed = fri.commit(message)
+    challenger.observe(commitment.serialize())
+
+    prover_challenger, verifier_challenger = deepcopy(challenger), deepcopy(challenger)
+    proof, challenges = fri.prove(prover_challenger, committed)
+    ok, verifier_challenges = fri.verify(verifier_challenger, commitment, proof)
+    assert ok and challenges == verifier_challenges
+    value = MultilinearExtension.from_evals(message, L).evaluate(
+        MultilinearQuery.with_full_query(challenges, L)
+    )
+    assert proof.final_value == value
+
+    # malformed proofs are rejected, not raised on: a query missing a coset,
+    # a truncated coset and a shortened Merkle branch
+    query_proof = proof.query_proofs[0]
+    coset, vcs_proof = query_proof.cosets[-1]
+    for cosets in (
+        query_proof.cosets[:-1],
+        query_proof.cosets[:-1] + [(coset[:-1], vcs_proof)],
+        query_proof.cosets[:-1] + [(coset, MerkleTreeVCS.Proof(vcs_proof.branch[:-1]))],
+    ):
+        malformed = deepcopy(proof)
+        malformed.query_proofs[0] = fri.QueryProof(cosets)
+        ok, _ = fri.verify(deepcopy(challenger), commitment, malformed)
+        assert not ok
+    print("testBinaryFRI ok")
+
+
+def testFRIBiniusPCS(seed=123):
+    random.seed(seed)
+    K, L = BF8, BF128
+    n_vars, log_inv_rate, n_queries, log_fold_arity = 11, 2, 32, 2
+
+    pcs = FRIBiniusPCS(K, L, n_vars, log_inv_rate, n_queries, log_fold_arity)
     poly = MultilinearExtension.from_evals(
         [K.random_element() for _ in range(1 << n_vars)], K
     )
@@ -75,10 +1132,47 @@ def testRingSwitchingPCS(seed=123):
     prover_challenger, verifier_challenger = deepcopy(challenger), deepcopy(challenger)
     proof = pcs.prove_evaluation(prover_challenger, committed, poly, query)
     assert pcs.verify_evaluation(verifier_challenger, commitment, query, proof, value)
-    print("testRingSwitchingPCS ok")
+
+    # malformed proofs are rejected: a FRI query missing its last coset, and
+    # a sumcheck missing its last round
+    malformed = deepcopy(proof)
+    malformed.fri_proof.query_proofs[-1].cosets.pop()
+    assert not pcs.verify_evaluation(
+        deepcopy(challenger), commitment, query, malformed, value
+    )
+    malformed = deepcopy(proof)
+    malformed.sumcheck_proof.pop()
+    assert not pcs.verify_evaluation(
+        deepcopy(challenger), commitment, query, malformed, value
+    )
+    print("testFRIBiniusPCS ok")
 
 
 if __name__ == "__main__":
     testBiniusBasicPCS()
     testBiniusBlockPCS()
+    testBatchPCS()
+    testMultiPointPCS()
+    testMultiPointPCS(poly_basis=True)
+    testTowerAlgebraEncoding()
+    testPackedBuffer()
+    testColumnLayout()
+    testPersistedCommitted()
+    testStreamingCommit()
+    testUpdateCommitment()
+    testLowMemoryProver()
+    testMerkleRetention()
+    testParallelCommit()
+    testBlockedNTT()
+    testBitPackedWitness()
+    testProofSerialization()
+    testVerifyBatch()
+    testParameterTuner()
+    testTrustedMode()
+    testProfiling()
+    testOpCounters()
     testRingSwitchingPCS()
+    testRingSwitchingPCS(sqrt_eq_ind=True)
+    testRingSwitchingPCS(poly_basis=True)
+    testBinaryFRI()
+    testFRIBiniusPCS()
@@ -0,0 +1,381 @@
+from common import (
+    BinaryField,
+    AdditiveNTT,
+    MerkleTreeVCS,
+    TowerAlgebra,
+    BasePCS,
+    log2,
+)
+from common.proof_format import PROOF_MAGIC
+from binius import BiniusBasicPCS, BiniusBlockPCS
+from fri_binius import RingSwitchingPCS
+
+from dataclasses import dataclass
+from math import ceil, log2 as log2_real
+import time
+
+DIGEST_SIZE = 32
+# magic, version byte and the u32 proof-kind count of BasePCS.proof_to_bytes
+PROOF_OVERHEAD = len(PROOF_MAGIC) + 1 + 4
+
+
+def n_challenges_for_security(security_bits: int, log_inv_rate: int) -> int:
+    """
+    Number of column openings for security_bits of soundness. A Reed-Solomon
+    code of rate 2^-R has relative distance delta = 1 - 2^-R, and each opened
+    column catches a codeword that is delta/3-far from the code with
+    probability at least delta/3.
+    """
+    delta = 1 - 2**-log_inv_rate
+    return ceil(security_bits / -log2_real(1 - delta / 3))
+
+
+def _time_per_op(fn, n_ops: int, min_time: float = 0.02) -> float:
+    # seconds per op of fn(), which performs n_ops ops
+    reps, elapsed = 0, 0.0
+    start = time.perf_counter()
+    while elapsed < min_time:
+        fn()
+        reps += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / (reps * n_ops)
+
+
+class CostModel:
+    """
+    Per-operation costs in seconds, keyed by operation name:
+
+    - ("mul", A, B): multiplication of an A element by a B element,
+    - ("ntt", D, T): one butterfly of an NTT over T with data in D,
+    - ("hash", A): hashing one A element into a Merkle leaf,
+    - ("tensor", F, FA, FE): TowerAlgebra.from_tensor plus the accumulation,
+    - "compress": one Merkle node compression.
+
+    calibrate() measures them with short micro-benchmarks on this machine.
+    """
+
+    def __init__(self, costs: dict):
+        self.costs = costs
+
+    def __getitem__(self, op) -> float:
+        return self.costs[op]
+
+    @classmethod
+    def calibrate(
+        cls,
+        fields: list[BinaryField],
+        tensor_fields: list[tuple[BinaryField, BinaryField, BinaryField]] = (),
+        min_time: float = 0.02,
+    ) -> "CostModel":
+        costs = {}
+        samples = 64
+        vcs = MerkleTreeVCS(0)
+        for A in fields:
+            xs = [A.random_element() for _ in range(samples)]
+            costs[("hash", A)] = _time_per_op(lambda: vcs._hash(xs), samples, min_time)
+            for B in fields:
+                if not A.is_extension_of(B):
+                    continue
+                ys = [B.random_element() for _ in range(samples)]
+                costs[("mul", A, B)] = _time_per_op(
+                    lambda: [x * y for x, y in zip(xs, ys)], samples, min_time
+                )
+                # a small NTT over B; fields below BF4 cannot host any code
+                # the PCSs accept, so they get no NTT cost
+                log_length = min(6, B.bit_length)
+                log_dimension = log_length - 2
+                if log_dimension < 1:
+                    continue
+                ntt = AdditiveNTT(log_dimension, log_length, B)
+                data = [A.random_element() for _ in range(1 << log_length)]
+                costs[("ntt", A, B)] = _time_per_op(
+                    lambda: ntt.forward_transform(data[:]),
+                    log_dimension << (log_length - 1),
+                    min_time,
+                )
+        for F, FA, FE in tensor_fields:
+            zero = TowerAlgebra.zero(F, FA, FE)
+            xs = [FA.random_element() for _ in range(samples)]
+            ys = [FE.random_element() for _ in range(samples)]
+            costs[("tensor", F, FA, FE)] = _time_per_op(
+                lambda: sum(
+                    (TowerAlgebra.from_tensor(F, FA, FE, x, y) for x, y in zip(xs, ys)),
+                    zero,
+                ),
+                samples,
+                min_time,
+            )
+        costs["compress"] = _time_per_op(
+            lambda: [vcs._compress(bytes(32), bytes(32)) for _ in range(samples)],
+            samples,
+            min_time,
+        )
+        return cls(costs)
+
+
+@dataclass
+class Config:
+    kind: str
+    log_rows: int
+    log_inv_rate: int
+    n_challenges: int
+    commit_time: float
+    prove_time: float
+    verify_time: float
+    proof_size: int
+
+    @property
+    def prover_time(self) -> float:
+        return self.commit_time + self.prove_time
+
+    def objectives(self) -> tuple[float, int, float]:
+        return self.prover_time, self.proof_size, self.verify_time
+
+    def dominates(self, other: "Config") -> bool:
+        mine, theirs = self.objectives(), other.objectives()
+        return all(a <= b for a, b in zip(mine, theirs)) and mine != theirs
+
+    def __repr__(self) -> str:
+        return (
+            f"Config({self.kind}: log_rows={self.log_rows},"
+            f" log_inv_rate={self.log_inv_rate}, n_challenges={self.n_challenges},"
+            f" prover={self.prover_time:.3g}s, verify={self.verify_time:.3g}s,"
+            f" proof={self.proof_size}B)"
+        )
+
+
+def _butterflies(log_dimension: int, log_length: int) -> int:
+    # butterflies of AdditiveNTT.forward_transform
+    return log_dimension << (log_length - 1)
+
+
+def _bytes(field: BinaryField) -> float:
+    return field.bit_length / 8
+
+
+class ParameterTuner:
+    """
+    Picks log_rows, log_inv_rate and n_challenges for a BiniusBasicPCS
+    ("basic", fields K and L), a BiniusBlockPCS ("block", fields F, FA, FE) or
+    the inner BiniusBasicPCS of a RingSwitchingPCS ("ring_switching", fields
+    K and L), for n_vars variables and a target security level.
+
+    Every admissible configuration is costed by an analytic model of the
+    operations each phase performs (RS encodings, partial evaluations, Merkle
+    hashing, column checks) weighted by the calibrated CostModel; pareto()
+    keeps those not dominated in prover time, proof size and verifier time.
+    The ring-switching sumcheck costs the same for every candidate, so only its
+    proof size is modelled.
+    """
+
+    KINDS = ("basic", "block", "ring_switching")
+
+    def __init__(
+        self,
+        kind: str,
+        n_vars: int,
+        fields: tuple[BinaryField, ...],
+        security_bits: int = 100,
+        log_inv_rates: range = range(1, 5),
+        cost_model: CostModel | None = None,
+    ):
+        assert kind in self.KINDS
+        assert len(fields) == (3 if kind == "block" else 2)
+        self.kind = kind
+        self.n_vars = n_vars
+        self.fields = fields
+        self.security_bits = security_bits
+        self.log_inv_rates = log_inv_rates
+
+        if cost_model is None:
+            cost_model = CostModel.calibrate(
+                sorted(set(fields), key=lambda f: f.bit_length),
+                [fields] if kind == "block" else [],
+            )
+        self.cost_model = cost_model
+
+    def __repr__(self) -> str:
+        return (
+            f"ParameterTuner({self.kind}, n_vars={self.n_vars},"
+            f" security_bits={self.security_bits})"
+        )
+
+    def _basic_config(
+        self,
+        K: BinaryField,
+        L: BinaryField,
+        n_vars: int,
+        log_rows: int,
+        log_inv_rate: int,
+    ) -> Config | None:
+        c = self.cost_model
+        log_cols = n_vars - log_rows
+        log_length = log_cols + log_inv_rate
+        if log_cols < 1 or log_length > K.bit_length:
+            return None
+        n_challenges = n_challenges_for_security(self.security_bits, log_inv_rate)
+
+        commit_time = (
+            (_butterflies(log_cols, log_length) << log_rows) * c["ntt", K, K]
+            + (1 << (log_rows + log_length)) * c["hash", K]
+            + (1 << log_length) * c["compress"]
+        )
+        prove_time = (1 << n_vars) * c["mul", L, K]
+        verify_time = (
+            _butterflies(log_cols, log_length) * c["ntt", L, K]
+            + ((1 << log_cols) + (1 << log_rows)) * c["mul", L, L]
+            + n_challenges
+            * (
+                (1 << log_rows) * (c["mul", L, K] + c["hash", K])
+                + log_length * c["compress"]
+            )
+        )
+        proof_size = (
+            PROOF_OVERHEAD
+            + (1 << log_cols) * _bytes(L)
+            + n_challenges * ((1 << log_rows) * _bytes(K) + log_length * DIGEST_SIZE)
+        )
+        return Config(
+            self.kind,
+            log_rows,
+            log_inv_rate,
+            n_challenges,
+            commit_time,
+            prove_time,
+            verify_time,
+            ceil(proof_size),
+        )
+
+    def _block_config(self, log_rows: int, log_inv_rate: int) -> Config | None:
+        c = self.cost_model
+        F, FA, FE = self.fields
+        log_cols = self.n_vars - log_rows
+        log_dimension = log_cols - log2(FA.degree(F))
+        log_length = log_dimension + log_inv_rate
+        if log_dimension < 1 or log_length > FA.bit_length:
+            return None
+        n_challenges = n_challenges_for_security(self.security_bits, log_inv_rate)
+
+        commit_time = (
+            (_butterflies(log_dimension, log_length) << log_rows) * c["ntt", FA, FA]
+            + (1 << (log_rows + log_length)) * c["hash", FA]
+            + (1 << log_length) * c["compress"]
+        )
+        prove_time = (1 << self.n_vars) * c["mul", FE, F]
+        # t' is encoded as FE.degree(F) vectors over FA
+        verify_time = (
+            FE.degree(F) * _butterflies(log_dimension, log_length) * c["ntt", FA, FA]
+            + ((1 << log_cols) + (1 << log_rows)) * c["mul", FE, FE]
+            + n_challenges
+            * (
+                (1 << log_rows) * (c["tensor", F, FA, FE] + c["hash", FA])
+                + log_length * c["compress"]
+            )
+        )
+        proof_size = (
+            PROOF_OVERHEAD
+            + (1 << log_cols) * _bytes(FE)
+            + n_challenges * ((1 << log_rows) * _bytes(FA) + log_length * DIGEST_SIZE)
+        )
+        return Config(
+            self.kind,
+            log_rows,
+            log_inv_rate,
+            n_challenges,
+            commit_time,
+            prove_time,
+            verify_time,
+            ceil(proof_size),
+        )
+
+    def config(self, log_rows: int, log_inv_rate: int) -> Config | None:
+        # the modelled configuration, or None if the parameters are not admissible
+        if self.kind == "basic":
+            K, L = self.fields
+            return self._basic_config(K, L, self.n_vars, log_rows, log_inv_rate)
+        if self.kind == "block":
+            return self._block_config(log_rows, log_inv_rate)
+        K, L = self.fields
+        packed_n_vars = self.n_vars - log2(L.degree(K))
+        config = self._basic_config(L, L, packed_n_vars, log_rows, log_inv_rate)
+        if config is not None:
+            # the sumcheck sends one algebra element per round and its claim
+            config.proof_size += (packed_n_vars + 1) * L.degree(K) * L.bit_length // 8
+        return config
+
+    def candidates(self) -> list[Config]:
+        return [
+            config
+            for log_inv_rate in self.log_inv_rates
+            for log_rows in range(self.n_vars + 1)
+            if (config := self.config(log_rows, log_inv_rate)) is not None
+        ]
+
+    def pareto(self) -> list[Config]:
+        candidates = self.candidates()
+        front = [
+            config
+            for config in candidates
+            if not any(other.dominates(config) for other in candidates)
+        ]
+        return sorted(front, key=lambda config: config.prover_time)
+
+    def best(self, weights: tuple[float, float, float] = (1.0, 0.0, 0.0)) -> Config:
+        # the Pareto configuration minimising a weighted sum of prover time (s),
+        # proof size (bytes) and verifier time (s)
+        return min(
+            self.pareto(),
+            key=lambda config: sum(w * x for w, x in zip(weights, config.objectives())),
+        )
+
+    def build(self, config: Config) -> BasePCS:
+        assert config.kind == self.kind
+        if self.kind == "basic":
+            K, L = self.fields
+            return BiniusBasicPCS(
+                K,
+                L,
+                self.n_vars,
+                config.log_rows,
+                config.log_inv_rate,
+                config.n_challenges,
+            )
+        if self.kind == "block":
+            F, FA, FE = self.fields
+            return BiniusBlockPCS(
+                F,
+                FA,
+                FE,
+                self.n_vars,
+                config.log_rows,
+                config.log_inv_rate,
+                config.n_challenges,
+            )
+        K, L = self.fields
+        inner_pcs = BiniusBasicPCS(
+            L,
+            L,
+            self.n_vars - log2(L.degree(K)),
+            config.log_rows,
+            config.log_inv_rate,
+            config.n_challenges,
+        )
+        return RingSwitchingPCS(K, L, inner_pcs, self.n_vars)
+
+
+if __name__ == "__main__":
+    from common.binary_fields import *
+    import sys
+
+    n_vars = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    security_bits = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    for kind, fields in (
+        ("basic", (BF16, BF128)),
+        ("block", (BF8, BF32, BF128)),
+        ("ring_switching", (BF8, BF128)),
+    ):
+        tuner = ParameterTuner(kind, n_vars, fields, security_bits)
+        print(tuner)
+        for config in tuner.pareto():
+            print(" ", config)